@@ -9,20 +9,36 @@ import re
 import json
 import asyncio
 import logging
-from typing import Dict, List, Tuple, Optional, Set, Union
-from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple, Optional, Set, Union
+import dataclasses
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 import hashlib
+import html
 import uuid
 import sqlite3
 from pathlib import Path
 import difflib
+import importlib.util
 import ast
+import threading
+import heapq
+import random
+import contextlib
+import weakref
+import concurrent.futures
+import queue
+import io
+import zlib
+from collections import OrderedDict, defaultdict
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Anthropic model used for AI analysis narratives
+AI_MODEL = "claude-3-5-sonnet-latest"
+
 # Page configuration
 st.set_page_config(
     page_title="Enterprise Database Migration Analyzer",
@@ -374,6 +390,76 @@ class CostEstimate:
     optimizations: List[str]
     confidence_score: float
 
+@dataclass
+class CostSimulation:
+    """Monte Carlo cost simulation result"""
+    trials: int
+    percentiles: Dict[str, Dict[str, float]]
+    samples: Dict[str, np.ndarray]
+    confidence_score: float
+    elapsed_ms: float
+
+@dataclass
+class StoragePlan:
+    """Cheapest storage configuration meeting an IOPS and throughput requirement"""
+    storage_type: str
+    allocated_gb: int
+    provisioned_iops: int
+    provisioned_mibps: int
+    cost_split: Dict[str, float]
+    options: pd.DataFrame
+
+@dataclass
+class AuroraStorageComparison:
+    """Aurora Standard vs I/O-Optimized monthly cost"""
+    monthly_io_requests: float
+    standard_monthly: float
+    io_optimized_monthly: float
+    recommended: str
+    crossover_io_requests: float
+    io_share: float
+    curve: pd.DataFrame
+
+@dataclass
+class TCOProjection:
+    """Multi-year total cost of ownership across pricing options"""
+    years: int
+    summary: pd.DataFrame
+    cumulative: pd.DataFrame
+
+@dataclass
+class DMSWindowEstimate:
+    """Estimated DMS full load, CDC catch-up and cutover timings"""
+    full_load_hours: float
+    cdc_catchup_hours: float
+    total_hours: float
+    downtime_hours: float
+    effective_mbps: float
+    bottleneck: str
+    cdc_keeps_up: bool
+    dms_cost: float
+    schedule: pd.DataFrame
+
+@dataclass
+class RightSizingRecommendation:
+    """Instance and storage recommendation derived from observed metrics"""
+    instance_class: str
+    storage_type: str
+    metric_summary: Dict[str, Dict[str, float]]
+    requirements: Dict[str, float]
+    rationale: List[str]
+    samples_processed: int
+
+@dataclass
+class SchemaDigest:
+    """Token-budgeted summary of a schema and workload for AI prompts"""
+    summary: str
+    object_counts: Dict[str, int]
+    flagged_constructs: Dict[str, int]
+    token_estimate: int
+    original_token_estimate: int
+    chunks: List[str] = field(default_factory=list)
+
 @dataclass
 class SecurityAssessment:
     """Security assessment result"""
@@ -382,6 +468,7 @@ class SecurityAssessment:
     compliance_status: Dict[str, bool]
     recommendations: List[str]
     data_classification: Dict[str, str]
+    pii_findings: Dict[str, Dict[str, int]] = field(default_factory=dict)
 
 @dataclass
 class AIAnalysisResult:
@@ -395,6 +482,8 @@ class AIAnalysisResult:
     cost_impact: str
     detailed_analysis: str
     action_items: List[Dict[str, str]]
+    is_fallback: bool = False
+    from_cache: bool = False
 
 @dataclass
 class AutoFix:
@@ -427,6 +516,7 @@ class AutoFixResult:
     compatibility_score_after: float
     fixes: List[AutoFix]
     summary_report: str
+    ai_fixes_from_cache: bool = False
 
 # Complete Database Configuration with Enhanced Features
 DATABASE_CONFIG = {
@@ -810,78 +900,287 @@ def initialize_session_state():
         'user_id': str(uuid.uuid4()),
         'current_project': None,
         'projects': [],
-        'analysis_results': {},
         'cost_estimates': {},
-        'security_assessment': None,
         'collaboration_enabled': False,
-        'autofix_results': None,
         'example_schema': '',
         'example_source': '',
         'example_target': '',
-        'show_project_creator': False
+        'show_project_creator': False,
+        'project_page_cursors': [None],
+        'rightsizing_recommendation': None
     }
     
     for key, default_value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = default_value
 
+# Memoization helpers
+def stable_hash(*parts) -> str:
+    """Deterministic content hash for cache keys"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class MemoCache:
+    """Thread-safe bounded LRU cache with hit/miss accounting"""
+    
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        
+        value = compute()
+        
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+    
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Current hit/miss counters and size"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data)}
+
 # Database Manager for Enterprise Features
+class SQLiteConnectionPool:
+    """Thread-safe pool of SQLite connections in WAL mode with tuned pragmas"""
+    
+    # WAL keeps readers off the writer's lock; NORMAL sync is durable enough under WAL
+    PRAGMAS = (
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA mmap_size = 268435456",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA busy_timeout = 5000"
+    )
+    
+    def __init__(self, db_path: Path, size: int = 8, cached_statements: int = 256, timeout: float = 10.0):
+        self.db_path = Path(db_path)
+        self.size = size
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        
+        # journal_mode is persistent in the database file, so it is set once
+        with self.connection() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; its statement cache keeps prepared statements for reuse"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.timeout,
+                               cached_statements=self.cached_statements)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _acquire(self) -> sqlite3.Connection:
+        """Reuse an idle connection, open a new one below the pool size, else wait"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._connect()
+        return self._idle.get(timeout=self.timeout)
+    
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a connection, committing on success and rolling back on error"""
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+class VersionedReadCache:
+    """Read-through cache of query results tagged with per-table version counters
+    
+    Triggers bump a table's counter in table_versions on every insert, update and delete,
+    so any writer invalidates cached reads. Counters are re-read at most once per
+    check_interval; writes made through this process invalidate immediately.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+    
+    def __init__(self, pool: SQLiteConnectionPool, check_interval: float = 2.0, maxsize: int = 256):
+        self.pool = pool
+        self.check_interval = check_interval
+        self.entries = MemoCache(maxsize)
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+    
+    def version(self, table: str) -> int:
+        """Table's change counter, re-read from the database when the last check is stale"""
+        now = time.monotonic()
+        with self._lock:
+            known = self._versions.get(table)
+            if known is not None and now - known[1] < self.check_interval:
+                return known[0]
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT version FROM table_versions WHERE table_name = ?", (table,)).fetchone()
+        version = row[0] if row else 0
+        with self._lock:
+            self._versions[table] = (version, now)
+        return version
+    
+    def get(self, table: str, key: Tuple, load):
+        """Cached result of load() for key, reloaded when the table has changed"""
+        # Superseded versions are never hit again and age out of the LRU
+        return self.entries.get_or_compute((table, self.version(table), key), load)
+    
+    def invalidate(self, table: str):
+        """Force the next read of table to re-check its version"""
+        with self._lock:
+            self._versions.pop(table, None)
+
 class EnterpriseDBManager:
     """Manage enterprise database operations"""
     
-    def __init__(self):
-        self.db_path = Path("enterprise_migration.db")
+    # Tables whose reads go through the read cache; triggers version every write to them
+    VERSIONED_TABLES = ('migration_projects', 'analysis_results')
+    
+    def __init__(self, db_path: Path = Path("enterprise_migration.db"), pool_size: int = 8):
+        self.db_path = Path(db_path)
+        self.pool = SQLiteConnectionPool(self.db_path, size=pool_size)
+        self.read_cache = VersionedReadCache(self.pool)
+        self.fts_enabled = False
         self.init_database()
     
     def init_database(self):
         """Initialize SQLite database for enterprise features"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Users table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id TEXT PRIMARY KEY,
-                    username TEXT UNIQUE NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    role TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_active TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    metadata TEXT DEFAULT '{}'
-                )
-            ''')
-            
-            # Projects table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS migration_projects (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    source_engine TEXT NOT NULL,
-                    target_engine TEXT NOT NULL,
-                    status TEXT DEFAULT 'planning',
-                    owner_id TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    metadata TEXT DEFAULT '{}'
-                )
-            ''')
-            
-            # Analysis results table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS analysis_results (
-                    id TEXT PRIMARY KEY,
-                    project_id TEXT NOT NULL,
-                    analysis_type TEXT NOT NULL,
-                    result_data TEXT NOT NULL,
-                    confidence_score REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (project_id) REFERENCES migration_projects (id)
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                # Users table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS users (
+                        id TEXT PRIMARY KEY,
+                        username TEXT UNIQUE NOT NULL,
+                        email TEXT UNIQUE NOT NULL,
+                        role TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_active TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        metadata TEXT DEFAULT '{}'
+                    )
+                ''')
+                
+                # Projects table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS migration_projects (
+                        id TEXT PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        source_engine TEXT NOT NULL,
+                        target_engine TEXT NOT NULL,
+                        status TEXT DEFAULT 'planning',
+                        owner_id TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        metadata TEXT DEFAULT '{}'
+                    )
+                ''')
+                
+                # Analysis results table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS analysis_results (
+                        id TEXT PRIMARY KEY,
+                        project_id TEXT NOT NULL,
+                        analysis_type TEXT NOT NULL,
+                        result_data TEXT NOT NULL,
+                        confidence_score REAL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (project_id) REFERENCES migration_projects (id)
+                    )
+                ''')
+                
+                # Covering index for the owner's project list, newest first; id breaks created_at ties
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_projects_owner_created
+                    ON migration_projects (owner_id, created_at DESC, id DESC, name, source_engine, target_engine, status)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_analysis_results_project
+                    ON analysis_results (project_id, analysis_type, created_at DESC)
+                ''')
+                # Covers the all-types summary listing, newest first, without a sort or table lookups
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_analysis_results_project_created
+                    ON analysis_results (project_id, created_at DESC, id DESC, analysis_type, result_data, confidence_score)
+                ''')
+                
+                # Full result objects, compressed, kept apart from the summary rows so listing stays cheap
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS analysis_payloads (
+                        result_id TEXT PRIMARY KEY,
+                        raw_size INTEGER NOT NULL,
+                        payload BLOB NOT NULL,
+                        FOREIGN KEY (result_id) REFERENCES analysis_results (id)
+                    )
+                ''')
+                
+                # Change counters for the read cache, maintained by triggers so every writer bumps them
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS table_versions (
+                        table_name TEXT PRIMARY KEY,
+                        version INTEGER NOT NULL DEFAULT 0
+                    )
+                ''')
+                # Search index over schemas, fixes and recommendations; plain table + LIKE without FTS5
+                try:
+                    cursor.execute('''
+                        CREATE VIRTUAL TABLE IF NOT EXISTS analysis_search USING fts5(
+                            project_id UNINDEXED, result_id UNINDEXED, kind UNINDEXED, title, body,
+                            tokenize = "unicode61 tokenchars '_'"
+                        )
+                    ''')
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"FTS5 unavailable, search falls back to LIKE: {e}")
+                    cursor.execute('''
+                        CREATE TABLE IF NOT EXISTS analysis_search (
+                            project_id TEXT NOT NULL,
+                            result_id TEXT,
+                            kind TEXT NOT NULL,
+                            title TEXT,
+                            body TEXT
+                        )
+                    ''')
+                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_search_project ON analysis_search (project_id)")
+                row = cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'analysis_search'").fetchone()
+                self.fts_enabled = bool(row and 'fts5' in row[0].lower())
+                
+                for table in self.VERSIONED_TABLES:
+                    cursor.execute("INSERT OR IGNORE INTO table_versions (table_name) VALUES (?)", (table,))
+                    for event in ('INSERT', 'UPDATE', 'DELETE'):
+                        cursor.execute(f'''
+                            CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_version
+                            AFTER {event} ON {table}
+                            BEGIN
+                                UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+                            END
+                        ''')
         except Exception as e:
             logger.error(f"Database initialization failed: {e}")
     
@@ -889,36 +1188,59 @@ class EnterpriseDBManager:
         """Create new migration project"""
         try:
             project_id = str(uuid.uuid4())
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO migration_projects (id, name, source_engine, target_engine, owner_id)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (project_id, name, source_engine, target_engine, owner_id))
-            
-            conn.commit()
-            conn.close()
+            with self.pool.connection() as conn:
+                conn.execute('''
+                    INSERT INTO migration_projects (id, name, source_engine, target_engine, owner_id)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (project_id, name, source_engine, target_engine, owner_id))
+            self.read_cache.invalidate('migration_projects')
             return project_id
         except Exception as e:
             logger.error(f"Project creation failed: {e}")
             return str(uuid.uuid4())  # Fallback
     
+    def get_project(self, project_id: str) -> Optional[Dict]:
+        """Get project metadata"""
+        def load() -> Optional[Dict]:
+            with self.pool.connection() as conn:
+                row = conn.execute('''
+                    SELECT id, name, source_engine, target_engine, status, owner_id, created_at, updated_at, metadata
+                    FROM migration_projects
+                    WHERE id = ?
+                ''', (project_id,)).fetchone()
+            if row is None:
+                return None
+            return {
+                'id': row[0],
+                'name': row[1],
+                'source_engine': row[2],
+                'target_engine': row[3],
+                'status': row[4],
+                'owner_id': row[5],
+                'created_at': row[6],
+                'updated_at': row[7],
+                'metadata': json.loads(row[8] or '{}')
+            }
+        
+        try:
+            return self.read_cache.get('migration_projects', ('project', project_id), load)
+        except Exception as e:
+            logger.error(f"Failed to get project: {e}")
+            return None
+    
     def get_user_projects(self, user_id: str) -> List[Dict]:
         """Get projects for user"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT id, name, source_engine, target_engine, status, created_at
-                FROM migration_projects
-                WHERE owner_id = ?
-                ORDER BY created_at DESC
-            ''', (user_id,))
+        def load() -> List[Dict]:
+            with self.pool.connection() as conn:
+                rows = conn.execute('''
+                    SELECT id, name, source_engine, target_engine, status, created_at
+                    FROM migration_projects
+                    WHERE owner_id = ?
+                    ORDER BY created_at DESC
+                ''', (user_id,)).fetchall()
             
             projects = []
-            for row in cursor.fetchall():
+            for row in rows:
                 projects.append({
                     'id': row[0],
                     'name': row[1],
@@ -928,31 +1250,1529 @@ class EnterpriseDBManager:
                     'created_at': row[5]
                 })
             
-            conn.close()
             return projects
+        
+        try:
+            return self.read_cache.get('migration_projects', ('user_projects', user_id), load)
         except Exception as e:
             logger.error(f"Failed to get user projects: {e}")
             return []
+    
+    def get_user_projects_page(self, user_id: str, after: Optional[Tuple[str, str]] = None,
+                               limit: int = 20) -> Tuple[List[Dict], Optional[Tuple[str, str]]]:
+        """Get one page of projects, newest first, using keyset pagination.
+        
+        `after` is the (created_at, id) cursor returned by the previous page; the
+        returned cursor is None when there are no further pages.
+        """
+        after = tuple(after) if after is not None else None
+        
+        def load() -> Tuple[List[Dict], Optional[Tuple[str, str]]]:
+            query = '''
+                SELECT id, name, source_engine, target_engine, status, created_at
+                FROM migration_projects
+                WHERE owner_id = ?
+            '''
+            params: List[Any] = [user_id]
+            if after is not None:
+                # Row-value comparison lets SQLite seek straight to the cursor in the index
+                query += " AND (created_at, id) < (?, ?)"
+                params.extend(after)
+            query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+            params.append(limit + 1)
+            
+            with self.pool.connection() as conn:
+                rows = conn.execute(query, params).fetchall()
+            
+            projects = [
+                {
+                    'id': row[0],
+                    'name': row[1],
+                    'source_engine': row[2],
+                    'target_engine': row[3],
+                    'status': row[4],
+                    'created_at': row[5]
+                }
+                for row in rows[:limit]
+            ]
+            next_cursor = (projects[-1]['created_at'], projects[-1]['id']) if len(rows) > limit else None
+            return projects, next_cursor
+        
+        try:
+            return self.read_cache.get('migration_projects', ('user_projects_page', user_id, after, limit), load)
+        except Exception as e:
+            logger.error(f"Failed to get user projects page: {e}")
+            return [], None
+    
+    def save_analysis_result(self, project_id: str, analysis_type: str, result: Any, summary: Dict,
+                             confidence_score: Optional[float] = None,
+                             search_documents: Optional[List[Tuple[str, str, str]]] = None,
+                             schema_text: Optional[str] = None) -> Optional[str]:
+        """Persist a result as a JSON summary row plus a zlib-compressed JSON payload.
+        
+        Replaces the project's previous result of the same type, along with its
+        (kind, title, body) search documents. schema_text replaces the project's
+        indexed schema.
+        """
+        try:
+            raw = serialize_result(result).encode('utf-8')
+            result_id = str(uuid.uuid4())
+            with self.pool.connection() as conn:
+                stale = [row[0] for row in conn.execute(
+                    "SELECT id FROM analysis_results WHERE project_id = ? AND analysis_type = ?",
+                    (project_id, analysis_type)
+                )]
+                conn.executemany("DELETE FROM analysis_search WHERE result_id = ?", [(rid,) for rid in stale])
+                conn.executemany("DELETE FROM analysis_payloads WHERE result_id = ?", [(rid,) for rid in stale])
+                conn.executemany("DELETE FROM analysis_results WHERE id = ?", [(rid,) for rid in stale])
+                conn.execute('''
+                    INSERT INTO analysis_results (id, project_id, analysis_type, result_data, confidence_score)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (result_id, project_id, analysis_type, json.dumps(summary, default=str), confidence_score))
+                conn.execute(
+                    "INSERT INTO analysis_payloads (result_id, raw_size, payload) VALUES (?, ?, ?)",
+                    (result_id, len(raw), zlib.compress(raw, 6))
+                )
+                conn.executemany(
+                    "INSERT INTO analysis_search (project_id, result_id, kind, title, body) VALUES (?, ?, ?, ?, ?)",
+                    [(project_id, result_id, kind, title, body) for kind, title, body in search_documents or []]
+                )
+                if schema_text and schema_text.strip():
+                    conn.execute("DELETE FROM analysis_search WHERE project_id = ? AND kind = 'schema'", (project_id,))
+                    conn.execute(
+                        "INSERT INTO analysis_search (project_id, result_id, kind, title, body) VALUES (?, NULL, 'schema', ?, ?)",
+                        (project_id, "Schema & Queries", schema_text)
+                    )
+            self.read_cache.invalidate('analysis_results')
+            return result_id
+        except Exception as e:
+            logger.error(f"Failed to save {analysis_type} result: {e}")
+            return None
+    
+    def get_analysis_summaries(self, project_id: str, analysis_type: Optional[str] = None) -> List[Dict]:
+        """Summary rows of a project's saved results, newest first, without loading payloads"""
+        def load() -> List[Dict]:
+            query = '''
+                SELECT id, analysis_type, result_data, confidence_score, created_at
+                FROM analysis_results
+                WHERE project_id = ?
+            '''
+            params: List[Any] = [project_id]
+            if analysis_type is not None:
+                query += " AND analysis_type = ?"
+                params.append(analysis_type)
+            query += " ORDER BY created_at DESC, id DESC"
+            
+            with self.pool.connection() as conn:
+                rows = conn.execute(query, params).fetchall()
+            
+            return [
+                {
+                    'id': row[0],
+                    'analysis_type': row[1],
+                    'summary': json.loads(row[2]),
+                    'confidence_score': row[3],
+                    'created_at': row[4]
+                }
+                for row in rows
+            ]
+        
+        try:
+            return self.read_cache.get('analysis_results', ('summaries', project_id, analysis_type), load)
+        except Exception as e:
+            logger.error(f"Failed to get analysis summaries: {e}")
+            return []
+    
+    def search_analyses(self, user_id: str, text: str, limit: int = 25) -> List[Dict]:
+        """Ranked matches for text across the user's indexed schemas, fixes and recommendations"""
+        text = text.strip()
+        if not text:
+            return []
+        
+        def load() -> List[Dict]:
+            with self.pool.connection() as conn:
+                if self.fts_enabled:
+                    # The input is matched as one phrase so SQL such as CONNECT BY needs no FTS syntax
+                    rows = conn.execute('''
+                        SELECT s.project_id, p.name, s.kind, s.title,
+                               snippet(analysis_search, -1, '«', '»', '…', 16), bm25(analysis_search, 0, 0, 0, 4.0, 1.0)
+                        FROM analysis_search s
+                        JOIN migration_projects p ON p.id = s.project_id
+                        WHERE analysis_search MATCH ? AND p.owner_id = ?
+                        ORDER BY 6
+                        LIMIT ?
+                    ''', ('"' + text.replace('"', '""') + '"', user_id, limit)).fetchall()
+                else:
+                    pattern = '%' + re.sub(r'([\\%_])', r'\\\1', text) + '%'
+                    rows = conn.execute('''
+                        SELECT s.project_id, p.name, s.kind, s.title, s.body, s.title LIKE ? ESCAPE '\\'
+                        FROM analysis_search s
+                        JOIN migration_projects p ON p.id = s.project_id
+                        WHERE p.owner_id = ? AND (s.title LIKE ? ESCAPE '\\' OR s.body LIKE ? ESCAPE '\\')
+                        ORDER BY 6 DESC
+                        LIMIT ?
+                    ''', (pattern, user_id, pattern, pattern, limit)).fetchall()
+                    rows = [row[:4] + (self._like_snippet(row[4] or '', text), row[5]) for row in rows]
+            
+            return [
+                {
+                    'project_id': row[0],
+                    'project_name': row[1],
+                    'kind': row[2],
+                    'title': row[3],
+                    'snippet': row[4],
+                    'score': row[5]
+                }
+                for row in rows
+            ]
+        
+        try:
+            # Hits carry project names, so the key also tracks the projects table's version
+            key = ('search', user_id, text, limit, self.read_cache.version('migration_projects'))
+            return self.read_cache.get('analysis_results', key, load)
+        except Exception as e:
+            logger.error(f"Analysis search failed: {e}")
+            return []
+    
+    @staticmethod
+    def _like_snippet(body: str, text: str, width: int = 60) -> str:
+        """Excerpt around the first case-insensitive occurrence of text"""
+        position = body.lower().find(text.lower())
+        if position < 0:
+            return body[:width * 2]
+        start = max(position - width, 0)
+        end = position + len(text)
+        return ('…' if start else '') + body[start:position] + '«' + body[position:end] + '»' + body[end:end + width] + '…'
+    
+    def load_analysis_payload(self, result_id: str) -> Any:
+        """Decompress and rebuild a saved result with the calling script run's classes"""
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute("SELECT payload FROM analysis_payloads WHERE result_id = ?", (result_id,)).fetchone()
+            return deserialize_result(zlib.decompress(row[0])) if row else None
+        except Exception as e:
+            logger.warning(f"Saved result {result_id} could not be loaded: {e}")
+            return None
 
-# Enhanced AWS Cost Calculator
-class EnhancedAWSCostCalculator:
-    """Enhanced AWS cost calculation with real-time pricing"""
+@st.cache_resource
+def get_db_manager() -> EnterpriseDBManager:
+    """Process-wide database manager; the schema is initialized once per process"""
+    return EnterpriseDBManager()
+
+class LLMResponseCache:
+    """SQLite cache of LLM responses with TTL and LRU size bound"""
+    
+    def __init__(self, pool: SQLiteConnectionPool, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 500):
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        with self.pool.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS llm_response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    analysis_type TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_accessed ON llm_response_cache (last_accessed)')
+    
+    @staticmethod
+    def make_key(model: str, prompt: str, analysis_type: str) -> str:
+        """Cache key over the model, whitespace-normalized prompt and analysis type"""
+        return stable_hash(model, ' '.join(prompt.split()), analysis_type)
+    
+    def get(self, cache_key: str) -> Optional[Any]:
+        """Cached response payload, None when missing or expired"""
+        now = time.time()
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                'SELECT response, created_at FROM llm_response_cache WHERE cache_key = ?', (cache_key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                conn.execute('DELETE FROM llm_response_cache WHERE cache_key = ?', (cache_key,))
+                row = None
+            elif row is not None:
+                conn.execute('UPDATE llm_response_cache SET last_accessed = ? WHERE cache_key = ?', (now, cache_key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+    
+    def put(self, cache_key: str, model: str, analysis_type: str, response: Any):
+        """Store a JSON-serializable response and evict down to the size bound"""
+        now = time.time()
+        with self.pool.connection() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO llm_response_cache
+                (cache_key, model, analysis_type, response, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (cache_key, model, analysis_type, json.dumps(response, default=str), now, now))
+            conn.execute('DELETE FROM llm_response_cache WHERE created_at < ?', (now - self.ttl_seconds,))
+            conn.execute('''
+                DELETE FROM llm_response_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_response_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+    
+    def clear(self):
+        """Drop all cached responses"""
+        with self.pool.connection() as conn:
+            conn.execute('DELETE FROM llm_response_cache')
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and stored entry count"""
+        with self.pool.connection() as conn:
+            size = conn.execute('SELECT COUNT(*) FROM llm_response_cache').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'size': size}
+
+@st.cache_resource
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Process-wide LLM response cache, None if the cache table cannot be opened"""
+    try:
+        return LLMResponseCache(get_db_manager().pool)
+    except Exception as e:
+        logger.warning(f"LLM response cache unavailable: {e}")
+        return None
+
+class BackgroundEventLoop:
+    """Long-lived asyncio loop on a daemon thread, fed coroutines from any thread"""
+    
+    def __init__(self, name: str = "async-worker"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop and return a thread-safe future for its result"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("submit() called from the background loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the loop and block until it finishes"""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+    
+    def stop(self):
+        """Stop the loop and wait for its thread to exit"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+@st.cache_resource
+def get_background_loop() -> BackgroundEventLoop:
+    """Process-wide event loop for async analyzers"""
+    return BackgroundEventLoop()
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every event loop issuing LLM requests"""
+    
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take one token, returning how long the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+    
+    async def acquire(self):
+        """Wait until a request slot is available"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class AsyncLLMClient:
+    """Process-wide Anthropic client with concurrency limit, rate limiting and jittered backoff"""
+    
+    RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+    
+    def __init__(self, api_key: str, base_url: Optional[str] = None, max_concurrency: int = 8,
+                 requests_per_minute: float = 50, max_retries: int = 5, base_delay: float = 1.0,
+                 max_delay: float = 30.0):
+        import anthropic
+        self._anthropic = anthropic
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rate_limiter = TokenBucket(requests_per_minute / 60.0, capacity=max(1.0, requests_per_minute / 10.0))
+        self.retries = 0
+        # The SDK's HTTP pool and asyncio primitives are bound to the loop that created them
+        self._loop_state = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    def _state(self) -> Tuple[Any, asyncio.Semaphore]:
+        """SDK client and concurrency semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._loop_state.get(loop)
+            if state is None:
+                client = self._anthropic.AsyncAnthropic(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+                state = (client, asyncio.Semaphore(self.max_concurrency))
+                self._loop_state[loop] = state
+            return state
+    
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        """Whether a failed request is transient and retries remain"""
+        if attempt >= self.max_retries:
+            return False
+        if isinstance(error, self._anthropic.APIConnectionError):
+            return True
+        return getattr(error, 'status_code', None) in self.RETRY_STATUS_CODES
+    
+    def _backoff_delay(self, error: Exception, attempt: int) -> float:
+        """Full-jitter exponential backoff, never shorter than a server-supplied retry-after"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        try:
+            delay = max(delay, min(self.max_delay, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+        return delay
+    
+    async def _retry_wait(self, error: Exception, attempt: int):
+        """Log and sleep before the next attempt"""
+        delay = self._backoff_delay(error, attempt)
+        self.retries += 1
+        logger.warning(f"LLM request failed ({error}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+    
+    async def create(self, **request):
+        """messages.create with rate limiting and retries"""
+        client, semaphore = self._state()
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            try:
+                # A concurrency slot is held per attempt, never while backing off
+                async with semaphore:
+                    return await client.messages.create(**request)
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+                await self._retry_wait(e, attempt)
+    
+    @contextlib.asynccontextmanager
+    async def stream(self, **request):
+        """messages.stream with rate limiting; retries only apply before the stream opens"""
+        client, semaphore = self._state()
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            # The slot is held while the stream is open, and released before backing off
+            async with semaphore:
+                manager = client.messages.stream(**request)
+                try:
+                    stream = await manager.__aenter__()
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                    error = e
+                else:
+                    try:
+                        yield stream
+                    except BaseException as e:
+                        if not await manager.__aexit__(type(e), e, e.__traceback__):
+                            raise
+                    else:
+                        await manager.__aexit__(None, None, None)
+                    return
+            await self._retry_wait(error, attempt)
+
+@st.cache_resource
+def get_llm_client() -> Optional[AsyncLLMClient]:
+    """Process-wide LLM client, None when no Anthropic API key is configured"""
+    try:
+        api_key = st.secrets.get("ANTHROPIC_API_KEY")
+        base_url = st.secrets.get("ANTHROPIC_BASE_URL")
+    except Exception as e:
+        logger.warning(f"LLM client unavailable: {e}")
+        return None
+    if not api_key:
+        return None
+    try:
+        return AsyncLLMClient(api_key, base_url=base_url or None)
+    except Exception as e:
+        logger.warning(f"LLM client unavailable: {e}")
+        return None
+
+# Result serialization
+def serialize_result(value: Any) -> str:
+    """JSON form of a job or analysis result
+    
+    Dataclasses and enums are stored by class name and rebuilt with the reading script run's
+    classes, since every run re-executes this module and redefines them.
+    """
+    return json.dumps(_encode_result(value))
+
+def deserialize_result(text: Union[str, bytes]) -> Any:
+    """Rebuild a serialize_result value; only this module's dataclasses and enums are instantiated"""
+    return _decode_result(json.loads(text))
+
+def _encode_result(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {'__dataclass__': type(value).__name__,
+                'fields': {f.name: _encode_result(getattr(value, f.name)) for f in dataclasses.fields(value)}}
+    if isinstance(value, Enum):
+        return {'__enum__': type(value).__name__, 'value': value.value}
+    if isinstance(value, pd.DataFrame):
+        return {'__dataframe__': value.to_json(orient='table')}
+    if isinstance(value, np.ndarray):
+        return {'__ndarray__': value.tolist(), 'dtype': str(value.dtype)}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode_result(item) for item in value]}
+    if isinstance(value, dict):
+        # Non-string keys (e.g. AnalysisType) and keys that look like tags are kept as pairs
+        if all(isinstance(key, str) and not key.startswith('__') for key in value):
+            return {key: _encode_result(item) for key, item in value.items()}
+        return {'__items__': [[_encode_result(key), _encode_result(item)] for key, item in value.items()]}
+    if isinstance(value, (list, set)):
+        return [_encode_result(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def _result_class(name: str, kind: str) -> type:
+    """Current run's class for a serialized dataclass or enum name"""
+    cls = globals().get(name)
+    if kind == 'dataclass' and isinstance(cls, type) and dataclasses.is_dataclass(cls):
+        return cls
+    if kind == 'enum' and isinstance(cls, type) and issubclass(cls, Enum):
+        return cls
+    raise ValueError(f"Unknown {kind} in serialized result: {name}")
+
+def _decode_result(data: Any) -> Any:
+    if isinstance(data, list):
+        return [_decode_result(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    if '__dataclass__' in data:
+        cls = _result_class(data['__dataclass__'], 'dataclass')
+        values = {name: _decode_result(item) for name, item in data['fields'].items()}
+        init_fields = {f.name for f in dataclasses.fields(cls) if f.init}
+        instance = cls(**{name: item for name, item in values.items() if name in init_fields})
+        for name, item in values.items():
+            if name not in init_fields:
+                setattr(instance, name, item)
+        return instance
+    if '__enum__' in data:
+        return _result_class(data['__enum__'], 'enum')(data['value'])
+    if '__dataframe__' in data:
+        return pd.read_json(io.StringIO(data['__dataframe__']), orient='table')
+    if '__ndarray__' in data:
+        return np.array(data['__ndarray__'], dtype=data['dtype'])
+    if '__datetime__' in data:
+        return datetime.fromisoformat(data['__datetime__'])
+    if '__tuple__' in data:
+        return tuple(_decode_result(item) for item in data['__tuple__'])
+    if '__items__' in data:
+        return {_decode_result(key): _decode_result(item) for key, item in data['__items__']}
+    return {key: _decode_result(item) for key, item in data.items()}
+
+# Background jobs that outlive script reruns
+@dataclass
+class JobRecord:
+    """Status of a background job"""
+    id: str
+    job_type: str
+    job_key: str
+    status: str
+    progress: float
+    message: str
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+
+class JobManager:
+    """Thread-pool job runner with job records persisted in the enterprise database"""
+    
+    ACTIVE_STATUSES = ('queued', 'running')
+    
+    def __init__(self, pool: SQLiteConnectionPool, max_workers: int = 4, progress_interval: float = 0.25):
+        self.pool = pool
+        self.progress_interval = progress_interval
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        # In-progress partial results stay in memory; final results are persisted as JSON
+        self._partials: Dict[str, Any] = {}
+        with self.pool.connection() as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS background_jobs (
+                    id TEXT PRIMARY KEY,
+                    job_type TEXT NOT NULL,
+                    job_key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    message TEXT DEFAULT '',
+                    result BLOB,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_background_jobs_key ON background_jobs (job_type, job_key, created_at);
+            ''')
+            # Workers from a previous process are gone; their jobs can never finish
+            conn.execute(
+                "UPDATE background_jobs SET status = 'interrupted', updated_at = ? WHERE status IN ('queued', 'running')",
+                (time.time(),)
+            )
+    
+    def submit(self, job_type: str, job_key: str, fn, *args) -> str:
+        """Queue fn(report, *args), returning the id of an identical in-flight job if there is one
+        
+        report(fraction, message='', partial=None) updates progress and the job's partial result.
+        """
+        # The lock makes the in-flight check and insert atomic within this process
+        with self._lock, self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT id FROM background_jobs WHERE job_type = ? AND job_key = ? AND status IN ('queued', 'running') "
+                "ORDER BY created_at DESC LIMIT 1", (job_type, job_key)
+            ).fetchone()
+            if row:
+                return row[0]
+            
+            job_id = str(uuid.uuid4())
+            now = time.time()
+            conn.execute(
+                "INSERT INTO background_jobs (id, job_type, job_key, status, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, job_type, job_key, now, now)
+            )
+        
+        self._executor.submit(self._execute, job_id, fn, args)
+        return job_id
+    
+    def _execute(self, job_id: str, fn, args: Tuple):
+        """Worker body: run the job and record its outcome"""
+        self._update(job_id, status='running')
+        last_write = [0.0, -1.0]
+        
+        def report(fraction: float, message: str = '', partial: Any = None):
+            if partial is not None:
+                with self._lock:
+                    self._partials[job_id] = partial
+            # Progress steps always land; sub-step updates are throttled
+            now = time.monotonic()
+            if fraction != last_write[1] or now - last_write[0] >= self.progress_interval:
+                last_write[:] = [now, fraction]
+                self._update(job_id, progress=float(fraction), message=message)
+        
+        try:
+            payload = serialize_result(fn(report, *args))
+            self._update(job_id, status='completed', progress=1.0, message='Completed', result=payload)
+        except Exception as e:
+            logger.error(f"Background job {job_id} failed: {e}")
+            self._update(job_id, status='failed', message='Failed', error=str(e))
+        finally:
+            with self._lock:
+                self._partials.pop(job_id, None)
+    
+    def _update(self, job_id: str, **fields):
+        """Write job fields and bump updated_at"""
+        fields['updated_at'] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.pool.connection() as conn:
+            conn.execute(f"UPDATE background_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+    
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        """Current record of a job"""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT id, job_type, job_key, status, progress, message, error, created_at, updated_at "
+                "FROM background_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return JobRecord(*row) if row else None
+    
+    def latest(self, job_type: str, job_key: str) -> Optional[JobRecord]:
+        """Most recent job for the same inputs, so work can be resumed after a page reload"""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT id FROM background_jobs WHERE job_type = ? AND job_key = ? ORDER BY created_at DESC LIMIT 1",
+                (job_type, job_key)
+            ).fetchone()
+        return self.get(row[0]) if row else None
+    
+    def result(self, job_id: str) -> Any:
+        """Result of a completed job, rebuilt with the calling script run's classes"""
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT result FROM background_jobs WHERE id = ?", (job_id,)).fetchone()
+        try:
+            return deserialize_result(row[0]) if row and row[0] is not None else None
+        except Exception as e:
+            logger.warning(f"Background job {job_id} result could not be loaded: {e}")
+            return None
+    
+    def partial(self, job_id: str) -> Any:
+        """Latest partial result reported by a running job"""
+        with self._lock:
+            return self._partials.get(job_id)
+
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """Process-wide job manager so jobs outlive script reruns"""
+    return JobManager(get_db_manager().pool)
+
+def follow_job(job_type: str, job_key: str, fn=None, *args, label: str = "", on_partial=None) -> Any:
+    """Start a job when fn is given, otherwise resume the latest one for job_key, and return its result
+    
+    A running job gets one progress bar per script run and None is returned; the run then
+    schedules a rerun (see rerun_for_active_jobs) that picks up the new progress or the result.
+    """
+    jobs = get_job_manager()
+    state_key = f"job_{job_type}"
+    if fn is not None:
+        st.session_state[state_key] = jobs.submit(job_type, job_key, fn, *args)
+    
+    job = jobs.get(st.session_state[state_key]) if state_key in st.session_state else None
+    if job is None or job.job_key != job_key:
+        job = jobs.latest(job_type, job_key)
+    if job is None:
+        return None
+    
+    if job.status in JobManager.ACTIVE_STATUSES:
+        st.progress(min(max(job.progress, 0.0), 1.0), text=job.message or label or job.status.title())
+        if on_partial is not None:
+            partial = jobs.partial(job.id)
+            if partial is not None:
+                on_partial(partial)
+        st.session_state.jobs_rerun_pending = True
+        return None
+    
+    if job.status == 'completed':
+        return jobs.result(job.id)
+    if job.status == 'failed':
+        st.error(f"❌ Background job failed: {job.error}")
+    elif job.status == 'interrupted':
+        st.warning("⚠️ The previous run of this job was interrupted by a restart; start it again")
+    return None
+
+def rerun_for_active_jobs(delay: float = 0.5):
+    """Rerun the script shortly after a run that showed a running job, to refresh its progress
+    
+    Called once the page is fully rendered, so the wait never holds back the rest of the run
+    and any widget interaction replaces the scheduled rerun.
+    """
+    if st.session_state.get('jobs_rerun_pending'):
+        st.session_state.jobs_rerun_pending = False
+        time.sleep(delay)
+        st.rerun()
+
+def load_saved_result(analysis_type: str, job_key: str, label: str) -> Any:
+    """Offer the current project's saved result of a type and load its payload on demand
+    
+    Only a result saved for the same inputs (job_key) is offered. Only the result id is
+    kept in session state; the payload is decompressed from the database on each run
+    that shows it.
+    """
+    # While a job for the same inputs runs, its progress is shown instead
+    running = get_job_manager().latest(analysis_type, job_key)
+    if running is not None and running.status in JobManager.ACTIVE_STATUSES:
+        return None
+    
+    project_id = st.session_state.get('current_project')
+    if not project_id:
+        return None
+    
+    db_manager = get_db_manager()
+    saved = db_manager.get_analysis_summaries(project_id, analysis_type)
+    if not saved:
+        return None
+    latest = saved[0]
+    if latest['summary'].get('job_key') != job_key:
+        return None
+    
+    state_key = f"saved_result_{analysis_type}"
+    if st.session_state.get(state_key) != latest['id']:
+        st.info(f"💾 Saved {label} from {latest['created_at']}: {latest['summary'].get('headline', '')}")
+        if not st.button("📂 Load Saved Result", key=f"load_saved_{analysis_type}"):
+            return None
+        st.session_state[state_key] = latest['id']
+    
+    result = db_manager.load_analysis_payload(latest['id'])
+    if result is not None:
+        st.caption(f"💾 Showing saved {label} from {latest['created_at']}")
+    return result
+
+# Bundled AWS list prices (us-east-1), used until a live pricing snapshot is available
+DEFAULT_AWS_PRICING = {
+    'instance_monthly': {
+        'db.t3.micro': 16.79,
+        'db.t3.small': 33.58,
+        'db.t3.medium': 67.15,
+        'db.t3.large': 134.30,
+        'db.m5.large': 175.20,
+        'db.m5.xlarge': 350.40,
+        'db.m5.2xlarge': 700.80,
+        'db.r5.large': 217.44,
+        'db.r5.xlarge': 434.88,
+        'db.r5.2xlarge': 869.76,
+        'db.r5.4xlarge': 1739.52
+    },
+    'storage_gb_month': {
+        'gp2': 0.115,
+        'gp3': 0.08,
+        'io1': 0.125,
+        'io2': 0.125
+    },
+    # Provisioned performance charges per month (gp3 beyond its baseline, io1/io2 for every IOPS)
+    'storage_performance': {
+        'gp3': {'iops_month': 0.02, 'mibps_month': 0.08},
+        'io1': {'iops_month': 0.10},
+        'io2': {'iops_month': 0.10}
+    },
+    # Aurora cluster pricing: Standard bills I/O per request, I/O-Optimized folds it into instance and storage
+    'aurora': {
+        'instance_premium': 1.2,
+        'storage_gb_month': 0.10,
+        'io_per_million': 0.20,
+        'io_optimized_instance_multiplier': 1.3,
+        'io_optimized_storage_gb_month': 0.225
+    },
+    'backup_gb_month': 0.095,
+    'dms_instance_monthly': {
+        'dms.t3.micro': 18.0,
+        'dms.t3.small': 36.0,
+        'dms.t3.medium': 72.0,
+        'dms.t3.large': 144.0,
+        'dms.c5.large': 110.88,
+        'dms.c5.xlarge': 221.76,
+        'dms.c5.2xlarge': 443.52,
+        'dms.r5.large': 155.52,
+        'dms.r5.xlarge': 311.04
+    },
+    # [tier upper bound in GB (None = unbounded), USD per GB]
+    'data_transfer_tiers': [[1, 0.0], [10240, 0.09], [None, 0.085]],
+    # Reserved instance terms: effective discount vs on-demand over the term, share of the term cost paid upfront
+    'reserved_instances': [
+        {'term_years': 1, 'payment_option': 'No Upfront', 'discount': 0.31, 'upfront_fraction': 0.0},
+        {'term_years': 1, 'payment_option': 'Partial Upfront', 'discount': 0.34, 'upfront_fraction': 0.5},
+        {'term_years': 1, 'payment_option': 'All Upfront', 'discount': 0.36, 'upfront_fraction': 1.0},
+        {'term_years': 3, 'payment_option': 'Partial Upfront', 'discount': 0.53, 'upfront_fraction': 0.5},
+        {'term_years': 3, 'payment_option': 'All Upfront', 'discount': 0.56, 'upfront_fraction': 1.0}
+    ],
+    # Approximate regional premium over us-east-1 list prices, per cost component
+    'region_pricing': {
+        'us-east-1': {'instance': 1.0, 'storage': 1.0, 'backup': 1.0, 'dms': 1.0, 'data_transfer': 1.0},
+        'us-west-2': {'instance': 1.0, 'storage': 1.0, 'backup': 1.0, 'dms': 1.0, 'data_transfer': 1.0},
+        'eu-west-1': {'instance': 1.12, 'storage': 1.1, 'backup': 1.0, 'dms': 1.1, 'data_transfer': 1.0},
+        'eu-central-1': {'instance': 1.17, 'storage': 1.16, 'backup': 1.05, 'dms': 1.15, 'data_transfer': 1.0},
+        'ap-southeast-1': {'instance': 1.2, 'storage': 1.2, 'backup': 1.0, 'dms': 1.22, 'data_transfer': 1.33},
+        'ap-southeast-2': {'instance': 1.2, 'storage': 1.2, 'backup': 1.0, 'dms': 1.25, 'data_transfer': 1.27}
+    }
+}
+
+# Regions offered for deployment and pricing
+AWS_PRICING_REGIONS = list(DEFAULT_AWS_PRICING['region_pricing'].keys())
+
+# RDS storage performance envelope per volume type (non-Oracle/SQL Server engines)
+STORAGE_PERFORMANCE_LIMITS = {
+    'gp2': {'iops_per_gb': 3, 'min_iops': 100, 'max_iops': 16000, 'small_mibps': 128, 'large_volume_gb': 334, 'max_mibps': 250},
+    'gp3': {'baseline_iops': 3000, 'baseline_mibps': 125, 'large_volume_gb': 400, 'large_baseline_iops': 12000,
+            'large_baseline_mibps': 500, 'max_iops': 64000, 'max_mibps': 4000, 'mibps_per_iops': 0.25},
+    'io1': {'min_iops': 1000, 'max_iops': 256000, 'max_iops_per_gb': 50, 'mibps_per_iops': 0.25, 'max_mibps': 4000},
+    'io2': {'min_iops': 1000, 'max_iops': 256000, 'max_iops_per_gb': 1000, 'mibps_per_iops': 0.25, 'max_mibps': 4000}
+}
+
+# DMS replication instance capacity (sustained full-load MB/s across all threads, network Gbps)
+DMS_INSTANCE_SPECS = {
+    'dms.t3.micro': {'vcpu': 2, 'memory_gib': 1, 'throughput_mbps': 5, 'network_gbps': 0.5},
+    'dms.t3.small': {'vcpu': 2, 'memory_gib': 2, 'throughput_mbps': 10, 'network_gbps': 0.5},
+    'dms.t3.medium': {'vcpu': 2, 'memory_gib': 4, 'throughput_mbps': 20, 'network_gbps': 0.5},
+    'dms.t3.large': {'vcpu': 2, 'memory_gib': 8, 'throughput_mbps': 35, 'network_gbps': 0.5},
+    'dms.c5.large': {'vcpu': 2, 'memory_gib': 4, 'throughput_mbps': 45, 'network_gbps': 0.75},
+    'dms.c5.xlarge': {'vcpu': 4, 'memory_gib': 8, 'throughput_mbps': 90, 'network_gbps': 1.25},
+    'dms.c5.2xlarge': {'vcpu': 8, 'memory_gib': 16, 'throughput_mbps': 180, 'network_gbps': 2.5},
+    'dms.r5.large': {'vcpu': 2, 'memory_gib': 16, 'throughput_mbps': 50, 'network_gbps': 0.75},
+    'dms.r5.xlarge': {'vcpu': 4, 'memory_gib': 32, 'throughput_mbps': 100, 'network_gbps': 1.25}
+}
+
+# Upper bound in hours for each sidebar downtime tolerance option
+DOWNTIME_TOLERANCE_HOURS = {
+    '< 1 hour': 1,
+    '< 4 hours': 4,
+    '< 24 hours': 24,
+    'Flexible': None
+}
+
+# RDS instance class capacity (vCPU, memory GiB, baseline network Gbps; CPU credit baseline for burstable classes)
+RDS_INSTANCE_SPECS = {
+    'db.t3.micro': {'vcpu': 2, 'memory_gib': 1, 'network_gbps': 0.5, 'cpu_baseline_pct': 10},
+    'db.t3.small': {'vcpu': 2, 'memory_gib': 2, 'network_gbps': 0.5, 'cpu_baseline_pct': 20},
+    'db.t3.medium': {'vcpu': 2, 'memory_gib': 4, 'network_gbps': 0.5, 'cpu_baseline_pct': 20},
+    'db.t3.large': {'vcpu': 2, 'memory_gib': 8, 'network_gbps': 0.5, 'cpu_baseline_pct': 30},
+    'db.m5.large': {'vcpu': 2, 'memory_gib': 8, 'network_gbps': 0.75},
+    'db.m5.xlarge': {'vcpu': 4, 'memory_gib': 16, 'network_gbps': 1.25},
+    'db.m5.2xlarge': {'vcpu': 8, 'memory_gib': 32, 'network_gbps': 2.5},
+    'db.r5.large': {'vcpu': 2, 'memory_gib': 16, 'network_gbps': 0.75},
+    'db.r5.xlarge': {'vcpu': 4, 'memory_gib': 32, 'network_gbps': 1.25},
+    'db.r5.2xlarge': {'vcpu': 8, 'memory_gib': 64, 'network_gbps': 2.5},
+    'db.r5.4xlarge': {'vcpu': 16, 'memory_gib': 128, 'network_gbps': 4.75}
+}
+
+class AWSClientRegistry:
+    """Lazily created boto3 clients shared for the lifetime of the process"""
     
     def __init__(self):
-        self.connected = False
+        self._clients = {}
+        self._lock = threading.Lock()
+    
+    def get(self, service_name: str, region_name: str = 'us-east-1'):
+        """Return the client for service/region, creating it on first use"""
+        key = (service_name, region_name)
+        with self._lock:
+            if key not in self._clients:
+                import boto3
+                from botocore.config import Config
+                self._clients[key] = boto3.client(
+                    service_name,
+                    region_name=region_name,
+                    config=Config(connect_timeout=5, read_timeout=15, retries={'max_attempts': 2})
+                )
+                logger.info(f"Created boto3 {service_name} client for {region_name}")
+            return self._clients[key]
+
+@st.cache_resource
+def get_aws_clients() -> AWSClientRegistry:
+    """Process-wide boto3 client registry"""
+    return AWSClientRegistry()
+
+class PricingSnapshotStore:
+    """Local AWS pricing snapshot with TTL-based background refresh"""
+    
+    # Price sections the refresh fetches from AWS; everything else stays on bundled list prices.
+    # engine_instance_monthly maps target engine -> region -> instance class -> Single-AZ monthly price.
+    LIVE_KEYS = ('engine_instance_monthly',)
+    
+    def __init__(self, snapshot_path: Path = Path("aws_pricing_snapshot.json"),
+                 ttl_seconds: int = 24 * 3600, retry_seconds: int = 15 * 60,
+                 client_registry: Optional[AWSClientRegistry] = None,
+                 regions: Optional[List[str]] = None, fetch_workers: int = 8):
+        self.snapshot_path = Path(snapshot_path)
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        # Reference region for the base price ladder; the Price List API itself is only served from us-east-1
+        self.region = 'us-east-1'
+        self.regions = regions or AWS_PRICING_REGIONS
+        self.fetch_workers = fetch_workers
+        self._clients = client_registry
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._last_attempt = 0.0
+        self._snapshot = self._load_snapshot()
+    
+    def get(self) -> Dict:
+        """Return the current snapshot immediately, scheduling a refresh if it is stale"""
+        with self._lock:
+            snapshot = self._snapshot
+        
+        if self.is_stale(snapshot):
+            self.refresh_async()
+        return snapshot
+    
+    def is_stale(self, snapshot: Dict) -> bool:
+        """Whether the snapshot is older than the TTL (bundled defaults are always stale)"""
+        fetched_at = snapshot.get('fetched_at')
+        if not fetched_at:
+            return True
+        return time.time() - fetched_at > self.ttl_seconds
+    
+    def refresh_async(self) -> bool:
+        """Start a background refresh unless one is running or the last attempt was recent"""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            if time.time() - self._last_attempt < self.retry_seconds:
+                return False
+            self._last_attempt = time.time()
+            self._refresh_thread = threading.Thread(target=self._refresh, name="pricing-refresh", daemon=True)
+            self._refresh_thread.start()
+            return True
+    
+    def _refresh(self):
+        """Fetch live prices and atomically replace the local snapshot"""
+        try:
+            with self._lock:
+                instance_classes = list(self._snapshot['prices']['instance_monthly'])
+            
+            # Only the fetched sections are persisted and labelled as coming from AWS
+            stored = {
+                'source': 'aws',
+                'region': self.region,
+                'fetched_at': time.time(),
+                'live_keys': list(self.LIVE_KEYS),
+                'prices': self._fetch_live_prices(instance_classes)
+            }
+            
+            tmp_path = self.snapshot_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(stored, indent=2))
+            tmp_path.replace(self.snapshot_path)
+            
+            snapshot = self._merge_stored(stored)
+            with self._lock:
+                self._snapshot = snapshot
+            logger.info("AWS pricing snapshot refreshed")
+        except Exception as e:
+            logger.warning(f"AWS pricing refresh failed, keeping local snapshot: {e}")
+    
+    def _fetch_live_prices(self, instance_classes: List[str]) -> Dict:
+        """Fetch Single-AZ on-demand instance prices per engine and region from the AWS Price List API"""
+        clients = self._clients or get_aws_clients()
+        pricing_client = clients.get('pricing', 'us-east-1')
+        
+        # One paginated query per (engine, region) covers every instance class; they run in parallel
+        tasks = [(target_engine, region) for target_engine in RDSPriceIndex.ENGINE_MAP for region in self.regions]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            results = list(executor.map(
+                lambda task: self._fetch_engine_prices(pricing_client, *task, set(instance_classes)), tasks
+            ))
+        
+        engine_prices = {}
+        for (target_engine, region), prices in zip(tasks, results):
+            if prices:
+                engine_prices.setdefault(target_engine, {})[region] = prices
+        if not engine_prices:
+            raise RuntimeError("Price List API returned no instance prices")
+        return {'engine_instance_monthly': engine_prices}
+    
+    def _fetch_engine_prices(self, pricing_client, target_engine: str, region: str,
+                             instance_classes: Set[str]) -> Dict[str, float]:
+        """Monthly prices of one engine's Single-AZ instance SKUs in one region"""
+        engine, license_model = RDSPriceIndex.ENGINE_MAP[target_engine]
+        engine_name, _, edition = engine.partition(' (')
+        filters = [
+            {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'Database Instance'},
+            {'Type': 'TERM_MATCH', 'Field': 'regionCode', 'Value': region},
+            {'Type': 'TERM_MATCH', 'Field': 'locationType', 'Value': 'AWS Region'},
+            {'Type': 'TERM_MATCH', 'Field': 'databaseEngine', 'Value': engine_name},
+            {'Type': 'TERM_MATCH', 'Field': 'deploymentOption', 'Value': 'Single-AZ'},
+            {'Type': 'TERM_MATCH', 'Field': 'licenseModel', 'Value': license_model}
+        ]
+        if edition:
+            filters.append({'Type': 'TERM_MATCH', 'Field': 'databaseEdition', 'Value': edition.rstrip(')')})
+        
+        prices = {}
+        for page in pricing_client.get_paginator('get_products').paginate(ServiceCode='AmazonRDS', Filters=filters):
+            for price_item in page.get('PriceList', []):
+                product = json.loads(price_item)
+                attrs = product.get('product', {}).get('attributes', {})
+                instance_class = attrs.get('instanceType')
+                # Only plain instance-hour SKUs; I/O-Optimized Aurora instances are priced separately
+                if (instance_class not in instance_classes or 'InstanceUsage' not in attrs.get('usagetype', '')
+                        or RDSPriceIndex._storage_config(attrs) != 'standard'):
+                    continue
+                hourly = self._on_demand_hourly(product)
+                if hourly:
+                    prices[instance_class] = round(hourly * 730, 2)
+        return prices
+    
+    @staticmethod
+    def _on_demand_hourly(product: Dict) -> Optional[float]:
+        """Extract the USD on-demand hourly rate from a Price List product document"""
+        for term in product.get('terms', {}).get('OnDemand', {}).values():
+            for dimension in term.get('priceDimensions', {}).values():
+                usd = float(dimension.get('pricePerUnit', {}).get('USD', 0) or 0)
+                if usd > 0:
+                    return usd
+        return None
+    
+    def _load_snapshot(self) -> Dict:
+        """Load the on-disk snapshot, falling back to bundled list prices"""
         try:
-            # Try to import and initialize AWS clients
-            import boto3
-            self.pricing_client = boto3.client('pricing', region_name='us-east-1')
-            self.ce_client = boto3.client('ce')
-            self.rds_client = boto3.client('rds')
-            self.connected = True
-            logger.info("AWS Cost Calculator initialized successfully")
+            if self.snapshot_path.exists():
+                return self._merge_stored(json.loads(self.snapshot_path.read_text()))
         except Exception as e:
-            self.connected = False
-            logger.warning(f"AWS Cost Calculator using fallback pricing: {e}")
+            logger.warning(f"Ignoring unreadable pricing snapshot: {e}")
+        return self._merge_stored({})
+    
+    def _merge_stored(self, stored: Dict) -> Dict:
+        """Bundled list prices with the stored live sections deep-merged over them
+        
+        Entries missing from the stored sections (e.g. classes added to the bundled
+        prices later) keep their bundled values.
+        """
+        # Sections from older snapshot layouts (e.g. PostgreSQL prices applied to every engine) are ignored
+        live_keys = [key for key in stored.get('live_keys', ()) if key in self.LIVE_KEYS and key in stored.get('prices', {})]
+        prices = json.loads(json.dumps(DEFAULT_AWS_PRICING))
+        for key in live_keys:
+            prices[key] = self._deep_merge(prices.get(key, {}), stored['prices'][key])
+        return {
+            'source': stored.get('source', 'default') if live_keys else 'default',
+            'region': stored.get('region', self.region),
+            'fetched_at': stored.get('fetched_at') if live_keys else None,
+            'live_keys': live_keys,
+            'prices': prices
+        }
+    
+    @classmethod
+    def _deep_merge(cls, base: Any, override: Any) -> Any:
+        """Recursively overlay override on base; non-dict values replace"""
+        if not isinstance(base, dict) or not isinstance(override, dict):
+            return override
+        merged = dict(base)
+        for key, value in override.items():
+            merged[key] = cls._deep_merge(base.get(key), value)
+        return merged
+
+@st.cache_resource
+def get_pricing_store() -> PricingSnapshotStore:
+    """Process-wide pricing snapshot store"""
+    return PricingSnapshotStore(client_registry=get_aws_clients())
+
+# AWS Price List bulk offer file index
+class JSONStreamReader:
+    """Incremental reader for very large JSON documents with a bounded buffer"""
+    
+    def __init__(self, fh, chunk_size: int = 1 << 20):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.chars_read = 0
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+    
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Append the next chunk to the unread part of the buffer"""
+        if self._eof:
+            return False
+        chunk = self.fh.read(size or self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self.chars_read += len(chunk)
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+    
+    def expect(self, char: str):
+        """Consume a structural character"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}'")
+        self._pos += 1
+    
+    def value(self):
+        """Decode one complete JSON value at the current position"""
+        self.peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A value ending exactly at the buffer edge may be a truncated number
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Grow reads geometrically so large values are not re-parsed once per chunk
+            self._fill(read_size)
+            read_size *= 2
+    
+    def members(self):
+        """Iterate over object keys; the caller must consume each member's value"""
+        self.expect('{')
+        while True:
+            char = self.peek()
+            if char == '}':
+                self._pos += 1
+                return
+            if char == ',':
+                self._pos += 1
+                continue
+            key = self.value()
+            self.expect(':')
+            yield key
+
+class RDSPriceIndex:
+    """SQLite index of RDS on-demand prices loaded from the AWS Price List bulk offer file"""
+    
+    # Sidebar target engines mapped to (databaseEngine, licenseModel) in the offer file
+    ENGINE_MAP = {
+        'aurora_postgresql': ('Aurora PostgreSQL', 'No license required'),
+        'aurora_mysql': ('Aurora MySQL', 'No license required'),
+        'rds_postgresql': ('PostgreSQL', 'No license required'),
+        'rds_mysql': ('MySQL', 'No license required'),
+        'rds_oracle': ('Oracle (Enterprise)', 'Bring your own license'),
+        'rds_sqlserver': ('SQL Server (Standard)', 'License included')
+    }
+    
+    STORAGE_VOLUME_TYPES = {
+        'gp2': 'General Purpose',
+        'gp3': 'General Purpose-GP3',
+        'io1': 'Provisioned IOPS',
+        'io2': 'Provisioned IOPS-IO2'
+    }
+    
+    STORAGE_FAMILIES = ('Database Storage', 'Provisioned IOPS', 'Provisioned Throughput', 'System Operation')
+    
+    # Bumped when the price table keys change; older indexes are dropped and must be re-imported
+    SCHEMA_VERSION = 2
+    
+    def __init__(self, db_path: Path = Path("rds_price_index.db")):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_schema()
+        # Import timestamp, read once and replaced by each import; cost memo keys check it on every call
+        self._version = self.get_metadata().get('imported_at')
+    
+    def _init_schema(self):
+        """Create the indexed price tables"""
+        with self._lock:
+            version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < self.SCHEMA_VERSION:
+                if self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'instance_prices'").fetchone():
+                    logger.warning("RDS price index predates the current key layout; re-import the price list")
+                self._conn.executescript('''
+                    DROP TABLE IF EXISTS instance_prices;
+                    DROP TABLE IF EXISTS storage_prices;
+                    DROP TABLE IF EXISTS import_metadata;
+                ''')
+            
+            # storage_config separates Aurora I/O-Optimized SKUs from Standard ones
+            self._conn.executescript(f'''
+                CREATE TABLE IF NOT EXISTS instance_prices (
+                    region TEXT NOT NULL,
+                    engine TEXT NOT NULL,
+                    instance_class TEXT NOT NULL,
+                    deployment_option TEXT NOT NULL,
+                    license_model TEXT NOT NULL,
+                    storage_config TEXT NOT NULL,
+                    hourly_usd REAL NOT NULL,
+                    sku TEXT NOT NULL,
+                    PRIMARY KEY (region, engine, instance_class, deployment_option, license_model, storage_config)
+                ) WITHOUT ROWID;
+                
+                CREATE TABLE IF NOT EXISTS storage_prices (
+                    region TEXT NOT NULL,
+                    product_family TEXT NOT NULL,
+                    volume_type TEXT NOT NULL,
+                    deployment_option TEXT NOT NULL,
+                    engine TEXT NOT NULL,
+                    storage_config TEXT NOT NULL,
+                    unit TEXT NOT NULL,
+                    price_usd REAL NOT NULL,
+                    sku TEXT NOT NULL,
+                    PRIMARY KEY (region, product_family, volume_type, deployment_option, engine, storage_config)
+                ) WITHOUT ROWID;
+                
+                CREATE TABLE IF NOT EXISTS import_metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                
+                PRAGMA user_version = {self.SCHEMA_VERSION};
+            ''')
+    
+    def import_offer_file(self, offer_path: Union[str, Path], progress_callback=None,
+                          batch_size: int = 5000) -> Dict[str, int]:
+        """Stream an AmazonRDS offer file into the index, replacing previous prices"""
+        offer_path = Path(offer_path)
+        total_chars = max(offer_path.stat().st_size, 1)
+        metadata = {}
+        counts = {'products': 0, 'on_demand_terms': 0}
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('PRAGMA synchronous = OFF')
+            conn.executescript('''
+                CREATE TEMP TABLE staged_products (
+                    sku TEXT PRIMARY KEY, product_family TEXT, region TEXT, engine TEXT,
+                    instance_class TEXT, deployment_option TEXT, license_model TEXT, volume_type TEXT,
+                    storage_config TEXT
+                ) WITHOUT ROWID;
+                CREATE TEMP TABLE staged_prices (
+                    sku TEXT PRIMARY KEY, unit TEXT, price_usd REAL
+                ) WITHOUT ROWID;
+            ''')
+            
+            products, prices = [], []
+            with open(offer_path, 'r', encoding='utf-8') as fh:
+                stream = JSONStreamReader(fh)
+                for section in stream.members():
+                    if section == 'products':
+                        for sku in stream.members():
+                            row = self._product_row(sku, stream.value())
+                            if row:
+                                products.append(row)
+                                counts['products'] += 1
+                            if len(products) >= batch_size:
+                                conn.executemany('INSERT OR IGNORE INTO staged_products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', products)
+                                products.clear()
+                                if progress_callback:
+                                    progress_callback(stream.chars_read / total_chars)
+                    elif section == 'terms':
+                        for term_type in stream.members():
+                            for sku in stream.members():
+                                term = stream.value()
+                                if term_type != 'OnDemand':
+                                    continue
+                                price = self._on_demand_price(term)
+                                if price:
+                                    prices.append((sku, *price))
+                                    counts['on_demand_terms'] += 1
+                                if len(prices) >= batch_size:
+                                    conn.executemany('INSERT OR IGNORE INTO staged_prices VALUES (?, ?, ?)', prices)
+                                    prices.clear()
+                                    if progress_callback:
+                                        progress_callback(stream.chars_read / total_chars)
+                    else:
+                        value = stream.value()
+                        if not isinstance(value, (dict, list)):
+                            metadata[section] = str(value)
+            
+            conn.executemany('INSERT OR IGNORE INTO staged_products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', products)
+            conn.executemany('INSERT OR IGNORE INTO staged_prices VALUES (?, ?, ?)', prices)
+            
+            # Swap the new prices and metadata in within a single transaction
+            conn.execute('DELETE FROM instance_prices')
+            conn.execute('DELETE FROM storage_prices')
+            conn.execute('DELETE FROM import_metadata')
+            conn.execute('''
+                INSERT OR IGNORE INTO instance_prices
+                SELECT p.region, p.engine, p.instance_class, p.deployment_option, p.license_model, p.storage_config,
+                       s.price_usd, p.sku
+                FROM staged_products p JOIN staged_prices s ON s.sku = p.sku
+                WHERE p.product_family = 'Database Instance'
+            ''')
+            conn.execute('''
+                INSERT OR IGNORE INTO storage_prices
+                SELECT p.region, p.product_family, p.volume_type, p.deployment_option, p.engine, p.storage_config,
+                       s.unit, s.price_usd, p.sku
+                FROM staged_products p JOIN staged_prices s ON s.sku = p.sku
+                WHERE p.product_family != 'Database Instance'
+            ''')
+            metadata['imported_at'] = datetime.now().isoformat()
+            metadata['source_file'] = str(offer_path)
+            conn.executemany('INSERT OR REPLACE INTO import_metadata VALUES (?, ?)', metadata.items())
+            conn.commit()
+            self._version = metadata['imported_at']
+            
+            counts['instance_prices'] = conn.execute('SELECT COUNT(*) FROM instance_prices').fetchone()[0]
+            counts['storage_prices'] = conn.execute('SELECT COUNT(*) FROM storage_prices').fetchone()[0]
+            logger.info(f"Imported RDS price list: {counts}")
+            return counts
+        finally:
+            conn.close()
+    
+    def _product_row(self, sku: str, product: Dict) -> Optional[Tuple]:
+        """Staging row for instance and storage products, None for everything else"""
+        family = product.get('productFamily', '')
+        attrs = product.get('attributes', {})
+        region = attrs.get('regionCode') or attrs.get('location', '')
+        storage_config = self._storage_config(attrs)
+        
+        if family == 'Database Instance':
+            engine = attrs.get('databaseEngine', '')
+            edition = attrs.get('databaseEdition', '')
+            if edition and edition not in ('N/A', 'n/a'):
+                engine = f"{engine} ({edition})"
+            return (sku, family, region, engine, attrs.get('instanceType', ''),
+                    attrs.get('deploymentOption', ''), attrs.get('licenseModel', ''), '', storage_config)
+        
+        if family in self.STORAGE_FAMILIES:
+            volume_type = attrs.get('volumeType') or attrs.get('group') or attrs.get('usagetype', '')
+            return (sku, family, region, attrs.get('databaseEngine') or 'Any', '',
+                    attrs.get('deploymentOption', ''), '', volume_type, storage_config)
+        
+        return None
+    
+    @staticmethod
+    def _storage_config(attrs: Dict) -> str:
+        """'io_optimized' for Aurora I/O-Optimized SKUs, 'standard' otherwise"""
+        text = ' '.join(str(attrs.get(name, '')) for name in ('storage', 'usagetype', 'volumeType', 'group'))
+        return 'io_optimized' if re.search(r'io[\s-]?optimi[sz]', text, re.IGNORECASE) else 'standard'
+    
+    @staticmethod
+    def _on_demand_price(term: Dict) -> Optional[Tuple[str, float]]:
+        """First non-zero USD price dimension of an OnDemand term"""
+        for offer in term.values():
+            for dimension in offer.get('priceDimensions', {}).values():
+                usd = float(dimension.get('pricePerUnit', {}).get('USD', 0) or 0)
+                if usd > 0:
+                    return dimension.get('unit', ''), usd
+        return None
+    
+    def lookup_instance_hourly(self, region: str, engine: str, instance_class: str,
+                               deployment_option: str, license_model: str,
+                               storage_config: str = 'standard') -> Optional[float]:
+        """Hourly on-demand price by primary key, or None if not indexed"""
+        with self._lock:
+            row = self._conn.execute('''
+                SELECT hourly_usd FROM instance_prices
+                WHERE region = ? AND engine = ? AND instance_class = ? AND deployment_option = ? AND license_model = ?
+                  AND storage_config = ?
+            ''', (region, engine, instance_class, deployment_option, license_model, storage_config)).fetchone()
+        return row[0] if row else None
+    
+    def lookup_storage_price(self, region: str, volume_type: str, deployment_option: str,
+                             product_family: str = 'Database Storage', engine: str = 'Any',
+                             storage_config: str = 'standard') -> Optional[float]:
+        """Per-unit storage price by primary key, preferring an engine-specific SKU over 'Any'"""
+        with self._lock:
+            row = self._conn.execute('''
+                SELECT price_usd FROM storage_prices
+                WHERE region = ? AND product_family = ? AND volume_type = ? AND deployment_option = ?
+                  AND engine IN (?, 'Any') AND storage_config = ?
+                ORDER BY engine = ? DESC
+                LIMIT 1
+            ''', (region, product_family, volume_type, deployment_option, engine, storage_config, engine)).fetchone()
+        return row[0] if row else None
+    
+    def lookup_instance_hourly_by_region(self, regions: List[str], engine: str, instance_class: str,
+                                         deployment_option: str, license_model: str,
+                                         storage_config: str = 'standard') -> Dict[str, float]:
+        """Hourly on-demand prices of one SKU across several regions in a single query, keyed by region"""
+        with self._lock:
+            rows = self._conn.execute(f'''
+                SELECT region, hourly_usd FROM instance_prices
+                WHERE region IN ({', '.join('?' * len(regions))}) AND engine = ? AND instance_class = ?
+                  AND deployment_option = ? AND license_model = ? AND storage_config = ?
+            ''', (*regions, engine, instance_class, deployment_option, license_model, storage_config)).fetchall()
+        return dict(rows)
+    
+    def lookup_storage_price_by_region(self, regions: List[str], volume_type: str, deployment_option: str,
+                                       product_family: str = 'Database Storage', engine: str = 'Any',
+                                       storage_config: str = 'standard') -> Dict[str, float]:
+        """Per-unit storage prices across several regions in a single query, keyed by region"""
+        with self._lock:
+            # 'Any' rows come first so an engine-specific SKU overwrites them
+            rows = self._conn.execute(f'''
+                SELECT region, price_usd FROM storage_prices
+                WHERE region IN ({', '.join('?' * len(regions))}) AND product_family = ? AND volume_type = ?
+                  AND deployment_option = ? AND engine IN (?, 'Any') AND storage_config = ?
+                ORDER BY engine = ?
+            ''', (*regions, product_family, volume_type, deployment_option, engine, storage_config, engine)).fetchall()
+        return dict(rows)
+    
+    @property
+    def version(self) -> Optional[str]:
+        """Timestamp of the last import, without a database read"""
+        return self._version
+    
+    def get_metadata(self) -> Dict[str, str]:
+        """Details of the last import"""
+        with self._lock:
+            return dict(self._conn.execute('SELECT key, value FROM import_metadata').fetchall())
+
+@st.cache_resource
+def get_price_index() -> Optional[RDSPriceIndex]:
+    """Process-wide price index, None if the index database cannot be opened"""
+    try:
+        return RDSPriceIndex()
+    except Exception as e:
+        logger.warning(f"RDS price index unavailable: {e}")
+        return None
+
+# Enhanced AWS Cost Calculator
+class EnhancedAWSCostCalculator:
+    """Enhanced AWS cost calculation with real-time pricing"""
+    
+    # Monte Carlo defaults, overridable per config as 'sizing_probabilities' and 'growth_sigma'.
+    # Odds are (one size down, chosen class, one size up): the chosen class holds nine times in ten,
+    # with no evidence favouring either neighbour, so resizing shows up in P99 rather than moving P90.
+    # A lognormal sigma of 0.2 puts P90 data growth at about 1.29x the median (e^(1.28 * 0.2)).
+    SIZING_PROBABILITIES = (0.05, 0.9, 0.05)
+    GROWTH_SIGMA = 0.2
+    
+    def __init__(self, pricing_store: Optional[PricingSnapshotStore] = None,
+                 price_index: Optional[RDSPriceIndex] = None):
+        # Pricing comes from the local snapshot; AWS is only contacted by the background refresh
+        self.pricing_store = pricing_store or get_pricing_store()
+        self.price_index = price_index or get_price_index()
+        self._snapshot = None
+        self.sync_pricing()
+        
+        # Config fields the cost model reads; anything else (security, AI settings) never invalidates a result
+        self.cost_config_keys = (
+            'target_engine', 'instance_class', 'multi_az', 'storage_gb', 'storage_type', 'backup_retention_days',
+            'primary_region', 'dms_instance', 'migration_duration_hours', 'data_size_gb',
+            'required_iops', 'required_throughput_mibps', 'aurora_storage_config',
+            'monthly_io_requests', 'observed_iops', 'queries_per_second', 'ios_per_query'
+        )
+        self.estimate_cache = MemoCache(maxsize=256)
+    
+    def sync_pricing(self):
+        """Pick up a newer pricing snapshot if the background refresh replaced it"""
+        snapshot = self.pricing_store.get()
+        if snapshot is self._snapshot:
+            return
+        self._snapshot = snapshot
+        self.prices = snapshot['prices']
+        self.pricing_source = snapshot['source']
+        self.pricing_fetched_at = snapshot.get('fetched_at')
+        self.connected = self.pricing_source == 'aws'
+    
+    def pricing_version(self) -> Tuple:
+        """Identifies the prices in effect, so cached results expire when they change"""
+        index_version = self.price_index.version if self.price_index else None
+        return (self.pricing_source, self.pricing_fetched_at, index_version)
+    
+    def _config_slice(self, config: Dict) -> Tuple:
+        """Normalized, hashable view of the cost-relevant config fields"""
+        values = []
+        for key in self.cost_config_keys:
+            value = config.get(key)
+            if isinstance(value, (float, np.floating)):
+                value = int(value) if float(value).is_integer() else round(float(value), 6)
+            elif isinstance(value, np.integer):
+                value = int(value)
+            values.append((key, value))
+        return tuple(values)
+    
+    def cache_key(self, method: str, config: Dict, *args) -> str:
+        """Stable key for a result of method on this config, arguments and prices"""
+        return stable_hash(method, self._config_slice(config), args, self.pricing_version())
+    
+    def _memoized(self, method: str, config: Dict, compute, *args):
+        """Cache a result by method, config slice, extra arguments and pricing version"""
+        key = (method, self._config_slice(config), args, self.pricing_version())
+        return self.estimate_cache.get_or_compute(key, compute)
     
     def estimate_total_migration_cost(self, config: Dict) -> CostEstimate:
+        """Estimate total migration cost including all components, memoized by config slice"""
+        return self._memoized('estimate', config, lambda: self._estimate_total_migration_cost(config))
+    
+    def _estimate_total_migration_cost(self, config: Dict) -> CostEstimate:
         """Estimate total migration cost including all components"""
         try:
             # Calculate individual components
@@ -961,73 +2781,290 @@ class EnhancedAWSCostCalculator:
             backup_cost = self._calculate_backup_cost(config)
             dms_cost = self._calculate_dms_cost(config)
             data_transfer_cost = self._calculate_data_transfer_cost(config)
+            io_cost = self._calculate_io_cost(config)
             
-            total_monthly = rds_cost + storage_cost + backup_cost
+            total_monthly = rds_cost + storage_cost + backup_cost + io_cost
             total_annual = total_monthly * 12
             migration_cost = dms_cost + data_transfer_cost
             
             # Generate optimizations
             optimizations = self._generate_cost_optimizations(config, total_monthly)
             
+            cost_factors = {
+                'rds_instance': rds_cost,
+                'storage': storage_cost,
+                'backup': backup_cost,
+                'migration': migration_cost,
+                'data_transfer': data_transfer_cost
+            }
+            if self._is_aurora(config):
+                cost_factors['aurora_io'] = io_cost
+            
             return CostEstimate(
                 service="Complete Migration",
                 monthly_cost=total_monthly,
                 annual_cost=total_annual,
-                cost_factors={
-                    'rds_instance': rds_cost,
-                    'storage': storage_cost,
-                    'backup': backup_cost,
-                    'migration': migration_cost,
-                    'data_transfer': data_transfer_cost
-                },
+                cost_factors=cost_factors,
                 optimizations=optimizations,
                 confidence_score=0.85 if self.connected else 0.65
             )
-            
+        
         except Exception as e:
             logger.error(f"Cost estimation failed: {e}")
             return self._get_fallback_estimate()
     
+    def _pricing_region(self, config: Dict) -> str:
+        """Region used for price lookups"""
+        return config.get('primary_region', self.pricing_store.region)
+    
+    def _region_multiplier(self, config: Dict, component: str = 'instance') -> float:
+        """Regional premium applied to the bundled us-east-1 prices of one cost component"""
+        region_pricing = self.prices.get('region_pricing', DEFAULT_AWS_PRICING['region_pricing'])
+        return region_pricing.get(self._pricing_region(config), {}).get(component, 1.0)
+    
     def _calculate_rds_cost(self, config: Dict) -> float:
         """Calculate RDS instance cost"""
-        # Simplified calculation - in production use actual API
-        instance_costs = {
-            'db.t3.micro': 16.79,
-            'db.t3.small': 33.58,
-            'db.t3.medium': 67.15,
-            'db.t3.large': 134.30,
-            'db.m5.large': 175.20,
-            'db.m5.xlarge': 350.40,
-            'db.r5.large': 217.44,
-            'db.r5.xlarge': 434.88
-        }
+        # Prefer exact prices from the imported Price List index
+        if self.price_index and config.get('target_engine') in RDSPriceIndex.ENGINE_MAP:
+            engine, license_model = RDSPriceIndex.ENGINE_MAP[config['target_engine']]
+            deployment_option, instances = self._index_deployment(config)
+            for storage_config in self._instance_storage_configs(config):
+                hourly = self.price_index.lookup_instance_hourly(
+                    self._pricing_region(config), engine, config.get('instance_class', 'db.t3.medium'),
+                    deployment_option, license_model, storage_config
+                )
+                if hourly is not None:
+                    multiplier = self._aurora_instance_multiplier(config) if storage_config == 'standard' else 1.0
+                    return hourly * 730 * multiplier * instances
+            logger.info(f"No indexed price for {engine} {config.get('instance_class', 'db.t3.medium')} "
+                        f"{deployment_option} in {self._pricing_region(config)}; using snapshot or bundled prices")
         
         instance_class = config.get('instance_class', 'db.t3.medium')
-        base_cost = instance_costs.get(instance_class, 67.15)
-        
-        # Apply multi-AZ multiplier
-        if config.get('multi_az', False):
-            base_cost *= 2
         
-        # Apply Aurora premium
-        if 'aurora' in config.get('target_engine', ''):
-            base_cost *= 1.2
+        # Live snapshot prices are the engine's own Single-AZ price in the region
+        live_costs = self._live_instance_prices(config).get(self._pricing_region(config), {})
+        if instance_class in live_costs:
+            return live_costs[instance_class] * self._deployment_factor(config)
         
-        return base_cost
+        instance_costs = self.prices['instance_monthly']
+        base_cost = instance_costs.get(instance_class, instance_costs['db.t3.medium'])
+        return base_cost * self._instance_cost_factor(config) * self._region_multiplier(config, 'instance')
+    
+    def _index_deployment(self, config: Dict) -> Tuple[str, int]:
+        """Price index deployment option and number of instances billed at its price"""
+        # Aurora instance SKUs are all Single-AZ; a Multi-AZ cluster adds a replica billed the same
+        if self._is_aurora(config):
+            return 'Single-AZ', 2 if config.get('multi_az', False) else 1
+        return ('Multi-AZ' if config.get('multi_az', False) else 'Single-AZ'), 1
+    
+    def _live_instance_prices(self, config: Dict) -> Dict[str, Dict[str, float]]:
+        """Live snapshot monthly prices of the target engine, keyed by region and instance class"""
+        return self.prices.get('engine_instance_monthly', {}).get(config.get('target_engine'), {})
+    
+    def _deployment_factor(self, config: Dict) -> float:
+        """Multi-AZ and I/O-Optimized adjustments to a Single-AZ instance price"""
+        return (2.0 if config.get('multi_az', False) else 1.0) * self._aurora_instance_multiplier(config)
+    
+    def _instance_cost_factor(self, config: Dict) -> float:
+        """Deployment adjustments plus the Aurora premium applied to a bundled list price"""
+        factor = self._deployment_factor(config)
+        if self._is_aurora(config):
+            factor *= self._aurora_prices()['instance_premium']
+        return factor
+    
+    def _instance_storage_configs(self, config: Dict) -> List[str]:
+        """Price index storage configurations to try, most preferred first"""
+        # An I/O-Optimized SKU is priced as-is; otherwise the Standard price takes the I/O-Optimized premium
+        return ['io_optimized', 'standard'] if self._is_io_optimized(config) else ['standard']
+    
+    def _is_aurora(self, config: Dict) -> bool:
+        return 'aurora' in config.get('target_engine', '')
+    
+    def _is_io_optimized(self, config: Dict) -> bool:
+        return self._is_aurora(config) and config.get('aurora_storage_config') == 'io_optimized'
+    
+    def _aurora_prices(self) -> Dict:
+        return self.prices.get('aurora', DEFAULT_AWS_PRICING['aurora'])
+    
+    def _aurora_instance_multiplier(self, config: Dict) -> float:
+        """I/O-Optimized clusters carry a higher instance price"""
+        return self._aurora_prices()['io_optimized_instance_multiplier'] if self._is_io_optimized(config) else 1.0
     
     def _calculate_storage_cost(self, config: Dict) -> float:
         """Calculate storage cost"""
-        storage_gb = config.get('storage_gb', 100)
-        storage_type = config.get('storage_type', 'gp2')
+        # Aurora cluster volumes have no volume type or provisioned performance
+        if self._is_aurora(config):
+            aurora = self._aurora_prices()
+            rate = aurora['io_optimized_storage_gb_month'] if self._is_io_optimized(config) else aurora['storage_gb_month']
+            return config.get('storage_gb', 100) * rate * self._region_multiplier(config, 'storage')
+        
+        return self._storage_option(config, config.get('storage_type', 'gp2'))['monthly_cost']
+    
+    def _calculate_io_cost(self, config: Dict) -> float:
+        """Calculate Aurora Standard per-request I/O cost"""
+        if not self._is_aurora(config) or self._is_io_optimized(config):
+            return 0.0
+        return (self.estimate_monthly_io_requests(config) / 1e6 * self._aurora_prices()['io_per_million']
+                * self._region_multiplier(config, 'storage'))
+    
+    def estimate_monthly_io_requests(self, config: Dict) -> float:
+        """Monthly I/O requests from an explicit figure, observed IOPS or query volume"""
+        seconds_per_month = 730 * 3600
+        if config.get('monthly_io_requests') is not None:
+            return float(config['monthly_io_requests'])
+        if config.get('observed_iops') is not None:
+            return config['observed_iops'] * seconds_per_month
+        return config.get('queries_per_second', 0) * config.get('ios_per_query', 2.0) * seconds_per_month
+    
+    def compare_aurora_storage(self, config: Dict) -> AuroraStorageComparison:
+        """Price both Aurora cluster storage configurations and find the I/O volume where they cross"""
+        return self._memoized('compare_aurora_storage', config, lambda: self._compare_aurora_storage(config))
+    
+    def _compare_aurora_storage(self, config: Dict) -> AuroraStorageComparison:
+        config = {**config, 'target_engine': config.get('target_engine') if self._is_aurora(config) else 'aurora_postgresql'}
+        standard = {**config, 'aurora_storage_config': 'standard'}
+        io_optimized = {**config, 'aurora_storage_config': 'io_optimized'}
+        
+        io_cost = self._calculate_io_cost(standard)
+        standard_fixed = self._calculate_rds_cost(standard) + self._calculate_storage_cost(standard)
+        io_optimized_monthly = self._calculate_rds_cost(io_optimized) + self._calculate_storage_cost(io_optimized)
+        standard_monthly = standard_fixed + io_cost
+        
+        # Standard cost is linear in I/O volume, so the crossover has a closed form
+        cost_per_request = self._aurora_prices()['io_per_million'] / 1e6 * self._region_multiplier(config, 'storage')
+        crossover = max(io_optimized_monthly - standard_fixed, 0) / cost_per_request
+        monthly_io = self.estimate_monthly_io_requests(config)
+        
+        io_requests = np.linspace(0, max(crossover, monthly_io) * 2 or 1e9, 100)
+        curve = pd.DataFrame({
+            'monthly_io_requests': io_requests,
+            'Aurora Standard': standard_fixed + io_requests * cost_per_request,
+            'Aurora I/O-Optimized': np.full_like(io_requests, io_optimized_monthly)
+        })
+        
+        return AuroraStorageComparison(
+            monthly_io_requests=monthly_io,
+            standard_monthly=standard_monthly,
+            io_optimized_monthly=io_optimized_monthly,
+            recommended='io_optimized' if io_optimized_monthly < standard_monthly else 'standard',
+            crossover_io_requests=crossover,
+            io_share=io_cost / standard_monthly if standard_monthly else 0.0,
+            curve=curve
+        )
+    
+    def plan_storage(self, config: Dict) -> StoragePlan:
+        """Compare every volume type against the required IOPS and throughput and pick the cheapest that meets them"""
+        return self._memoized('plan_storage', config, lambda: self._plan_storage(config))
+    
+    def _plan_storage(self, config: Dict) -> StoragePlan:
+        options = pd.DataFrame([self._storage_option(config, storage_type) for storage_type in STORAGE_PERFORMANCE_LIMITS])
+        feasible = options[options['meets_requirement']]
+        best = (feasible if len(feasible) else options).sort_values('monthly_cost').iloc[0]
+        
+        return StoragePlan(
+            storage_type=best['storage_type'],
+            allocated_gb=int(best['allocated_gb']),
+            provisioned_iops=int(best['provisioned_iops']),
+            provisioned_mibps=int(best['provisioned_mibps']),
+            cost_split={'capacity': float(best['capacity_cost']), 'iops': float(best['iops_cost']),
+                        'throughput': float(best['throughput_cost'])},
+            options=options
+        )
+    
+    def _storage_option(self, config: Dict, storage_type: str) -> Dict:
+        """Smallest configuration of one volume type that delivers the required performance, with its cost"""
+        required_iops = config.get('required_iops', 0)
+        required_mibps = config.get('required_throughput_mibps', 0)
+        quantities = self._storage_quantities(config, storage_type)
+        rates = self._storage_rates(config, storage_type)
         
-        storage_rates = {
-            'gp2': 0.115,
-            'gp3': 0.08,
-            'io1': 0.125,
-            'io2': 0.125
+        capacity_cost = quantities['allocated_gb'] * rates['gb']
+        iops_cost = quantities['billed_iops'] * rates['iops']
+        throughput_cost = quantities['billed_mibps'] * rates['mibps']
+        return {
+            'storage_type': storage_type,
+            'allocated_gb': quantities['allocated_gb'],
+            'provisioned_iops': int(quantities['iops']),
+            'provisioned_mibps': int(quantities['mibps']),
+            'capacity_cost': capacity_cost,
+            'iops_cost': iops_cost,
+            'throughput_cost': throughput_cost,
+            'monthly_cost': capacity_cost + iops_cost + throughput_cost,
+            'meets_requirement': quantities['iops'] >= required_iops and quantities['mibps'] >= required_mibps
         }
+    
+    def _storage_quantities(self, config: Dict, storage_type: str) -> Dict[str, float]:
+        """Allocated GB, delivered and billed IOPS and MiB/s of the smallest volume that meets the requirement"""
+        storage_gb = config.get('storage_gb', 100)
+        required_iops = config.get('required_iops', 0)
+        required_mibps = config.get('required_throughput_mibps', 0)
+        limits = STORAGE_PERFORMANCE_LIMITS.get(storage_type, STORAGE_PERFORMANCE_LIMITS['gp2'])
+        billed_iops = billed_mibps = 0
         
-        return storage_gb * storage_rates.get(storage_type, 0.115)
+        if storage_type == 'gp3':
+            # Performance above the small-volume baseline can only be provisioned from 400 GB
+            needs_large = required_iops > limits['baseline_iops'] or required_mibps > limits['baseline_mibps']
+            allocated_gb = max(storage_gb, limits['large_volume_gb']) if needs_large else storage_gb
+            large = allocated_gb >= limits['large_volume_gb']
+            baseline_iops = limits['large_baseline_iops'] if large else limits['baseline_iops']
+            baseline_mibps = limits['large_baseline_mibps'] if large else limits['baseline_mibps']
+            mibps = min(max(required_mibps, baseline_mibps), limits['max_mibps'])
+            iops = min(max(required_iops, baseline_iops, mibps / limits['mibps_per_iops']), limits['max_iops'])
+            billed_iops, billed_mibps = iops - baseline_iops, mibps - baseline_mibps
+        elif storage_type == 'gp2':
+            # gp2 performance only grows with allocated size
+            allocated_gb = max(storage_gb, int(np.ceil(min(required_iops, limits['max_iops']) / limits['iops_per_gb'])))
+            if required_mibps > limits['small_mibps']:
+                allocated_gb = max(allocated_gb, limits['large_volume_gb'])
+            iops = min(max(allocated_gb * limits['iops_per_gb'], limits['min_iops']), limits['max_iops'])
+            mibps = limits['max_mibps'] if allocated_gb >= limits['large_volume_gb'] else limits['small_mibps']
+        else:
+            iops = min(max(required_iops, limits['min_iops'], required_mibps / limits['mibps_per_iops']), limits['max_iops'])
+            allocated_gb = max(storage_gb, int(np.ceil(iops / limits['max_iops_per_gb'])))
+            mibps = min(iops * limits['mibps_per_iops'], limits['max_mibps'])
+            billed_iops = iops
+        
+        return {'allocated_gb': allocated_gb, 'iops': iops, 'mibps': mibps,
+                'billed_iops': billed_iops, 'billed_mibps': billed_mibps}
+    
+    def _storage_rates(self, config: Dict, storage_type: str) -> Dict[str, float]:
+        """Monthly rates per GB, per provisioned IOPS and per provisioned MiB/s"""
+        multiplier = self._region_multiplier(config, 'storage')
+        rates = {key: rate * multiplier for key, rate in self._bundled_storage_rates(storage_type).items()}
+        
+        # Prefer exact prices from the imported Price List index
+        if self.price_index and storage_type in RDSPriceIndex.STORAGE_VOLUME_TYPES:
+            for key, family in self._indexed_storage_families(rates):
+                price = self.price_index.lookup_storage_price(
+                    self._pricing_region(config), RDSPriceIndex.STORAGE_VOLUME_TYPES[storage_type],
+                    'Multi-AZ' if config.get('multi_az', False) else 'Single-AZ', product_family=family,
+                    engine=self._storage_engine(config)
+                )
+                if price is not None:
+                    rates[key] = price
+        return rates
+    
+    def _bundled_storage_rates(self, storage_type: str) -> Dict[str, float]:
+        """Bundled us-east-1 rates per GB, per provisioned IOPS and per provisioned MiB/s"""
+        storage_rates = self.prices['storage_gb_month']
+        performance = self.prices.get('storage_performance', DEFAULT_AWS_PRICING['storage_performance']).get(storage_type, {})
+        return {
+            'gb': storage_rates.get(storage_type, storage_rates['gp2']),
+            'iops': performance.get('iops_month', 0.0),
+            'mibps': performance.get('mibps_month', 0.0)
+        }
+    
+    @staticmethod
+    def _indexed_storage_families(rates: Dict[str, float]) -> List[Tuple[str, str]]:
+        """Rate keys to look up in the price index with their product family; unbilled dimensions are skipped"""
+        families = (('gb', 'Database Storage'), ('iops', 'Provisioned IOPS'), ('mibps', 'Provisioned Throughput'))
+        return [(key, family) for key, family in families if key == 'gb' or rates[key]]
+    
+    @staticmethod
+    def _storage_engine(config: Dict) -> str:
+        """Engine as named by storage SKUs"""
+        # Storage SKUs name the engine without its edition, e.g. 'Oracle' rather than 'Oracle (Enterprise)'
+        return RDSPriceIndex.ENGINE_MAP.get(config.get('target_engine'), ('Any',))[0].split(' (')[0]
     
     def _calculate_backup_cost(self, config: Dict) -> float:
         """Calculate backup storage cost"""
@@ -1036,41 +3073,324 @@ class EnhancedAWSCostCalculator:
         
         # Backup storage is typically 20-50% of primary storage
         backup_multiplier = min(backup_retention / 7 * 0.3, 1.0)
-        return storage_gb * backup_multiplier * 0.095  # Backup storage rate
+        return storage_gb * backup_multiplier * self.prices['backup_gb_month'] * self._region_multiplier(config, 'backup')
     
     def _calculate_dms_cost(self, config: Dict) -> float:
         """Calculate DMS migration cost"""
-        dms_instance_costs = {
-            'dms.t3.micro': 18.0,
-            'dms.t3.small': 36.0,
-            'dms.t3.medium': 72.0,
-            'dms.t3.large': 144.0
-        }
+        dms_instance_costs = self.prices['dms_instance_monthly']
         
         dms_instance = config.get('dms_instance', 'dms.t3.medium')
         migration_hours = config.get('migration_duration_hours', 24)
         
-        hourly_cost = dms_instance_costs.get(dms_instance, 72.0) / (24 * 30)  # Convert monthly to hourly
-        return hourly_cost * migration_hours
+        hourly_cost = dms_instance_costs.get(dms_instance, dms_instance_costs['dms.t3.medium']) / (24 * 30)  # Convert monthly to hourly
+        return hourly_cost * migration_hours * self._region_multiplier(config, 'dms')
     
     def _calculate_data_transfer_cost(self, config: Dict) -> float:
         """Calculate data transfer cost"""
         data_size_gb = config.get('data_size_gb', 100)
         
-        if data_size_gb <= 1:
-            return 0
-        elif data_size_gb <= 10240:  # Up to 10TB
-            return (data_size_gb - 1) * 0.09
-        else:
-            return (10239 * 0.09) + ((data_size_gb - 10240) * 0.085)
+        return float(self._tiered_transfer_cost(np.array([data_size_gb], dtype=float), config)[0])
+    
+    def sweep_scenarios(self, config: Dict, instance_classes: List[str], storage_types: List[str],
+                        multi_az_options: List[bool], backup_retentions: List[int], regions: List[str],
+                        capacity_metric: str = 'vcpu') -> pd.DataFrame:
+        """Evaluate the monthly cost of every configuration in the grid and flag the Pareto frontier"""
+        # Each component depends on only a few dimensions, so price those small tables with the
+        # scalar formulas and let NumPy broadcast them over the full grid
+        instance_table = np.array([[[self._calculate_rds_cost({**config, 'instance_class': c, 'multi_az': az, 'primary_region': r})
+                                     for r in regions] for az in multi_az_options] for c in instance_classes])
+        storage_table = np.array([[[self._calculate_storage_cost({**config, 'storage_type': t, 'multi_az': az, 'primary_region': r})
+                                    for r in regions] for az in multi_az_options] for t in storage_types])
+        backup_table = np.array([[self._calculate_backup_cost({**config, 'backup_retention_days': b, 'primary_region': r})
+                                  for r in regions] for b in backup_retentions])
+        
+        # Grid axes: (instance, storage, multi_az, backup, region)
+        instance_cost = instance_table[:, None, :, None, :]
+        storage_cost = storage_table[None, :, :, None, :]
+        backup_cost = backup_table[None, None, None, :, :]
+        monthly_cost = instance_cost + storage_cost + backup_cost
+        shape = monthly_cost.shape
+        
+        capacity = np.array([RDS_INSTANCE_SPECS.get(c, {}).get(capacity_metric, 0) for c in instance_classes], dtype=float)
+        index = np.indices(shape).reshape(len(shape), -1)
+        
+        scenarios = pd.DataFrame({
+            'instance_class': np.asarray(instance_classes, dtype=object)[index[0]],
+            'storage_type': np.asarray(storage_types, dtype=object)[index[1]],
+            'multi_az': np.asarray(multi_az_options, dtype=bool)[index[2]],
+            'backup_retention_days': np.asarray(backup_retentions)[index[3]],
+            'region': np.asarray(regions, dtype=object)[index[4]],
+            'instance_cost': np.broadcast_to(instance_cost, shape).ravel(),
+            'storage_cost': np.broadcast_to(storage_cost, shape).ravel(),
+            'backup_cost': np.broadcast_to(backup_cost, shape).ravel(),
+            'monthly_cost': monthly_cost.ravel(),
+            'capacity': capacity[index[0]]
+        })
+        
+        # Multi-AZ buys availability rather than capacity, so each deployment option gets its own frontier
+        pareto = np.zeros(len(scenarios), dtype=bool)
+        for az in multi_az_options:
+            group = np.flatnonzero(scenarios['multi_az'].to_numpy() == az)
+            pareto[group] = self._pareto_mask(scenarios['monthly_cost'].to_numpy()[group],
+                                              scenarios['capacity'].to_numpy()[group])
+        scenarios['pareto_optimal'] = pareto
+        return scenarios
+    
+    @staticmethod
+    def _pareto_mask(cost: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+        """Mask of points not dominated by any cheaper-or-equal point with more capacity"""
+        # Sort by cost, highest capacity first on ties; a point is on the frontier when it
+        # beats the best capacity of everything cheaper
+        order = np.lexsort((-capacity, cost))
+        sorted_capacity = capacity[order]
+        best_before = np.concatenate(([-np.inf], np.maximum.accumulate(sorted_capacity)[:-1]))
+        mask = np.zeros(len(cost), dtype=bool)
+        mask[order] = sorted_capacity > best_before
+        return mask
+    
+    def compare_regions(self, config: Dict, regions: Optional[List[str]] = None) -> pd.DataFrame:
+        """Monthly and one-time cost of the same configuration in each region"""
+        regions = tuple(regions or AWS_PRICING_REGIONS)
+        return self._memoized('compare_regions', config, lambda: self._compare_regions(config, list(regions)), regions)
+
+    def _compare_regions(self, config: Dict, regions: List[str]) -> pd.DataFrame:
+        # Component -> regional pricing dimension it scales with
+        components = {
+            'rds_instance': ('instance', self._calculate_rds_cost),
+            'storage': ('storage', self._calculate_storage_cost),
+            'backup': ('backup', self._calculate_backup_cost),
+            'aurora_io': ('storage', self._calculate_io_cost),
+            'dms': ('dms', self._calculate_dms_cost),
+            'data_transfer': ('data_transfer', self._calculate_data_transfer_cost)
+        }
+        reference = {**config, 'primary_region': self.pricing_store.region}
+        reference_costs = np.array([calculate(reference) for _, calculate in components.values()])
+        reference_multipliers = np.array([self._region_multiplier(reference, dimension) for dimension, _ in components.values()])
+
+        # One (region x component) pass: reference-region cost scaled by each region's premium
+        region_pricing = self.prices.get('region_pricing', DEFAULT_AWS_PRICING['region_pricing'])
+        multipliers = np.array([[region_pricing.get(region, {}).get(dimension, 1.0) for dimension, _ in components.values()]
+                                for region in regions])
+        costs = reference_costs / reference_multipliers * multipliers
+
+        # Exact regional prices (live snapshot or imported Price List) replace the approximation
+        costs[:, 0] = self._regional_rds_costs(config, regions)
+        exact_storage = self._regional_storage_costs(config, regions)
+        if exact_storage is not None:
+            costs[:, 1] = exact_storage
+
+        comparison = pd.DataFrame(costs, columns=list(components), index=pd.Index(regions, name='region'))
+        comparison['monthly_cost'] = comparison[['rds_instance', 'storage', 'backup', 'aurora_io']].sum(axis=1)
+        comparison['one_time_cost'] = comparison[['dms', 'data_transfer']].sum(axis=1)
+        primary_monthly = comparison['monthly_cost'].get(config.get('primary_region', self.pricing_store.region))
+        if primary_monthly:
+            comparison['vs_primary_pct'] = (comparison['monthly_cost'] / primary_monthly - 1) * 100
+        return comparison.reset_index()
+
+    def _regional_rds_costs(self, config: Dict, regions: List[str]) -> np.ndarray:
+        """Monthly instance cost per region, with the same price precedence as _calculate_rds_cost"""
+        instance_class = config.get('instance_class', 'db.t3.medium')
+        instance_costs = self.prices['instance_monthly']
+        region_pricing = self.prices.get('region_pricing', DEFAULT_AWS_PRICING['region_pricing'])
+        bundled = instance_costs.get(instance_class, instance_costs['db.t3.medium'])
+        multipliers = np.array([region_pricing.get(region, {}).get('instance', 1.0) for region in regions])
+        
+        # Live snapshot prices are the engine's own regional price
+        live = self._live_instance_prices(config)
+        live_costs = np.array([live.get(region, {}).get(instance_class, np.nan) for region in regions], dtype=float)
+        costs = np.where(np.isnan(live_costs), bundled * multipliers * self._instance_cost_factor(config),
+                         live_costs * self._deployment_factor(config))
+        
+        if self.price_index and config.get('target_engine') in RDSPriceIndex.ENGINE_MAP:
+            engine, license_model = RDSPriceIndex.ENGINE_MAP[config['target_engine']]
+            deployment_option, instances = self._index_deployment(config)
+            found = np.zeros(len(regions), dtype=bool)
+            # Overlay from the least preferred source up, one query per storage configuration
+            for storage_config in reversed(self._instance_storage_configs(config)):
+                hourly = self.price_index.lookup_instance_hourly_by_region(
+                    regions, engine, instance_class, deployment_option, license_model, storage_config
+                )
+                multiplier = self._aurora_instance_multiplier(config) if storage_config == 'standard' else 1.0
+                indexed = np.array([hourly.get(region, np.nan) for region in regions], dtype=float) * 730 * multiplier * instances
+                costs = np.where(np.isnan(indexed), costs, indexed)
+                found |= ~np.isnan(indexed)
+            if not found.all():
+                missing = ", ".join(region for region, hit in zip(regions, found) if not hit)
+                logger.info(f"No indexed price for {engine} {instance_class} {deployment_option} in {missing}; "
+                            "using snapshot or bundled prices")
+        return costs
+    
+    def _regional_storage_costs(self, config: Dict, regions: List[str]) -> Optional[np.ndarray]:
+        """Monthly storage cost per region with price index rates, None when the index does not price this storage"""
+        storage_type = config.get('storage_type', 'gp2')
+        if not self.price_index or self._is_aurora(config) or storage_type not in RDSPriceIndex.STORAGE_VOLUME_TYPES:
+            return None
+        
+        # Bundled rates take each region's premium, then indexed prices replace them per dimension
+        region_pricing = self.prices.get('region_pricing', DEFAULT_AWS_PRICING['region_pricing'])
+        multipliers = np.array([region_pricing.get(region, {}).get('storage', 1.0) for region in regions])
+        bundled = self._bundled_storage_rates(storage_type)
+        rates = {key: rate * multipliers for key, rate in bundled.items()}
+        for key, family in self._indexed_storage_families(bundled):
+            prices = self.price_index.lookup_storage_price_by_region(
+                regions, RDSPriceIndex.STORAGE_VOLUME_TYPES[storage_type],
+                'Multi-AZ' if config.get('multi_az', False) else 'Single-AZ', product_family=family,
+                engine=self._storage_engine(config)
+            )
+            indexed = np.array([prices.get(region, np.nan) for region in regions], dtype=float)
+            rates[key] = np.where(np.isnan(indexed), rates[key], indexed)
+        
+        quantities = self._storage_quantities(config, storage_type)
+        return (quantities['allocated_gb'] * rates['gb'] + quantities['billed_iops'] * rates['iops']
+                + quantities['billed_mibps'] * rates['mibps'])
+    
+    def simulate_migration_cost(self, config: Dict, trials: int = 100_000,
+                                seed: Optional[int] = None) -> CostSimulation:
+        """Monte Carlo estimate of monthly, annual and one-time cost percentiles"""
+        start_time = time.perf_counter()
+        rng = np.random.default_rng(seed)
+        
+        # Right-sizing outcome: stay on the chosen class, or end up one size down/up within its family
+        instance_class = config.get('instance_class', 'db.t3.medium')
+        neighbours = self._sizing_neighbours(instance_class)
+        available = np.array([c is not None for c in neighbours])
+        candidates = [c for c in neighbours if c is not None]
+        instance_costs = np.array([self._calculate_rds_cost({**config, 'instance_class': c}) for c in candidates])
+        sizing_probabilities = np.array(config.get('sizing_probabilities', self.SIZING_PROBABILITIES), dtype=float)
+        if sizing_probabilities.shape != (3,) or (sizing_probabilities < 0).any():
+            raise ValueError("sizing_probabilities must be three non-negative odds (down, chosen, up)")
+        sizing_probabilities = sizing_probabilities[available]
+        if not sizing_probabilities.sum():
+            # Only missing neighbours had any odds; the chosen class is the one outcome left
+            sizing_probabilities = (np.array(candidates) == instance_class).astype(float)
+        sizing_outcome = rng.choice(len(candidates), size=trials, p=sizing_probabilities / sizing_probabilities.sum())
+        
+        # Data growth scales storage and backups; right-skewed, median of no growth
+        growth = rng.lognormal(mean=0.0, sigma=config.get('growth_sigma', self.GROWTH_SIGMA), size=trials)
+        storage_cost = self._calculate_storage_cost(config) * growth
+        backup_cost = self._calculate_backup_cost(config) * growth
+        io_cost = self._calculate_io_cost(config) * growth
+        monthly = instance_costs[sizing_outcome] + storage_cost + backup_cost + io_cost
+        
+        # Migrations overrun far more often than they finish early
+        duration = config.get('migration_duration_hours', 24) * rng.triangular(0.8, 1.0, 2.5, size=trials)
+        dms_hourly = self._calculate_dms_cost({**config, 'migration_duration_hours': 1})
+        transfer_volume = config.get('data_size_gb', 100) * rng.lognormal(mean=0.0, sigma=0.3, size=trials)
+        one_time = dms_hourly * duration + self._tiered_transfer_cost(transfer_volume, config)
+        
+        samples = {'monthly': monthly, 'annual': monthly * 12, 'one_time': one_time}
+        percentiles = {
+            name: dict(zip(('p50', 'p90', 'p99'), np.percentile(values, [50, 90, 99]).tolist()))
+            for name, values in samples.items()
+        }
+        
+        # Confidence narrows as the P90 spread around the median shrinks
+        spread = (percentiles['annual']['p90'] - percentiles['annual']['p50']) / max(percentiles['annual']['p50'], 1e-9)
+        confidence = float(np.clip(1.0 - spread, 0.5, 0.95))
+        if not self.connected:
+            confidence *= 0.8
+        
+        return CostSimulation(
+            trials=trials,
+            percentiles=percentiles,
+            samples=samples,
+            confidence_score=round(confidence, 2),
+            elapsed_ms=(time.perf_counter() - start_time) * 1000
+        )
+    
+    def _sizing_neighbours(self, instance_class: str) -> List[Optional[str]]:
+        """[one size down, instance_class, one size up] within the same family, ordered by price"""
+        family = instance_class.split('.')[1:2]
+        ladder = sorted((c for c in self.prices['instance_monthly'] if c.split('.')[1:2] == family),
+                        key=lambda c: self.prices['instance_monthly'][c])
+        if instance_class not in ladder:
+            return [None, instance_class, None]
+        
+        position = ladder.index(instance_class)
+        return [ladder[position - 1] if position > 0 else None,
+                instance_class,
+                ladder[position + 1] if position + 1 < len(ladder) else None]
+    
+    def _tiered_transfer_cost(self, data_size_gb: np.ndarray, config: Dict) -> np.ndarray:
+        """Tiered data transfer pricing over an array of volumes"""
+        cost = np.zeros_like(data_size_gb, dtype=float)
+        tier_start = 0
+        for tier_end, rate in self.prices['data_transfer_tiers']:
+            upper = np.inf if tier_end is None else tier_end
+            cost += np.clip(data_size_gb - tier_start, 0, upper - tier_start) * rate
+            if tier_end is None:
+                break
+            tier_start = tier_end
+        return cost * self._region_multiplier(config, 'data_transfer')
+    
+    def project_tco(self, config: Dict, years: int = 3, storage_growth_pct: float = 20.0,
+                    instance_classes: Optional[List[str]] = None) -> TCOProjection:
+        """Project cumulative cost under on-demand and every reserved instance option"""
+        instance_classes = tuple(instance_classes or [config.get('instance_class', 'db.t3.medium')])
+        return self._memoized('project_tco', config,
+                              lambda: self._project_tco(config, years, storage_growth_pct, list(instance_classes)),
+                              years, storage_growth_pct, instance_classes)
+    
+    def _project_tco(self, config: Dict, years: int, storage_growth_pct: float,
+                     instance_classes: List[str]) -> TCOProjection:
+        options = self.prices.get('reserved_instances', DEFAULT_AWS_PRICING['reserved_instances'])
+        months = np.arange(1, years * 12 + 1)
+        
+        # Storage and backups are not covered by reservations and grow with the data
+        storage_monthly = self._calculate_storage_cost(config) + self._calculate_backup_cost(config) + self._calculate_io_cost(config)
+        storage_cumulative = np.cumsum(storage_monthly * (1 + storage_growth_pct / 100) ** ((months - 1) / 12))
+        
+        # Axes: (candidate, option, month)
+        on_demand = np.array([self._calculate_rds_cost({**config, 'instance_class': c}) for c in instance_classes])
+        term_months = np.array([o['term_years'] * 12 for o in options])
+        discount = np.array([o['discount'] for o in options])
+        upfront_fraction = np.array([o['upfront_fraction'] for o in options])
+        
+        term_total = on_demand[:, None] * term_months * (1 - discount)
+        upfront = term_total * upfront_fraction
+        recurring = (term_total - upfront) / term_months
+        # Reservations are renewed on the same terms when they expire inside the horizon
+        terms_started = np.ceil(months[None, :] / term_months[:, None])
+        reserved_cumulative = upfront[:, :, None] * terms_started + recurring[:, :, None] * months
+        on_demand_cumulative = on_demand[:, None] * months
+        
+        # Break-even: first month of the first term where the reservation has cost no more than on-demand
+        covered = (reserved_cumulative <= on_demand_cumulative[:, None, :]) & (months <= term_months[:, None])
+        break_even = np.where(covered.any(axis=2), covered.argmax(axis=2) + 1, np.nan)
+        
+        horizon_index = [12 * year - 1 for year in range(1, years + 1)]
+        labels = ['On-Demand'] + [f"{o['term_years']}yr {o['payment_option']}" for o in options]
+        all_cumulative = np.concatenate([on_demand_cumulative[:, None, :], reserved_cumulative], axis=1) + storage_cumulative
+        
+        summary = pd.DataFrame({
+            'instance_class': np.repeat(instance_classes, len(labels)),
+            'pricing_option': np.tile(labels, len(instance_classes)),
+            'upfront': np.concatenate([np.zeros((len(instance_classes), 1)), upfront], axis=1).ravel(),
+            'instance_monthly': np.concatenate([on_demand[:, None], recurring], axis=1).ravel(),
+            'break_even_month': np.concatenate([np.full((len(instance_classes), 1), np.nan), break_even], axis=1).ravel()
+        })
+        for year, index in zip(range(1, years + 1), horizon_index):
+            summary[f'tco_{year}yr'] = all_cumulative[:, :, index].ravel()
+        on_demand_tco = np.repeat(all_cumulative[:, 0, -1], len(labels))
+        summary['savings_vs_on_demand'] = on_demand_tco - summary[f'tco_{years}yr']
+        
+        cumulative = pd.DataFrame(all_cumulative[0].T, columns=labels)
+        cumulative.insert(0, 'month', months)
+        
+        return TCOProjection(years=years, summary=summary, cumulative=cumulative)
     
     def _generate_cost_optimizations(self, config: Dict, monthly_cost: float) -> List[str]:
         """Generate cost optimization recommendations"""
         optimizations = []
         
         # Instance optimization
-        if monthly_cost > 500:
-            optimizations.append("Consider Reserved Instances for 40-60% savings")
+        tco = self.project_tco(config, years=3).summary
+        best = tco.loc[tco['savings_vs_on_demand'].idxmax()]
+        if best['savings_vs_on_demand'] > 0:
+            optimizations.append(
+                f"{best['pricing_option']} Reserved Instance breaks even in month {best['break_even_month']:.0f} "
+                f"and saves ${best['savings_vs_on_demand']:,.0f} over 3 years"
+            )
         
         # Storage optimization
         if config.get('storage_type', 'gp2') == 'gp2':
@@ -1081,8 +3401,16 @@ class EnhancedAWSCostCalculator:
             optimizations.append("Enable Multi-AZ for high availability")
         
         # Aurora optimization
-        if 'aurora' not in config.get('target_engine', ''):
+        if not self._is_aurora(config):
             optimizations.append("Consider Aurora for better performance/cost ratio")
+        else:
+            aurora = self.compare_aurora_storage(config)
+            current = 'io_optimized' if self._is_io_optimized(config) else 'standard'
+            if aurora.recommended != current:
+                label = "I/O-Optimized" if aurora.recommended == 'io_optimized' else "Standard"
+                savings = abs(aurora.standard_monthly - aurora.io_optimized_monthly)
+                optimizations.append(f"Switch to Aurora {label} to save ${savings:,.2f}/month "
+                                     f"(I/O is {aurora.io_share:.0%} of the Standard bill)")
         
         return optimizations
     
@@ -1102,59 +3430,771 @@ class EnhancedAWSCostCalculator:
             confidence_score=0.5
         )
 
+@st.cache_resource
+def get_cost_calculator() -> EnhancedAWSCostCalculator:
+    """Process-wide cost calculator with its memoized estimates"""
+    return EnhancedAWSCostCalculator(pricing_store=get_pricing_store(), price_index=get_price_index())
+
+# Right-Sizing from CloudWatch Metrics
+class StreamingHistogram:
+    """Fixed-bin histogram for approximate percentiles over unbounded streams"""
+    
+    def __init__(self, edges: np.ndarray):
+        self.edges = edges
+        self.counts = np.zeros(len(edges) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+    
+    def add(self, values: np.ndarray):
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        self.counts += np.bincount(np.searchsorted(self.edges, values), minlength=len(self.counts))
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def percentile(self, q: float) -> float:
+        """Percentile interpolated within the containing bin; q=0 and q=100 are the exact extremes"""
+        if not self.count:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 100:
+            return self.max
+        cumulative = np.cumsum(self.counts)
+        target = q / 100 * self.count
+        bin_index = int(np.searchsorted(cumulative, target))
+        lower = self.edges[bin_index - 1] if bin_index > 0 else self.min
+        upper = self.edges[bin_index] if bin_index < len(self.edges) else self.max
+        before = cumulative[bin_index - 1] if bin_index > 0 else 0
+        fraction = (target - before) / max(self.counts[bin_index], 1)
+        return float(min(max(lower + (upper - lower) * fraction, self.min), self.max))
+
+class RightSizingEngine:
+    """Recommend instance class and storage type from CloudWatch/Performance Insights exports"""
+    
+    # Normalized column or MetricName substrings -> metric key
+    METRIC_ALIASES = {
+        'cpuutilization': 'cpu_pct',
+        'freeablememory': 'freeable_memory_bytes',
+        'readiops': 'read_iops',
+        'writeiops': 'write_iops',
+        'networkreceivethroughput': 'network_rx_bytes',
+        'networktransmitthroughput': 'network_tx_bytes',
+        'readthroughput': 'read_throughput_bytes',
+        'writethroughput': 'write_throughput_bytes'
+    }
+    
+    def __init__(self, cost_calculator: Optional[EnhancedAWSCostCalculator] = None,
+                 chunk_rows: int = 200_000):
+        self.cost_calculator = cost_calculator or get_cost_calculator()
+        self.chunk_rows = chunk_rows
+    
+    def recommend(self, sources: List, config: Dict, headroom: float = 0.3,
+                  percentile: float = 95) -> RightSizingRecommendation:
+        """Size for the chosen percentile of observed load plus headroom"""
+        histograms, samples = self._collect_metrics(sources)
+        if not histograms:
+            raise ValueError("No recognised CloudWatch metrics found in the uploaded files")
+        
+        summary = {
+            metric: {
+                'p50': hist.percentile(50), 'p95': hist.percentile(95), 'p99': hist.percentile(99),
+                'max': hist.max, 'mean': hist.mean,
+                'peak_to_average': hist.max / hist.mean if hist.mean else 0.0
+            }
+            for metric, hist in histograms.items()
+        }
+        
+        def observed(metric: str, q: float = percentile) -> float:
+            return histograms[metric].percentile(q) if metric in histograms else 0.0
+        
+        current_class = config.get('instance_class', 'db.t3.medium')
+        current_spec = RDS_INSTANCE_SPECS.get(current_class, RDS_INSTANCE_SPECS['db.t3.medium'])
+        scale = 1 + headroom
+        requirements = {}
+        rationale = []
+        
+        # Utilization metrics are relative to the instance the metrics were captured on
+        if 'cpu_pct' in histograms:
+            requirements['vcpu'] = current_spec['vcpu'] * observed('cpu_pct') / 100 * scale
+            requirements['sustained_vcpu'] = current_spec['vcpu'] * histograms['cpu_pct'].mean / 100
+        if 'freeable_memory_bytes' in histograms:
+            lowest_free_gib = observed('freeable_memory_bytes', 100 - percentile) / 2 ** 30
+            requirements['memory_gib'] = max(current_spec['memory_gib'] - lowest_free_gib, 0) * scale
+        if {'network_rx_bytes', 'network_tx_bytes'} & histograms.keys():
+            requirements['network_gbps'] = (observed('network_rx_bytes') + observed('network_tx_bytes')) * 8 / 1e9 * scale
+        # Read and write percentiles are summed, which is conservative when the peaks don't coincide
+        if {'read_iops', 'write_iops'} & histograms.keys():
+            requirements['iops'] = (observed('read_iops') + observed('write_iops')) * scale
+        if {'read_throughput_bytes', 'write_throughput_bytes'} & histograms.keys():
+            requirements['throughput_mibps'] = (observed('read_throughput_bytes') + observed('write_throughput_bytes')) / 2 ** 20 * scale
+        
+        instance_class = self._select_instance_class(config, requirements, rationale)
+        storage_type = self._select_storage_type(config, requirements, rationale)
+        
+        if summary.get('cpu_pct', {}).get('peak_to_average', 0) > 3:
+            rationale.append("CPU is spiky (peak is over 3x the average); review scheduled jobs before downsizing")
+        
+        return RightSizingRecommendation(
+            instance_class=instance_class,
+            storage_type=storage_type,
+            metric_summary=summary,
+            requirements=requirements,
+            rationale=rationale,
+            samples_processed=samples
+        )
+    
+    def _select_instance_class(self, config: Dict, requirements: Dict[str, float], rationale: List[str]) -> str:
+        """Cheapest instance class whose capacity covers every requirement"""
+        candidates = sorted(
+            (self.cost_calculator._calculate_rds_cost({**config, 'instance_class': c}), c)
+            for c in RDS_INSTANCE_SPECS
+        )
+        
+        for monthly_cost, instance_class in candidates:
+            spec = RDS_INSTANCE_SPECS[instance_class]
+            if any(requirements.get(key, 0) > spec[key] for key in ('vcpu', 'memory_gib', 'network_gbps')):
+                continue
+            # Burstable classes throttle once sustained CPU exceeds the credit baseline
+            if 'cpu_baseline_pct' in spec and requirements.get('sustained_vcpu', 0) > spec['vcpu'] * spec['cpu_baseline_pct'] / 100:
+                continue
+            rationale.append(f"{instance_class} is the cheapest class covering the observed load "
+                             f"(${monthly_cost:,.2f}/month)")
+            return instance_class
+        
+        largest = max(RDS_INSTANCE_SPECS, key=lambda c: RDS_INSTANCE_SPECS[c]['vcpu'] * 1000 + RDS_INSTANCE_SPECS[c]['memory_gib'])
+        rationale.append(f"Observed load exceeds every modelled class; {largest} is the largest available")
+        return largest
+    
+    def _select_storage_type(self, config: Dict, requirements: Dict[str, float], rationale: List[str]) -> str:
+        """Cheapest volume type that delivers the required IOPS and throughput"""
+        plan = self.cost_calculator.plan_storage({
+            **config,
+            'required_iops': requirements.get('iops', 0),
+            'required_throughput_mibps': requirements.get('throughput_mibps', 0)
+        })
+        rationale.append(f"{plan.storage_type} at {plan.allocated_gb:,} GB delivers {plan.provisioned_iops:,} IOPS and "
+                         f"{plan.provisioned_mibps:,} MiB/s for ${sum(plan.cost_split.values()):,.2f}/month")
+        return plan.storage_type
+    
+    def _collect_metrics(self, sources: List):
+        """Stream every file in chunks into per-metric histograms"""
+        histograms = {}
+        samples = 0
+        for source in sources:
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            for chunk in pd.read_csv(source, chunksize=self.chunk_rows, on_bad_lines='skip', encoding_errors='replace'):
+                for metric, values in self._chunk_metrics(chunk):
+                    if metric not in histograms:
+                        histograms[metric] = StreamingHistogram(self._bin_edges(metric))
+                    histograms[metric].add(values)
+                    samples += len(values)
+        return histograms, samples
+    
+    def _chunk_metrics(self, chunk: pd.DataFrame):
+        """Yield (metric, values) from a wide (one column per metric) or long (MetricName/Value) export"""
+        columns = {self._normalize(c): c for c in chunk.columns}
+        
+        if 'metricname' in columns:
+            value_column = next((columns[c] for c in ('value', 'average', 'maximum') if c in columns), None)
+            if value_column is None:
+                return
+            names = chunk[columns['metricname']].astype(str).map(self._metric_key)
+            values = pd.to_numeric(chunk[value_column], errors='coerce')
+            for metric, group in values.groupby(names):
+                if metric:
+                    yield metric, group.to_numpy(dtype=float)
+            return
+        
+        for normalized, column in columns.items():
+            metric = self._metric_key(normalized)
+            if metric:
+                yield metric, pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=float)
+    
+    def _metric_key(self, name: str) -> Optional[str]:
+        normalized = self._normalize(name)
+        return next((key for alias, key in self.METRIC_ALIASES.items() if alias in normalized), None)
+    
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return re.sub(r'[^a-z0-9]', '', str(name).lower())
+    
+    @staticmethod
+    def _bin_edges(metric: str) -> np.ndarray:
+        # Percent metrics get linear bins; byte and IOPS metrics span many orders of magnitude
+        if metric == 'cpu_pct':
+            return np.linspace(0, 100, 2001)
+        return np.logspace(-2, 13, 3001)
+
+# DMS Migration Window Estimation
+class DMSWindowEstimator:
+    """Estimate DMS full-load and CDC catch-up duration from table sizes and instance capacity"""
+    
+    # Single full-load thread limits: sustained MB/s and per-row overhead
+    THREAD_MBPS = 12.0
+    THREAD_ROWS_PER_SECOND = 25_000
+    # Slowdown relative to tables without LOBs
+    LOB_FACTORS = {'none': 1.0, 'limited': 1.6, 'full': 4.0}
+    NETWORK_EFFICIENCY = 0.7
+    # Share of instance throughput available for applying cached changes
+    CDC_APPLY_SHARE = 0.5
+    CUTOVER_HOURS = 0.25
+    
+    def __init__(self, cost_calculator: Optional[EnhancedAWSCostCalculator] = None):
+        self.cost_calculator = cost_calculator or get_cost_calculator()
+    
+    def estimate(self, tables: pd.DataFrame, config: Dict, parallel_threads: int = 8,
+                 network_mbps: float = 1000.0, change_rate_gb_per_hour: float = 0.0,
+                 use_cdc: bool = True) -> DMSWindowEstimate:
+        """tables needs table, rows, size_gb and lob_mode columns"""
+        dms_instance = config.get('dms_instance', 'dms.t3.medium')
+        spec = DMS_INSTANCE_SPECS.get(dms_instance, DMS_INSTANCE_SPECS['dms.t3.medium'])
+        
+        tables = tables.dropna(subset=['table']).reset_index(drop=True)
+        rows = pd.to_numeric(tables['rows'], errors='coerce').fillna(0).clip(lower=0).to_numpy()
+        size_mb = pd.to_numeric(tables['size_gb'], errors='coerce').fillna(0).clip(lower=0).to_numpy() * 1024
+        lob_factor = tables['lob_mode'].map(self.LOB_FACTORS).fillna(1.0).to_numpy()
+        
+        # Aggregate ceiling is the slower of the replication instance and the source link
+        threads = max(1, min(parallel_threads, len(tables)))
+        limits = {
+            'instance': spec['throughput_mbps'],
+            'network': min(network_mbps, spec['network_gbps'] * 1000) / 8 * self.NETWORK_EFFICIENCY,
+            'threads': self.THREAD_MBPS * threads
+        }
+        bottleneck = min(limits, key=limits.get)
+        effective_mbps = limits[bottleneck]
+        thread_mbps = effective_mbps / threads
+        
+        table_hours = (size_mb / thread_mbps + rows / self.THREAD_ROWS_PER_SECOND) * lob_factor / 3600
+        schedule = self._schedule(tables['table'].astype(str).tolist(), table_hours, threads)
+        full_load_hours = float(schedule['end_hours'].max()) if len(schedule) else 0.0
+        
+        # Changes cached during the full load must be applied faster than new ones arrive
+        cdc_catchup_hours = 0.0
+        cdc_keeps_up = True
+        if use_cdc and change_rate_gb_per_hour > 0:
+            apply_gb_per_hour = spec['throughput_mbps'] * self.CDC_APPLY_SHARE * 3600 / 1024
+            cdc_keeps_up = apply_gb_per_hour > change_rate_gb_per_hour
+            backlog_gb = change_rate_gb_per_hour * full_load_hours
+            cdc_catchup_hours = backlog_gb / (apply_gb_per_hour - change_rate_gb_per_hour) if cdc_keeps_up else float('inf')
+        
+        total_hours = full_load_hours + cdc_catchup_hours + self.CUTOVER_HOURS
+        # Without CDC the source is frozen for the whole load; with CDC only for the cutover
+        downtime_hours = self.CUTOVER_HOURS if use_cdc else total_hours
+        
+        dms_cost = self.cost_calculator._calculate_dms_cost(
+            {**config, 'migration_duration_hours': total_hours if np.isfinite(total_hours) else 0}
+        )
+        
+        return DMSWindowEstimate(
+            full_load_hours=full_load_hours,
+            cdc_catchup_hours=cdc_catchup_hours,
+            total_hours=total_hours,
+            downtime_hours=downtime_hours,
+            effective_mbps=effective_mbps,
+            bottleneck=bottleneck,
+            cdc_keeps_up=cdc_keeps_up,
+            dms_cost=dms_cost,
+            schedule=schedule
+        )
+    
+    @staticmethod
+    def _schedule(table_names: List[str], table_hours: np.ndarray, threads: int) -> pd.DataFrame:
+        """Longest-processing-time-first assignment of tables to load threads"""
+        free_at = [(0.0, thread) for thread in range(threads)]
+        heapq.heapify(free_at)
+        assignments = []
+        for index in np.argsort(-table_hours, kind='stable'):
+            start, thread = heapq.heappop(free_at)
+            end = start + float(table_hours[index])
+            assignments.append((table_names[index], thread + 1, start, end))
+            heapq.heappush(free_at, (end, thread))
+        return pd.DataFrame(assignments, columns=['table', 'thread', 'start_hours', 'end_hours'])
+    
+    @staticmethod
+    def exceeds_tolerance(estimate: DMSWindowEstimate, downtime_tolerance: str) -> bool:
+        """Whether the expected downtime breaks the sidebar downtime tolerance"""
+        limit = DOWNTIME_TOLERANCE_HOURS.get(downtime_tolerance)
+        return limit is not None and (estimate.downtime_hours > limit or not estimate.cdc_keeps_up)
+
+# Schema context compaction for AI prompts
+class SchemaContextCompactor:
+    """Condense schema DDL and queries into a token-budgeted digest for LLM prompts"""
+    
+    # Rough chars-per-token ratio for English and SQL text
+    CHARS_PER_TOKEN = 4
+    
+    # Constructs that usually need manual attention when changing engines
+    FLAGGED_CONSTRUCTS = {
+        'AUTO_INCREMENT': r'\bAUTO_INCREMENT\b',
+        'IDENTITY': r'\bIDENTITY\b',
+        'ENUM': r'\bENUM\s*\(',
+        'VARCHAR2/NVARCHAR2': r'\bN?VARCHAR2\b',
+        'NVARCHAR': r'\bNVARCHAR\b',
+        'NUMBER': r'\bNUMBER\b',
+        'LOB': r'\b(?:CLOB|NCLOB|BLOB|LONGTEXT|LONGBLOB)\b',
+        'SYSDATE/GETDATE': r'\b(?:SYSDATE|GETDATE\s*\()',
+        'ROWNUM': r'\bROWNUM\b',
+        'CONNECT BY': r'\bCONNECT\s+BY\b',
+        'TOP': r'\bSELECT\s+TOP\b',
+        'ENGINE=': r'\bENGINE\s*=',
+        'PARTITION': r'\bPARTITION\s+BY\b',
+        'TRIGGER': r'\bCREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER\b',
+        'STORED PROCEDURE': r'\bCREATE\s+(?:OR\s+REPLACE\s+)?(?:PROCEDURE|FUNCTION|PACKAGE)\b',
+        'SEQUENCE': r'\bCREATE\s+SEQUENCE\b'
+    }
+    
+    OBJECT_PATTERNS = {
+        'views': r'\bCREATE\s+(?:OR\s+REPLACE\s+)?(?:MATERIALIZED\s+)?VIEW\b',
+        'triggers': r'\bCREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER\b',
+        'routines': r'\bCREATE\s+(?:OR\s+REPLACE\s+)?(?:PROCEDURE|FUNCTION|PACKAGE)\b',
+        'sequences': r'\bCREATE\s+SEQUENCE\b'
+    }
+    
+    def __init__(self, token_budget: int = 4000):
+        self.token_budget = token_budget
+        self._flagged = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in self.FLAGGED_CONSTRUCTS.items()}
+        self._objects = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in self.OBJECT_PATTERNS.items()}
+    
+    def estimate_tokens(self, text: str) -> int:
+        """Approximate token count of a prompt fragment"""
+        return -(-len(text) // self.CHARS_PER_TOKEN)
+    
+    def compact(self, schema_ddl: str, queries_text: str = "") -> SchemaDigest:
+        """Digest of the schema and queries, split into chunks when it exceeds the budget"""
+        tables = self.parse_tables(schema_ddl)
+        indexes = self._parse_indexes(schema_ddl)
+        index_count = len(indexes) + sum(len(t['indexes']) for t in tables.values())
+        for index_name, table_name, columns, unique in indexes:
+            if table_name.lower() in tables:
+                tables[table_name.lower()]['indexes'].append(f"{'UQ ' if unique else ''}{index_name}({columns})")
+        
+        object_counts = {
+            'tables': len(tables),
+            'columns': sum(len(t['columns']) for t in tables.values()),
+            'indexes': index_count,
+            **{name: len(pattern.findall(schema_ddl)) for name, pattern in self._objects.items()}
+        }
+        flagged = {}
+        for name, pattern in self._flagged.items():
+            count = len(pattern.findall(schema_ddl)) + len(pattern.findall(queries_text))
+            if count:
+                flagged[name] = count
+        
+        header_lines = ["Objects: " + ", ".join(f"{count} {name}" for name, count in object_counts.items() if count)]
+        if flagged:
+            header_lines.append("Flagged constructs: " + ", ".join(f"{name} x{count}" for name, count in flagged.items()))
+        query_digest = self._digest_queries(queries_text)
+        if query_digest:
+            header_lines.append(query_digest)
+        header = "\n".join(header_lines)
+        
+        table_lines = [self._table_line(table) for table in tables.values()]
+        full_text = "\n".join([header, "Tables:", *table_lines])
+        original_tokens = self.estimate_tokens(schema_ddl) + self.estimate_tokens(queries_text)
+        
+        if self.estimate_tokens(full_text) <= self.token_budget:
+            return SchemaDigest(summary=full_text, object_counts=object_counts, flagged_constructs=flagged,
+                                token_estimate=self.estimate_tokens(full_text), original_token_estimate=original_tokens)
+        
+        # Over budget: keep what fits inline and hand every table to the chunked map step
+        summary_lines = [header, "Tables:"]
+        used = self.estimate_tokens("\n".join(summary_lines))
+        inline = 0
+        for line in table_lines:
+            line_tokens = self.estimate_tokens(line) + 1
+            if used + line_tokens > self.token_budget // 2:
+                break
+            summary_lines.append(line)
+            used += line_tokens
+            inline += 1
+        if inline < len(table_lines):
+            summary_lines.append(f"... {len(table_lines) - inline} more tables not listed")
+        summary = "\n".join(summary_lines)
+        
+        return SchemaDigest(summary=summary, object_counts=object_counts, flagged_constructs=flagged,
+                            token_estimate=self.estimate_tokens(summary), original_token_estimate=original_tokens,
+                            chunks=self._chunk_lines(table_lines, self.token_budget))
+    
+    def parse_tables(self, schema_ddl: str) -> Dict[str, Dict]:
+        """Tables with their column types, keys and inline constraints"""
+        tables = {}
+        for match in re.finditer(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w."`\[\]]+)\s*\(', schema_ddl, re.IGNORECASE):
+            name = re.sub(r'["`\[\]]', '', match.group(1))
+            body = self._balanced_body(schema_ddl, match.end() - 1)
+            table = {'name': name, 'columns': [], 'primary_key': [], 'foreign_keys': [], 'indexes': []}
+            for item in self._split_top_level(body):
+                self._parse_table_item(item, table)
+            tables[name.lower()] = table
+        return tables
+    
+    def _parse_table_item(self, item: str, table: Dict):
+        """Add one column or table constraint to the parsed table"""
+        upper = item.upper()
+        if upper.startswith(('PRIMARY KEY', 'CONSTRAINT', 'FOREIGN KEY', 'UNIQUE', 'KEY', 'INDEX', 'CHECK')):
+            columns = re.search(r'\(([^)]*)\)', item)
+            if 'PRIMARY KEY' in upper and columns:
+                table['primary_key'].extend(c.strip(' "`') for c in columns.group(1).split(','))
+            elif 'FOREIGN KEY' in upper:
+                target = re.search(r'REFERENCES\s+([\w."`]+)', item, re.IGNORECASE)
+                if columns and target:
+                    target_name = target.group(1).strip('"`')
+                    table['foreign_keys'].append(f"{columns.group(1).strip()}->{target_name}")
+            elif upper.startswith(('UNIQUE', 'KEY', 'INDEX')) and columns:
+                table['indexes'].append(f"{'UQ ' if upper.startswith('UNIQUE') else ''}({columns.group(1).strip()})")
+            return
+        
+        parts = item.split(None, 2)
+        if len(parts) < 2:
+            return
+        column, col_type = parts[0].strip('"`[]'), parts[1]
+        rest = parts[2].upper() if len(parts) > 2 else ''
+        type_args = re.match(r'\([^)]*\)', parts[2]) if len(parts) > 2 else None
+        if type_args:
+            col_type += type_args.group(0)
+        flags = []
+        if 'PRIMARY KEY' in rest:
+            flags.append('PK')
+            table['primary_key'].append(column)
+        if 'AUTO_INCREMENT' in rest or 'IDENTITY' in rest:
+            flags.append('AI')
+        if 'NOT NULL' in rest:
+            flags.append('NN')
+        if 'UNIQUE' in rest:
+            flags.append('UQ')
+        reference = re.search(r'REFERENCES\s+([\w."`]+)', parts[2] if len(parts) > 2 else '', re.IGNORECASE)
+        if reference:
+            target_name = reference.group(1).strip('"`')
+            table['foreign_keys'].append(f"{column}->{target_name}")
+        table['columns'].append((column, col_type.upper(), flags))
+    
+    def _parse_indexes(self, schema_ddl: str) -> List[Tuple[str, str, str, bool]]:
+        """Standalone CREATE INDEX statements as (name, table, columns, unique)"""
+        return [
+            (match.group(2), re.sub(r'["`\[\]]', '', match.group(3)), match.group(4).strip(), bool(match.group(1)))
+            for match in re.finditer(
+                r'CREATE\s+(UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w."`]+)\s+ON\s+([\w."`\[\]]+)\s*\(([^)]*)\)',
+                schema_ddl, re.IGNORECASE
+            )
+        ]
+    
+    def _table_line(self, table: Dict) -> str:
+        """One dense line per table: columns with types and flags, keys and indexes"""
+        columns = ", ".join(
+            f"{name} {col_type}{' ' + ' '.join(flags) if flags else ''}" for name, col_type, flags in table['columns']
+        )
+        line = f"{table['name']}({columns})"
+        if table['foreign_keys']:
+            line += f" fk[{', '.join(table['foreign_keys'])}]"
+        if table['indexes']:
+            line += f" idx[{', '.join(table['indexes'])}]"
+        return line
+    
+    def _digest_queries(self, queries_text: str) -> str:
+        """Statement mix and join/subquery counts for the workload"""
+        statements = [s.strip() for s in queries_text.split(';') if s.strip()]
+        if not statements:
+            return ""
+        kinds = {}
+        for statement in statements:
+            kind = statement.split(None, 1)[0].upper()
+            kinds[kind] = kinds.get(kind, 0) + 1
+        joins = len(re.findall(r'\bJOIN\b', queries_text, re.IGNORECASE))
+        subqueries = len(re.findall(r'\(\s*SELECT\b', queries_text, re.IGNORECASE))
+        mix = ", ".join(f"{count} {kind}" for kind, count in sorted(kinds.items(), key=lambda kv: -kv[1]))
+        return f"Queries: {len(statements)} statements ({mix}); {joins} joins, {subqueries} subqueries"
+    
+    def _chunk_lines(self, lines: List[str], chunk_tokens: int) -> List[str]:
+        """Group lines into chunks of at most chunk_tokens each"""
+        chunks, current, used = [], [], 0
+        for line in lines:
+            line_tokens = self.estimate_tokens(line) + 1
+            if current and used + line_tokens > chunk_tokens:
+                chunks.append("\n".join(current))
+                current, used = [], 0
+            current.append(line)
+            used += line_tokens
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+    
+    @staticmethod
+    def _balanced_body(text: str, open_index: int) -> str:
+        """Text between the parenthesis at open_index and its matching close"""
+        depth = 0
+        for i in range(open_index, len(text)):
+            if text[i] == '(':
+                depth += 1
+            elif text[i] == ')':
+                depth -= 1
+                if depth == 0:
+                    return text[open_index + 1:i]
+        return text[open_index + 1:]
+    
+    @staticmethod
+    def _split_top_level(body: str) -> List[str]:
+        """Split a table body on commas outside parentheses"""
+        items, depth, start = [], 0, 0
+        for i, char in enumerate(body):
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                items.append(body[start:i].strip())
+                start = i + 1
+        items.append(body[start:].strip())
+        return [item for item in items if item]
+
 # Enhanced AI Analyzer with Multiple Analysis Types
 class EnterpriseAIAnalyzer:
     """Enterprise-grade AI analyzer with comprehensive migration analysis"""
     
-    def __init__(self):
-        self.client = None
-        self.connected = False
+    def __init__(self, analysis_timeout: float = 60.0, max_concurrency: int = 3,
+                 response_cache: Optional[LLMResponseCache] = None, context_token_budget: int = 4000,
+                 llm_client: Optional[AsyncLLMClient] = None):
+        # Per-analysis time budget and how many analyses may hold an LLM request at once
+        self.analysis_timeout = analysis_timeout
+        self.max_concurrency = max_concurrency
+        self.response_cache = response_cache
+        self.compactor = SchemaContextCompactor(context_token_budget)
+        self.last_schema_digest: Optional[SchemaDigest] = None
+        self.analysis_methods = {
+            AnalysisType.MIGRATION_STRATEGY: self._analyze_migration_strategy,
+            AnalysisType.RISK_ASSESSMENT: self._analyze_risks,
+            AnalysisType.COST_OPTIMIZATION: self._analyze_cost_optimization,
+            AnalysisType.TIMELINE_ESTIMATION: self._analyze_timeline,
+            AnalysisType.SECURITY_ANALYSIS: self._analyze_security
+        }
         
-        try:
-            # Try to import anthropic and initialize
-            import anthropic
-            api_key = st.secrets.get("ANTHROPIC_API_KEY")
-            if api_key:
-                self.client = anthropic.Anthropic(api_key=api_key)
-                self.connected = True
-                logger.info("Enterprise AI Analyzer initialized successfully")
-            else:
-                logger.warning("ANTHROPIC_API_KEY not found in secrets")
-        except Exception as e:
-            logger.warning(f"AI Analyzer using mock mode: {e}")
+        # Shared across analyzers so connections, rate limits and backoff are process-wide
+        self.async_client = llm_client or get_llm_client()
+        self.connected = self.async_client is not None
+        if not self.connected:
+            logger.warning("AI Analyzer using mock mode: ANTHROPIC_API_KEY not configured")
     
-    async def comprehensive_analysis(self, migration_context: Dict) -> Dict[AnalysisType, AIAnalysisResult]:
-        """Run comprehensive AI analysis across all aspects"""
+    async def comprehensive_analysis(self, migration_context: Dict,
+                                     analysis_types: Optional[List[AnalysisType]] = None,
+                                     on_result=None, on_token=None) -> Dict[AnalysisType, AIAnalysisResult]:
+        """Run comprehensive AI analysis across all aspects
+        
+        on_result(analysis_type, result) is called as each analysis completes and
+        on_token(analysis_type, text) for each streamed chunk of its detailed analysis.
+        """
+        analysis_types = [t for t in (analysis_types or self.analysis_methods) if t in self.analysis_methods]
         if not self.connected:
-            return self._get_fallback_analysis()
+            results = {t: self._get_fallback_result(t) for t in analysis_types}
+            for analysis_type, result in results.items():
+                if on_result:
+                    on_result(analysis_type, result)
+            return results
+        
+        prompt_context = await self._compact_context(migration_context)
+        
+        # Analyses are independent, so total latency is the slowest one rather than the sum
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(
+            self._run_analysis(analysis_type, prompt_context, semaphore, on_result, on_token)
+            for analysis_type in analysis_types
+        ))
+        return dict(zip(analysis_types, results))
+    
+    async def _compact_context(self, migration_context: Dict) -> Dict:
+        """Replace raw DDL and queries with a token-budgeted schema digest"""
+        digest = self.compactor.compact(migration_context.get('schema_ddl') or '',
+                                        migration_context.get('queries_text') or '')
+        self.last_schema_digest = digest
+        
+        schema_summary = digest.summary
+        if digest.chunks:
+            try:
+                findings = await asyncio.wait_for(self._map_reduce_schema(digest), timeout=self.analysis_timeout)
+                if findings:
+                    schema_summary += f"\n\nFindings across all tables:\n{findings}"
+            except asyncio.TimeoutError:
+                logger.warning(f"Schema map-reduce timed out after {self.analysis_timeout}s")
+            except Exception as e:
+                # Analyses still run on the digest summary alone
+                logger.warning(f"Schema map-reduce failed, using the digest summary only: {e}")
+        
+        prompt_context = {k: v for k, v in migration_context.items() if k not in ('schema_ddl', 'queries_text')}
+        prompt_context.update({
+            'schema_summary': schema_summary,
+            'schema_objects': digest.object_counts,
+            'flagged_constructs': digest.flagged_constructs
+        })
+        return prompt_context
+    
+    async def _map_reduce_schema(self, digest: SchemaDigest) -> str:
+        """Summarize each schema chunk in parallel, then condense the partial findings"""
+        if self.async_client is None:
+            return ""
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        chunk_tokens = max(128, self.compactor.token_budget // (2 * len(digest.chunks)))
+        
+        async def summarize(index: int, chunk: str) -> str:
+            async with semaphore:
+                return await self._complete(
+                    f"""Summarize the database migration concerns in this schema fragment ({index + 1} of {len(digest.chunks)}).
+List only non-trivial findings as short bullets: engine-specific types, missing keys or indexes,
+wide or LOB-heavy tables, and relationships that constrain migration order.
+
+{chunk}""", chunk_tokens, 'schema_chunk')
+        
+        partials = await asyncio.gather(*(summarize(i, chunk) for i, chunk in enumerate(digest.chunks)),
+                                        return_exceptions=True)
+        findings = []
+        for partial in partials:
+            if isinstance(partial, Exception):
+                logger.warning(f"Schema chunk summary failed: {partial}")
+            elif partial:
+                findings.append(partial.strip())
+        combined = "\n".join(findings)
+        
+        if combined and self.compactor.estimate_tokens(combined) > self.compactor.token_budget // 2:
+            combined = await self._complete(
+                f"""Merge these per-fragment schema findings into one deduplicated list of the most important
+migration concerns, highest impact first.
+
+{combined}""", self.compactor.token_budget // 2, 'schema_reduce')
+        return combined
+    
+    async def _complete(self, prompt: str, max_tokens: int, cache_type: str) -> str:
+        """Single non-streaming completion, served from the response cache when possible"""
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.make_key(AI_MODEL, prompt, cache_type)
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                return cached
+        
+        response = await self.async_client.create(
+            model=AI_MODEL, max_tokens=max_tokens, messages=[{'role': 'user', 'content': prompt}]
+        )
+        text = ''.join(block.text for block in response.content if getattr(block, 'type', '') == 'text')
+        if cache_key is not None:
+            await asyncio.to_thread(self.response_cache.put, cache_key, AI_MODEL, cache_type, text)
+        return text
+    
+    async def _run_analysis(self, analysis_type: AnalysisType, context: Dict, semaphore: asyncio.Semaphore,
+                            on_result=None, on_token=None) -> AIAnalysisResult:
+        """Run one analysis under the concurrency limit, degrading to its fallback on timeout or error"""
+        cache_key = None
+        result = None
+        # The cache is SQLite-backed, so its calls run in a worker thread to keep the loop free
+        if self.response_cache is not None:
+            cache_key = self.response_cache.make_key(AI_MODEL, json.dumps(context, sort_keys=True, default=str),
+                                                     analysis_type.value)
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                result = AIAnalysisResult(**{**cached, 'analysis_type': analysis_type, 'from_cache': True})
+        
+        if result is None:
+            narrated = False
+            async with semaphore:
+                try:
+                    result, narrated = await asyncio.wait_for(
+                        self._analyze_with_narrative(analysis_type, context, on_token),
+                        timeout=self.analysis_timeout
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"{analysis_type.value} analysis timed out after {self.analysis_timeout}s")
+                except Exception as e:
+                    logger.error(f"{analysis_type.value} analysis failed: {e}")
+            
+            # Fallbacks, including results whose narrative the model did not write, are not
+            # cached so the next run retries the LLM
+            if result is not None and narrated and not result.is_fallback and cache_key is not None:
+                payload = asdict(result)
+                payload.pop('analysis_type')
+                payload.pop('from_cache')
+                await asyncio.to_thread(self.response_cache.put, cache_key, AI_MODEL, analysis_type.value, payload)
+        
+        result = result or self._get_fallback_result(analysis_type)
+        if on_result:
+            on_result(analysis_type, result)
+        return result
+    
+    async def _analyze_with_narrative(self, analysis_type: AnalysisType, context: Dict,
+                                      on_token=None) -> Tuple[AIAnalysisResult, bool]:
+        """Structured analysis followed by its LLM-written detailed analysis
+        
+        Also returns whether the detailed analysis came from the model.
+        """
+        result = await self.analysis_methods[analysis_type](context)
+        narrative = await self._generate_detailed_analysis(analysis_type, context, result, on_token)
+        if narrative is None:
+            return result, False
+        result.detailed_analysis = narrative
+        return result, True
+    
+    async def _generate_detailed_analysis(self, analysis_type: AnalysisType, context: Dict,
+                                          result: AIAnalysisResult, on_token=None) -> Optional[str]:
+        """Detailed analysis text, streamed chunk by chunk when on_token is given
         
-        analyses = {}
+        Returns None when the model is unavailable or the call fails.
+        """
+        if self.async_client is None:
+            return None
         
+        request = {
+            'model': AI_MODEL,
+            'max_tokens': 1024,
+            'messages': [{'role': 'user', 'content': self._detailed_analysis_prompt(analysis_type, context, result)}]
+        }
         try:
-            # Run different analysis types
-            strategy_analysis = await self._analyze_migration_strategy(migration_context)
-            risk_analysis = await self._analyze_risks(migration_context)
-            cost_analysis = await self._analyze_cost_optimization(migration_context)
-            timeline_analysis = await self._analyze_timeline(migration_context)
-            security_analysis = await self._analyze_security(migration_context)
-            
-            analyses[AnalysisType.MIGRATION_STRATEGY] = strategy_analysis
-            analyses[AnalysisType.RISK_ASSESSMENT] = risk_analysis
-            analyses[AnalysisType.COST_OPTIMIZATION] = cost_analysis
-            analyses[AnalysisType.TIMELINE_ESTIMATION] = timeline_analysis
-            analyses[AnalysisType.SECURITY_ANALYSIS] = security_analysis
-            
-            return analyses
-            
+            if on_token is None:
+                response = await self.async_client.create(**request)
+                return ''.join(block.text for block in response.content if getattr(block, 'type', '') == 'text')
+            
+            chunks = []
+            async with self.async_client.stream(**request) as stream:
+                async for text in stream.text_stream:
+                    chunks.append(text)
+                    on_token(analysis_type, text)
+            return ''.join(chunks)
         except Exception as e:
-            logger.error(f"Comprehensive analysis failed: {e}")
-            return self._get_fallback_analysis()
+            # The structured findings are still useful without the narrative
+            logger.warning(f"Detailed {analysis_type.value} analysis unavailable: {e}")
+            return None
+    
+    def _detailed_analysis_prompt(self, analysis_type: AnalysisType, context: Dict, result: AIAnalysisResult) -> str:
+        """Prompt asking for a narrative around the structured findings"""
+        context_summary = {k: v for k, v in context.items()
+                           if isinstance(v, (str, int, float, bool, list, dict)) and k != 'schema_summary'}
+        return f"""You are a senior AWS database migration architect. Write the detailed {analysis_type.value.replace('_', ' ')}
+section of a migration assessment in concise Markdown (under 350 words).
+
+Migration context:
+{json.dumps(context_summary, indent=2, default=str)}
+
+Schema summary:
+{context.get('schema_summary') or 'Not provided'}
+
+Findings to explain and prioritise:
+- Recommendations: {json.dumps(result.recommendations)}
+- Risks: {json.dumps(result.risks)}
+- Timeline estimate: {result.timeline_estimate}
+- Cost impact: {result.cost_impact}
+"""
     
     async def _analyze_migration_strategy(self, context: Dict) -> AIAnalysisResult:
         """Analyze migration strategy"""
         if not self.connected:
             return self._get_fallback_result(AnalysisType.MIGRATION_STRATEGY)
-            
+        
         # Mock implementation for demo
         await asyncio.sleep(0.5)  # Simulate processing
         
@@ -1189,7 +4229,7 @@ class EnterpriseAIAnalyzer:
         """Comprehensive risk analysis"""
         if not self.connected:
             return self._get_fallback_result(AnalysisType.RISK_ASSESSMENT)
-            
+        
         # Mock implementation for demo
         await asyncio.sleep(0.5)  # Simulate processing
         
@@ -1225,7 +4265,7 @@ class EnterpriseAIAnalyzer:
         """AI-powered cost optimization analysis"""
         if not self.connected:
             return self._get_fallback_result(AnalysisType.COST_OPTIMIZATION)
-            
+        
         # Mock implementation for demo
         await asyncio.sleep(0.5)  # Simulate processing
         
@@ -1260,7 +4300,7 @@ class EnterpriseAIAnalyzer:
         """AI-powered timeline estimation"""
         if not self.connected:
             return self._get_fallback_result(AnalysisType.TIMELINE_ESTIMATION)
-            
+        
         # Mock implementation for demo
         await asyncio.sleep(0.5)  # Simulate processing
         
@@ -1295,7 +4335,7 @@ class EnterpriseAIAnalyzer:
         """AI-powered security analysis"""
         if not self.connected:
             return self._get_fallback_result(AnalysisType.SECURITY_ANALYSIS)
-            
+        
         # Mock implementation for demo
         await asyncio.sleep(0.5)  # Simulate processing
         
@@ -1326,17 +4366,6 @@ class EnterpriseAIAnalyzer:
             ]
         )
     
-    def _get_fallback_analysis(self) -> Dict[AnalysisType, AIAnalysisResult]:
-        """Fallback analysis when AI is not available"""
-        fallback = {}
-        
-        for analysis_type in [AnalysisType.MIGRATION_STRATEGY, AnalysisType.RISK_ASSESSMENT, 
-                             AnalysisType.COST_OPTIMIZATION, AnalysisType.TIMELINE_ESTIMATION, 
-                             AnalysisType.SECURITY_ANALYSIS]:
-            fallback[analysis_type] = self._get_fallback_result(analysis_type)
-        
-        return fallback
-    
     def _get_fallback_result(self, analysis_type: AnalysisType) -> AIAnalysisResult:
         """Fallback result for specific analysis type"""
         return AIAnalysisResult(
@@ -1348,7 +4377,8 @@ class EnterpriseAIAnalyzer:
             timeline_estimate="Manual estimation required",
             cost_impact="Manual cost analysis required",
             detailed_analysis="AI analysis service not available. Please perform manual analysis.",
-            action_items=[{"action": "Enable AI analysis service", "priority": "high", "category": "setup"}]
+            action_items=[{"action": "Enable AI analysis service", "priority": "high", "category": "setup"}],
+            is_fallback=True
         )
 
 # Security Analyzer
@@ -1362,39 +4392,117 @@ class SecurityAnalyzer:
             'SOC2': ['security_monitoring', 'access_controls', 'change_management', 'incident_response'],
             'PCI_DSS': ['data_encryption', 'network_security', 'access_controls', 'regular_monitoring']
         }
+        
+        # Value-level PII detectors applied to uploaded data samples
+        self.sample_pii_patterns = {
+            'email': r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}',
+            'phone': r'(?:\+\d{1,3}[\s.-]?)?\(?\b\d{3}\)?[\s.-]?\d{3}[\s.-]\d{4}\b',
+            'ssn': r'\b(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}\b'
+        }
+        # ASCII digits only: \d also matches other scripts' digits, which the Luhn check cannot decode
+        self.sample_card_pattern = r'\b((?:[0-9][ -]?){12,18}[0-9])\b'
+        self.sample_chunk_rows = 50_000
+        self.sample_row_limit = 1_000_000
+        self.sample_min_match_ratio = 0.01
+        
+        # Config slices each analysis stage depends on
+        self.compliance_config_keys = ('compliance_requirements', 'encryption_at_rest', 'iam_enabled', 'audit_logging')
+        self.vulnerability_config_keys = ('encryption_at_rest', 'encryption_in_transit', 'vpc_enabled', 'iam_enabled')
+        
+        # Stage-level memoization so a config toggle only recomputes the stages it affects
+        self.assessment_cache = MemoCache(maxsize=32)
+        self._classification_cache = MemoCache(maxsize=32)
+        self._compliance_cache = MemoCache(maxsize=64)
+        self._vulnerability_cache = MemoCache(maxsize=16)
     
     def analyze_security(self, migration_context: Dict) -> SecurityAssessment:
-        """Perform comprehensive security analysis"""
+        """Perform comprehensive security analysis, memoized by schema and config slice"""
         try:
-            # Analyze data classification
-            data_classification = self._classify_data(migration_context.get('schema_ddl', ''))
-            
-            # Check compliance requirements
-            compliance_status = self._check_compliance(migration_context, data_classification)
-            
-            # Identify vulnerabilities
-            vulnerabilities = self._identify_vulnerabilities(migration_context)
-            
-            # Generate recommendations
-            recommendations = self._generate_security_recommendations(
-                migration_context, data_classification, vulnerabilities
+            schema_key = self._schema_fingerprint(migration_context)
+            return self.assessment_cache.get_or_compute(
+                self.assessment_key(migration_context, schema_key),
+                lambda: self._run_assessment(migration_context, schema_key)
             )
-            
-            # Calculate overall security score
-            security_score = self._calculate_security_score(compliance_status, vulnerabilities)
-            
-            return SecurityAssessment(
-                overall_score=security_score,
-                vulnerabilities=vulnerabilities,
-                compliance_status=compliance_status,
-                recommendations=recommendations,
-                data_classification=data_classification
-            )
-            
         except Exception as e:
             logger.error(f"Security analysis failed: {e}")
             return self._get_fallback_security_assessment()
     
+    def assessment_key(self, migration_context: Dict, schema_key: Optional[str] = None) -> str:
+        """Key covering every input an assessment depends on"""
+        config_slice = self._config_slice(
+            migration_context, self.compliance_config_keys + self.vulnerability_config_keys
+        )
+        return stable_hash(schema_key or self._schema_fingerprint(migration_context), config_slice)
+    
+    def _run_assessment(self, migration_context: Dict, schema_key: str) -> SecurityAssessment:
+        """Run the assessment stages, reusing cached stage results where inputs are unchanged"""
+        # Analyze data classification (schema and data samples only)
+        data_classification, pii_findings = self._classification_cache.get_or_compute(
+            schema_key, lambda: self._classify_schema_and_samples(migration_context)
+        )
+        data_classification = dict(data_classification)
+        
+        # Check compliance requirements
+        compliance_key = (schema_key, self._config_slice(migration_context, self.compliance_config_keys))
+        compliance_status = dict(self._compliance_cache.get_or_compute(
+            compliance_key, lambda: self._check_compliance(migration_context, data_classification)
+        ))
+        
+        # Identify vulnerabilities
+        vulnerability_key = self._config_slice(migration_context, self.vulnerability_config_keys)
+        vulnerabilities = list(self._vulnerability_cache.get_or_compute(
+            vulnerability_key, lambda: self._identify_vulnerabilities(migration_context)
+        ))
+        
+        # Generate recommendations
+        recommendations = self._generate_security_recommendations(
+            migration_context, data_classification, vulnerabilities
+        )
+        
+        # Calculate overall security score
+        security_score = self._calculate_security_score(compliance_status, vulnerabilities)
+        
+        return SecurityAssessment(
+            overall_score=security_score,
+            vulnerabilities=vulnerabilities,
+            compliance_status=compliance_status,
+            recommendations=recommendations,
+            data_classification=data_classification,
+            pii_findings=dict(pii_findings)
+        )
+    
+    def _classify_schema_and_samples(self, migration_context: Dict) -> Tuple[Dict[str, str], Dict[str, Dict[str, int]]]:
+        """Classify schema tables, refined with value-level PII detection on data samples"""
+        data_classification = self._classify_data(migration_context.get('schema_ddl', ''))
+        
+        pii_findings = {}
+        if migration_context.get('data_samples'):
+            pii_findings = self._scan_data_samples(migration_context['data_samples'])
+            data_classification = self._merge_sample_classification(data_classification, pii_findings)
+        
+        return data_classification, pii_findings
+    
+    def _schema_fingerprint(self, migration_context: Dict) -> str:
+        """Hash of the schema DDL and the identity of any uploaded data samples"""
+        samples = []
+        for table_name, source in sorted((migration_context.get('data_samples') or {}).items()):
+            if isinstance(source, (str, Path)):
+                stat = Path(source).stat()
+                samples.append((table_name, str(source), stat.st_size, stat.st_mtime))
+            else:
+                samples.append((table_name, getattr(source, 'name', ''), getattr(source, 'size', None),
+                                getattr(source, 'file_id', id(source))))
+        
+        return stable_hash(migration_context.get('schema_ddl', ''), samples)
+    
+    def _config_slice(self, migration_context: Dict, keys: Tuple[str, ...]) -> Tuple:
+        """Hashable view of the config keys a stage depends on"""
+        values = []
+        for key in keys:
+            value = migration_context.get(key)
+            values.append((key, tuple(sorted(value)) if isinstance(value, (list, tuple, set)) else value))
+        return tuple(values)
+    
     def _classify_data(self, schema_ddl: str) -> Dict[str, str]:
         """Classify data types for security assessment"""
         classification = {}
@@ -1427,6 +4535,126 @@ class SecurityAnalyzer:
         
         return classification
     
+    def _scan_data_samples(self, data_samples: Dict) -> Dict[str, Dict[str, int]]:
+        """Detect PII values in uploaded table samples, keyed by 'table.column'"""
+        findings = {}
+        
+        for table_name, source in data_samples.items():
+            match_counts = {}
+            non_null_counts = {}
+            
+            try:
+                for chunk in self._read_sample_chunks(source):
+                    for column in chunk.columns:
+                        values = chunk[column].dropna()
+                        if values.empty:
+                            continue
+                        
+                        non_null_counts[column] = non_null_counts.get(column, 0) + len(values)
+                        column_counts = match_counts.setdefault(column, {})
+                        for pii_type, count in self._detect_pii_values(values).items():
+                            column_counts[pii_type] = column_counts.get(pii_type, 0) + count
+            except Exception as e:
+                logger.warning(f"Data sample scan failed for {table_name}: {e}")
+                continue
+            
+            for column, column_counts in match_counts.items():
+                threshold = max(1, non_null_counts[column] * self.sample_min_match_ratio)
+                detected = {pii_type: count for pii_type, count in column_counts.items() if count >= threshold}
+                if detected:
+                    findings[f"{table_name}.{column}"] = detected
+        
+        return findings
+    
+    @staticmethod
+    def parquet_engine() -> Optional[str]:
+        """Installed Parquet reader, preferring pyarrow; None when neither is available"""
+        for module in ('pyarrow', 'fastparquet'):
+            if importlib.util.find_spec(module) is not None:
+                return module
+        return None
+    
+    def _read_sample_chunks(self, source):
+        """Yield bounded-size string DataFrames from a CSV or Parquet sample"""
+        name = str(getattr(source, 'name', source)).lower()
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        
+        rows_read = 0
+        if name.endswith('.parquet'):
+            engine = self.parquet_engine()
+            if engine is None:
+                raise ImportError("Parquet samples need pyarrow or fastparquet; install pyarrow or upload CSV instead")
+            if engine == 'pyarrow':
+                import pyarrow.parquet as pq
+                batches = (batch.to_pandas() for batch in
+                           pq.ParquetFile(source).iter_batches(batch_size=self.sample_chunk_rows))
+            else:
+                # Without pyarrow pandas reads Parquet through fastparquet, one row group at a time here
+                import fastparquet
+                batches = (group.iloc[i:i + self.sample_chunk_rows]
+                           for group in fastparquet.ParquetFile(source).iter_row_groups()
+                           for i in range(0, len(group), self.sample_chunk_rows))
+        else:
+            batches = pd.read_csv(source, dtype=str, chunksize=self.sample_chunk_rows,
+                                  on_bad_lines='skip', encoding_errors='replace')
+        
+        for chunk in batches:
+            if rows_read >= self.sample_row_limit:
+                break
+            chunk = chunk.iloc[:self.sample_row_limit - rows_read]
+            rows_read += len(chunk)
+            yield chunk.astype('string')
+    
+    def _detect_pii_values(self, values: pd.Series) -> Dict[str, int]:
+        """Count PII matches in a string column using vectorized string operations"""
+        counts = {}
+        
+        for pii_type, pattern in self.sample_pii_patterns.items():
+            matched = int(values.str.contains(pattern, regex=True, na=False).sum())
+            if matched:
+                counts[pii_type] = matched
+        
+        candidates = values.str.extract(self.sample_card_pattern, expand=False).dropna()
+        if not candidates.empty:
+            matched = int(self._luhn_valid(candidates).sum())
+            if matched:
+                counts['credit_card'] = matched
+        
+        return counts
+    
+    @staticmethod
+    def _luhn_valid(candidates: pd.Series) -> np.ndarray:
+        """Vectorized Luhn checksum over card-number candidates"""
+        digits = candidates.str.replace(r'[ -]', '', regex=True)
+        in_range = digits.str.len().between(13, 19).to_numpy(dtype=bool)
+        if not in_range.any():
+            return np.zeros(len(digits), dtype=bool)
+        
+        # Left-pad to 19 digits so the doubled positions line up from the right
+        padded = digits[in_range].str.zfill(19)
+        matrix = np.frombuffer(''.join(padded).encode('ascii'), dtype=np.uint8)
+        matrix = matrix.reshape(-1, 19).astype(np.int16) - 48
+        doubled = matrix[:, -2::-2] * 2
+        matrix[:, -2::-2] = doubled - 9 * (doubled > 9)
+        
+        valid = np.zeros(len(digits), dtype=bool)
+        valid[in_range] = matrix.sum(axis=1) % 10 == 0
+        return valid
+    
+    def _merge_sample_classification(self, classification: Dict[str, str],
+                                     pii_findings: Dict[str, Dict[str, int]]) -> Dict[str, str]:
+        """Add column-level PII entries and escalate their tables"""
+        merged = dict(classification)
+        
+        for column_key in pii_findings:
+            table_name = column_key.split('.', 1)[0]
+            merged[column_key] = 'pii'
+            if merged.get(table_name, 'public') == 'public':
+                merged[table_name] = 'pii'
+        
+        return merged
+    
     def _check_compliance(self, context: Dict, data_classification: Dict) -> Dict[str, bool]:
         """Check compliance framework requirements"""
         compliance_status = {}
@@ -1567,23 +4795,21 @@ class SecurityAnalyzer:
             data_classification={'unknown': 'manual_review_required'}
         )
 
+@st.cache_resource
+def get_security_analyzer() -> SecurityAnalyzer:
+    """Process-wide security analyzer so its assessment caches survive reruns"""
+    return SecurityAnalyzer()
+
 class EnterpriseAutoFixEngine:
     """Enterprise-grade auto-fix engine for database migration"""
     
-    def __init__(self):
+    def __init__(self, response_cache: Optional[LLMResponseCache] = None,
+                 llm_client: Optional[AsyncLLMClient] = None, ai_timeout: float = 120.0):
         self.fix_patterns = self._load_fix_patterns()
-        self.ai_client = None
-        self.connected = False
-        
-        try:
-            import anthropic
-            api_key = st.secrets.get("ANTHROPIC_API_KEY")
-            if api_key:
-                self.ai_client = anthropic.Anthropic(api_key=api_key)
-                self.connected = True
-                logger.info("AutoFix AI Engine initialized successfully")
-        except Exception as e:
-            logger.warning(f"AutoFix AI Engine using rule-based mode: {e}")
+        self.ai_timeout = ai_timeout
+        self.ai_client = llm_client or get_llm_client()
+        self.connected = self.ai_client is not None
+        self.response_cache = response_cache
     
     def analyze_and_fix(self, source_engine: str, target_engine: str, 
                        schema_ddl: str, queries: str = "", 
@@ -1595,6 +4821,7 @@ class EnterpriseAutoFixEngine:
             fix_categories = list(FixCategory)
         
         all_fixes = []
+        ai_fixes_from_cache = False
         
         try:
             # Schema fixes
@@ -1625,15 +4852,25 @@ class EnterpriseAutoFixEngine:
             # AI-enhanced fixes if available
             if self.connected and (schema_ddl or queries):
                 try:
-                    # Create new event loop for async operations
-                    import asyncio
-                    if asyncio.get_event_loop().is_running():
-                        # If loop is already running, create a task
-                        ai_fixes = []
-                    else:
-                        ai_fixes = asyncio.run(
-                            self._get_ai_enhanced_fixes(source_engine, target_engine, schema_ddl, queries)
+                    cache_key = None
+                    ai_fixes = None
+                    if self.response_cache is not None:
+                        cache_key = self.response_cache.make_key(
+                            AI_MODEL, '\n'.join([source_engine, target_engine, schema_ddl, queries]), 'auto_fix'
+                        )
+                        cached = self.response_cache.get(cache_key)
+                        if cached is not None:
+                            ai_fixes = [self._fix_from_cache(item) for item in cached]
+                            ai_fixes_from_cache = True
+                    
+                    if ai_fixes is None:
+                        ai_fixes = get_background_loop().run(
+                            self._get_ai_enhanced_fixes(source_engine, target_engine, schema_ddl, queries),
+                            timeout=self.ai_timeout
                         )
+                        if cache_key is not None:
+                            self.response_cache.put(cache_key, AI_MODEL, 'auto_fix',
+                                                    [self._fix_to_cache(fix) for fix in ai_fixes])
                     all_fixes.extend(ai_fixes)
                 except Exception as e:
                     logger.warning(f"AI-enhanced fixes failed: {e}")
@@ -1645,9 +4882,10 @@ class EnterpriseAutoFixEngine:
             
             # Generate comprehensive result
             result = self._generate_fix_result(all_fixes, schema_ddl, queries)
+            result.ai_fixes_from_cache = ai_fixes_from_cache
             
             return result
-            
+        
         except Exception as e:
             logger.error(f"Auto-fix analysis failed: {e}")
             return self._get_fallback_fix_result()
@@ -2146,6 +5384,18 @@ data_retention_until TIMESTAMP""",
         
         return fixes
     
+    @staticmethod
+    def _fix_to_cache(fix: AutoFix) -> Dict:
+        """JSON-safe form of a fix for the response cache"""
+        return {**asdict(fix), 'category': fix.category.value, 'severity': fix.severity.value,
+                'status': fix.status.value}
+    
+    @staticmethod
+    def _fix_from_cache(payload: Dict) -> AutoFix:
+        """Rebuild a fix stored by _fix_to_cache"""
+        return AutoFix(**{**payload, 'category': FixCategory(payload['category']),
+                          'severity': FixSeverity(payload['severity']), 'status': FixStatus(payload['status'])})
+    
     async def _get_ai_enhanced_fixes(self, source_engine: str, target_engine: str, 
                                    schema_ddl: str, queries: str) -> List[AutoFix]:
         """Get AI-enhanced fix recommendations"""
@@ -2204,7 +5454,7 @@ address_id INTEGER REFERENCES addresses(id)""",
                 ))
             
             return fixes
-            
+        
         except Exception as e:
             logger.error(f"AI-enhanced fixes failed: {e}")
             return []
@@ -2367,15 +5617,46 @@ def render_enhanced_sidebar():
         st.write("**Current User:**")
         st.write(f"User ID: {st.session_state.user_id[:8]}...")
         
-        # Project selection
-        db_manager = EnterpriseDBManager()
-        projects = db_manager.get_user_projects(st.session_state.user_id)
+        # Project selection, one keyset page at a time
+        db_manager = get_db_manager()
+        cursors = st.session_state.project_page_cursors
+        projects, next_cursor = db_manager.get_user_projects_page(st.session_state.user_id, after=cursors[-1])
         
         if projects:
-            project_options = {p['name']: p['id'] for p in projects}
-            selected_project = st.selectbox("Select Project", options=list(project_options.keys()), key="sidebar_project_select")
-            if selected_project:
-                st.session_state.current_project = project_options[selected_project]
+            project_names = {p['id']: p['name'] for p in projects}
+            if st.session_state.current_project is None:
+                st.session_state.current_project = projects[0]['id']
+            
+            # Keyed per page, and current_project only follows explicit picks, so paging never switches projects
+            select_key = f"sidebar_project_select_{len(cursors)}"
+            
+            def select_project():
+                if st.session_state[select_key] is not None:
+                    st.session_state.current_project = st.session_state[select_key]
+            
+            current_project = st.session_state.current_project
+            st.selectbox(
+                "Select Project",
+                options=list(project_names.keys()),
+                index=list(project_names).index(current_project) if current_project in project_names else None,
+                format_func=lambda project_id: project_names[project_id],
+                placeholder="Current project is on another page",
+                key=select_key,
+                on_change=select_project
+            )
+            
+            if len(cursors) > 1 or next_cursor is not None:
+                prev_col, page_col, next_col = st.columns([1, 1, 1])
+                with prev_col:
+                    if st.button("◀", key="sidebar_projects_prev", disabled=len(cursors) == 1):
+                        cursors.pop()
+                        st.rerun()
+                with page_col:
+                    st.caption(f"Page {len(cursors)}")
+                with next_col:
+                    if st.button("▶", key="sidebar_projects_next", disabled=next_cursor is None):
+                        cursors.append(next_cursor)
+                        st.rerun()
         
         # Create new project
         if st.button("➕ Create New Project", key="sidebar_create_project"):
@@ -2442,6 +5723,7 @@ def render_enhanced_sidebar():
     
     # Enhanced AWS Configuration
     with st.sidebar.expander("⚙️ AWS Configuration", expanded=True):
+        primary_region = st.selectbox("AWS Region", AWS_PRICING_REGIONS, key="sidebar_primary_region")
         instance_class = st.selectbox(
             "Instance Class",
             ["db.t3.micro", "db.t3.small", "db.t3.medium", "db.t3.large", 
@@ -2524,6 +5806,7 @@ def render_enhanced_sidebar():
         'source_engine': source_engine,
         'source_version': source_version,
         'target_engine': target_engine,
+        'primary_region': primary_region,
         'instance_class': instance_class,
         'storage_gb': storage_gb,
         'storage_type': storage_type,
@@ -2622,6 +5905,44 @@ def render_enterprise_dashboard_tab():
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True, key="migration_projects_by_status")
 
+    # Full-text search over every project's saved schemas, fixes and recommendations
+    search_text = st.text_input(
+        "🔎 Search Projects",
+        placeholder="CONNECT BY, a table name, a fix id...",
+        key="dashboard_search"
+    )
+    if search_text.strip():
+        db_manager = get_db_manager()
+        started = time.perf_counter()
+        hits = db_manager.search_analyses(st.session_state.user_id, search_text)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        st.caption(f"{len(hits)} matches in {elapsed_ms:.1f} ms" + ("" if db_manager.fts_enabled else " (LIKE fallback)"))
+        if hits:
+            st.dataframe(pd.DataFrame([
+                {
+                    'Project': hit['project_name'],
+                    'Kind': hit['kind'].title(),
+                    'Title': hit['title'],
+                    'Match': hit['snippet']
+                }
+                for hit in hits
+            ]), use_container_width=True, hide_index=True)
+    
+    # Saved results of the current project (summary rows only; payloads load in their tabs)
+    if st.session_state.get('current_project'):
+        saved = get_db_manager().get_analysis_summaries(st.session_state.current_project)
+        if saved:
+            st.markdown("**💾 Saved Analyses for Current Project:**")
+            st.dataframe(pd.DataFrame([
+                {
+                    'Analysis': item['analysis_type'].replace('_', ' ').title(),
+                    'Summary': item['summary'].get('headline', ''),
+                    'Confidence': f"{item['confidence_score']:.0%}" if item['confidence_score'] is not None else "—",
+                    'Saved': item['created_at']
+                }
+                for item in saved
+            ]), use_container_width=True, hide_index=True)
+
 def render_examples_tab():
     """Render examples tab with enhanced tutorials"""
     st.subheader("📚 Migration Examples & Tutorials")
@@ -2714,6 +6035,7 @@ def render_schema_input_tab(config: Dict):
     # Get database-specific info
     source_info = get_database_info(config['source_engine'])
     target_info = get_database_info(config['target_engine'].replace('aurora_', '').replace('rds_', '').replace('documentdb', 'mongodb'))
+    project = get_db_manager().get_project(st.session_state.current_project) if st.session_state.get('current_project') else None
     
     # Enhanced migration direction display
     st.markdown(f"""
@@ -2721,7 +6043,7 @@ def render_schema_input_tab(config: Dict):
         <h4>🔄 Enterprise Migration Configuration</h4>
         <p><strong>Source:</strong> {source_info['icon']} {source_info['display_name']} ({config['source_version']})</p>
         <p><strong>Target:</strong> ☁️ AWS {config['target_engine'].replace('_', ' ').title()}</p>
-        <p><strong>Project:</strong> {st.session_state.get('current_project', 'Default Project')[:8] if st.session_state.get('current_project') else 'Default Project'}...</p>
+        <p><strong>Project:</strong> {html.escape(project['name']) if project else 'Default Project'}</p>
         <div style="margin-top: 0.5rem;">
             <span class="feature-badge badge-enterprise">🏢 Enterprise</span>
             {f'<span class="feature-badge badge-ai">🤖 AI Ready</span>' if config.get('enable_ai_analysis') else ''}
@@ -2756,7 +6078,7 @@ def render_schema_input_tab(config: Dict):
                 help=f"Enter your {source_info['schema_term'].lower()} definition here",
                 key="schema_ddl_input"
             )
-            
+        
         elif input_method == "File Upload":
             uploaded_file = st.file_uploader(
                 f"Upload {source_info['display_name']} Schema File",
@@ -2946,15 +6268,20 @@ def render_enhanced_cost_analysis_tab(config: Dict):
     
     st.markdown('<span class="feature-badge badge-new">💰 Real-time AWS Pricing</span>', unsafe_allow_html=True)
     
-    cost_calculator = EnhancedAWSCostCalculator()
+    cost_calculator = get_cost_calculator()
+    cost_calculator.sync_pricing()
     
     if not cost_calculator.connected:
         st.markdown("""
         <div class="warning-banner">
             <h4>⚠️ Using Estimated Pricing</h4>
-            <p>AWS SDK not configured. Using estimated pricing for demonstration purposes.</p>
+            <p>No live AWS pricing snapshot yet. Using bundled list prices; the local snapshot refreshes in the background when AWS is reachable.</p>
         </div>
         """, unsafe_allow_html=True)
+    else:
+        snapshot_time = datetime.fromtimestamp(cost_calculator.pricing_fetched_at).strftime('%Y-%m-%d %H:%M')
+        st.caption(f"💾 AWS pricing snapshot from {snapshot_time} (live: per-engine on-demand instance prices; "
+                   "other rates are bundled list prices)")
     
     # Enhanced cost configuration
     st.markdown("**🎯 Cost Analysis Configuration:**")
@@ -2983,7 +6310,7 @@ def render_enhanced_cost_analysis_tab(config: Dict):
     with col3:
         st.markdown("**🚚 Migration Configuration:**")
         migration_duration = st.number_input("Migration Duration (hours)", min_value=1, max_value=168, value=24, key="cost_migration_duration")
-        dms_instance = st.selectbox("DMS Instance", ["dms.t3.medium", "dms.t3.large", "dms.c5.xlarge"], key="cost_dms_instance")
+        dms_instance = st.selectbox("DMS Instance", list(DMS_INSTANCE_SPECS.keys()), index=2, key="cost_dms_instance")
         
         data_size_estimate = st.number_input("Data Size (GB)", min_value=1, max_value=100000, value=config['storage_gb'], key="cost_data_size")
     
@@ -2998,32 +6325,286 @@ def render_enhanced_cost_analysis_tab(config: Dict):
         
         with col2:
             st.markdown("**🌍 Geographic Distribution:**")
-            primary_region = st.selectbox("Primary Region", ["us-east-1", "us-west-2", "eu-west-1", "ap-southeast-1"], key="cost_primary_region")
+            st.info(f"Region: {config['primary_region']}")
             cross_region_backup = st.checkbox("Cross-Region Backup", True, key="cost_cross_region_backup")
     
-    if st.button("💰 Calculate Comprehensive Cost Analysis", type="primary", key="calculate_cost_analysis"):
-        with st.spinner("🔄 Analyzing costs with real-time AWS pricing..."):
-            
-            # Enhanced config for cost calculation
-            enhanced_config = {
-                **config,
-                'migration_duration_hours': migration_duration,
-                'dms_instance': dms_instance,
-                'data_size_gb': data_size_estimate,
-                'reserved_instance': reserved_instance,
-                'cpu_utilization': cpu_utilization,
-                'connection_count': connection_count,
-                'primary_region': primary_region,
-                'cross_region_backup': cross_region_backup
-            }
-            
-            # Calculate comprehensive cost estimate
-            cost_estimate = cost_calculator.estimate_total_migration_cost(enhanced_config)
-            
-            # Store in session state
-            st.session_state.cost_estimates[config['target_engine']] = cost_estimate
-            
-            # Display results
+    # AWS Price List bulk import
+    with st.expander("📦 AWS Price List Import", expanded=False):
+        price_index = cost_calculator.price_index
+        index_metadata = price_index.get_metadata() if price_index else {}
+        if index_metadata:
+            st.info(f"Indexed price list version {index_metadata.get('version', 'unknown')} "
+                    f"(published {index_metadata.get('publicationDate', 'unknown')}, imported {index_metadata.get('imported_at', '')[:16]})")
+        else:
+            st.caption("No price list imported. Download the AmazonRDS offer file (index.json) from the AWS Price List Bulk API.")
+        
+        offer_file_path = st.text_input("Local path to AmazonRDS offer file", "", key="cost_offer_file_path")
+        run_import = st.button("📥 Import Price List", key="cost_import_price_list",
+                               disabled=not offer_file_path or price_index is None)
+        
+        # Offer files run to hundreds of MB, so the import runs as a background job
+        def run_import_job(report, offer_path: str) -> Dict[str, int]:
+            return price_index.import_offer_file(
+                offer_path, progress_callback=lambda fraction: report(min(fraction, 1.0), "📥 Importing price list...")
+            )
+        
+        if offer_file_path and price_index is not None:
+            counts = follow_job(
+                'price_import', stable_hash(str(Path(offer_file_path).resolve())),
+                run_import_job if run_import else None, offer_file_path,
+                label="📥 Importing price list..."
+            )
+            if counts is not None:
+                st.success(f"✅ Indexed {counts['instance_prices']:,} instance prices and {counts['storage_prices']:,} storage prices")
+    
+    # DMS migration window
+    with st.expander("⏱️ DMS Migration Window Estimator", expanded=False):
+        st.caption("List the largest tables (or one row for the whole database) to estimate full load, CDC catch-up and cutover.")
+        table_sizes = st.data_editor(
+            pd.DataFrame({'table': ['all_tables'], 'rows': [int(data_size_estimate * 1_000_000)],
+                          'size_gb': [float(data_size_estimate)], 'lob_mode': ['none']}),
+            column_config={
+                'rows': st.column_config.NumberColumn("Rows", min_value=0, step=1),
+                'size_gb': st.column_config.NumberColumn("Size (GB)", min_value=0.0),
+                'lob_mode': st.column_config.SelectboxColumn("LOB Mode", options=list(DMSWindowEstimator.LOB_FACTORS))
+            },
+            num_rows="dynamic", use_container_width=True, key="cost_dms_tables"
+        )
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            load_threads = st.slider("Parallel Load Threads", 1, 49, 8, key="cost_dms_threads")
+        with col2:
+            network_mbps = st.number_input("Network Bandwidth (Mbps)", min_value=10, max_value=100000, value=1000, key="cost_dms_network")
+        with col3:
+            change_rate = st.number_input("Change Rate (GB/hour)", min_value=0.0, max_value=1000.0, value=1.0, key="cost_dms_change_rate")
+        use_cdc = st.checkbox("Ongoing replication (CDC) until cutover", True, key="cost_dms_use_cdc")
+        
+        window = DMSWindowEstimator(cost_calculator).estimate(
+            table_sizes, {**config, 'dms_instance': dms_instance}, parallel_threads=load_threads,
+            network_mbps=network_mbps, change_rate_gb_per_hour=change_rate, use_cdc=use_cdc
+        )
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("📦 Full Load", f"{window.full_load_hours:.1f} h", delta=f"{window.effective_mbps:.0f} MB/s, {window.bottleneck}-bound", delta_color="off")
+        with col2:
+            st.metric("🔄 CDC Catch-up", f"{window.cdc_catchup_hours:.1f} h" if window.cdc_keeps_up else "Never")
+        with col3:
+            st.metric("⏱️ Migration Window", f"{window.total_hours:.1f} h" if window.cdc_keeps_up else "Unbounded")
+        with col4:
+            st.metric("💵 DMS Cost", f"${window.dms_cost:,.2f}")
+        
+        if not window.cdc_keeps_up:
+            st.error(f"❌ {dms_instance} cannot apply {change_rate:.1f} GB/hour of changes; choose a larger DMS instance")
+        elif DMSWindowEstimator.exceeds_tolerance(window, config['downtime_tolerance']):
+            st.warning(f"⚠️ Expected downtime of {window.downtime_hours:.1f} hours exceeds the '{config['downtime_tolerance']}' tolerance; "
+                       "enable CDC, add load threads or use a larger DMS instance")
+        
+        if len(window.schedule) > 1:
+            fig = px.bar(window.schedule, x=window.schedule['end_hours'] - window.schedule['start_hours'], y='thread',
+                         base='start_hours', color='table', orientation='h', labels={'x': 'Hours', 'thread': 'Load Thread'},
+                         title='Full Load Schedule')
+            fig.update_layout(height=350, showlegend=False)
+            st.plotly_chart(fig, use_container_width=True, key="cost_dms_schedule")
+        
+        use_estimated_window = st.checkbox("Use estimated window as migration duration", window.cdc_keeps_up,
+                                           key="cost_dms_use_window", disabled=not window.cdc_keeps_up)
+        if use_estimated_window and window.cdc_keeps_up:
+            migration_duration = max(1, int(np.ceil(window.total_hours)))
+            st.caption(f"Cost analysis will use a {migration_duration}-hour migration duration")
+    
+    # Right-sizing from observed metrics
+    with st.expander("📈 Right-Size from CloudWatch Metrics", expanded=False):
+        st.caption("Upload CloudWatch or Performance Insights CSV exports (CPUUtilization, FreeableMemory, "
+                   "Read/WriteIOPS, Network throughput), captured on the current instance class selected in the sidebar.")
+        metric_files = st.file_uploader("Metric exports", type=['csv'], accept_multiple_files=True, key="cost_metric_files")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            sizing_percentile = st.selectbox("Size for percentile", [95, 99, 100], key="cost_sizing_percentile")
+        with col2:
+            sizing_headroom = st.slider("Headroom (%)", 0, 100, 30, key="cost_sizing_headroom")
+        
+        if st.button("📈 Recommend Instance", key="cost_recommend_instance", disabled=not metric_files):
+            with st.spinner("Processing metric exports..."):
+                try:
+                    st.session_state.rightsizing_recommendation = RightSizingEngine(cost_calculator).recommend(
+                        metric_files, config, headroom=sizing_headroom / 100, percentile=sizing_percentile
+                    )
+                except Exception as e:
+                    st.error(f"Right-sizing failed: {e}")
+        
+        recommendation = st.session_state.rightsizing_recommendation
+        if recommendation:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("💻 Recommended Instance", recommendation.instance_class,
+                          delta=None if recommendation.instance_class == config['instance_class'] else f"from {config['instance_class']}")
+            with col2:
+                st.metric("💾 Recommended Storage", recommendation.storage_type)
+            with col3:
+                st.metric("📊 Samples Processed", f"{recommendation.samples_processed:,}")
+            
+            st.dataframe(pd.DataFrame(recommendation.metric_summary).T.round(2), use_container_width=True)
+            for reason in recommendation.rationale:
+                st.markdown(f"• {reason}")
+        
+        apply_rightsizing = st.checkbox("Use recommendation for cost analysis", bool(recommendation),
+                                        key="cost_apply_rightsizing", disabled=not recommendation)
+    
+    # Storage performance planning
+    with st.expander("⚡ Storage Performance Planner", expanded=False):
+        observed = recommendation.requirements if recommendation else {}
+        # Observed peaks can exceed what any volume offers; Streamlit rejects defaults outside the input range
+        default_iops = min(max(int(observed.get('iops', 3000)), 0), 256000)
+        default_mibps = min(max(int(observed.get('throughput_mibps', 125)), 0), 4000)
+        col1, col2 = st.columns(2)
+        with col1:
+            required_iops = st.number_input("Required IOPS", min_value=0, max_value=256000,
+                                            value=default_iops, key="cost_required_iops")
+        with col2:
+            required_mibps = st.number_input("Required Throughput (MiB/s)", min_value=0, max_value=4000,
+                                             value=default_mibps, key="cost_required_mibps")
+        if observed:
+            st.caption("Defaults come from the right-sizing metrics")
+        
+        storage_plan = cost_calculator.plan_storage({
+            **config,
+            'required_iops': required_iops, 'required_throughput_mibps': required_mibps
+        })
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("💾 Cheapest Volume", storage_plan.storage_type, delta=f"{storage_plan.allocated_gb:,} GB", delta_color="off")
+        with col2:
+            st.metric("📦 Capacity", f"${storage_plan.cost_split['capacity']:,.2f}")
+        with col3:
+            st.metric("⚡ Provisioned IOPS", f"${storage_plan.cost_split['iops']:,.2f}", delta=f"{storage_plan.provisioned_iops:,} IOPS", delta_color="off")
+        with col4:
+            st.metric("🚀 Throughput", f"${storage_plan.cost_split['throughput']:,.2f}", delta=f"{storage_plan.provisioned_mibps:,} MiB/s", delta_color="off")
+        
+        split = storage_plan.options.melt(id_vars=['storage_type', 'meets_requirement'],
+                                          value_vars=['capacity_cost', 'iops_cost', 'throughput_cost'],
+                                          var_name='component', value_name='component_cost')
+        split['storage_type'] = np.where(split['meets_requirement'], split['storage_type'], split['storage_type'] + " (insufficient)")
+        fig = px.bar(split, x='storage_type', y='component_cost', color='component',
+                     labels={'storage_type': 'Volume Type', 'component_cost': 'Monthly Cost ($)', 'component': 'Component'},
+                     title='Storage Cost Split by Volume Type')
+        fig.update_layout(height=350)
+        st.plotly_chart(fig, use_container_width=True, key="cost_storage_split")
+        
+        use_storage_plan = st.checkbox("Use planned storage for cost analysis", False, key="cost_use_storage_plan")
+    
+    # Aurora cluster storage configuration
+    aurora_config = {}
+    with st.expander("🌟 Aurora Standard vs I/O-Optimized", expanded='aurora' in config['target_engine']):
+        if 'aurora' not in config['target_engine']:
+            st.caption("Target is not Aurora; showing the comparison for Aurora PostgreSQL.")
+        
+        io_sources = ["Query volume", "Monthly I/O requests"]
+        read_write = [recommendation.metric_summary[m]['mean'] for m in ('read_iops', 'write_iops')
+                      if recommendation and m in recommendation.metric_summary]
+        if read_write:
+            io_sources.insert(0, "Right-sizing metrics")
+        io_source = st.radio("Estimate I/O from", io_sources, horizontal=True, key="cost_aurora_io_source")
+        
+        if io_source == "Right-sizing metrics":
+            aurora_config['observed_iops'] = sum(read_write)
+            st.caption(f"Average observed read + write IOPS: {aurora_config['observed_iops']:,.0f}")
+        elif io_source == "Query volume":
+            col1, col2 = st.columns(2)
+            with col1:
+                aurora_config['queries_per_second'] = st.number_input("Queries per Second", min_value=0, max_value=1_000_000,
+                                                                      value=500, key="cost_aurora_qps")
+            with col2:
+                aurora_config['ios_per_query'] = st.number_input("I/Os per Query (after cache)", min_value=0.0, max_value=1000.0,
+                                                                 value=2.0, key="cost_aurora_ios_per_query")
+        else:
+            aurora_config['monthly_io_requests'] = st.number_input("Monthly I/O Requests (millions)", min_value=0.0,
+                                                                   value=1000.0, key="cost_aurora_monthly_io") * 1e6
+        
+        aurora = cost_calculator.compare_aurora_storage({**config, **aurora_config})
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("📊 Monthly I/O", f"{aurora.monthly_io_requests / 1e6:,.0f}M")
+        with col2:
+            st.metric("💾 Aurora Standard", f"${aurora.standard_monthly:,.2f}", delta=f"I/O {aurora.io_share:.0%} of bill", delta_color="off")
+        with col3:
+            st.metric("⚡ I/O-Optimized", f"${aurora.io_optimized_monthly:,.2f}")
+        with col4:
+            st.metric("⚖️ Crossover", f"{aurora.crossover_io_requests / 1e6:,.0f}M I/O")
+        
+        recommended_label = "I/O-Optimized" if aurora.recommended == 'io_optimized' else "Standard"
+        st.success(f"✅ Aurora {recommended_label} is cheaper by "
+                   f"${abs(aurora.standard_monthly - aurora.io_optimized_monthly):,.2f}/month at this I/O volume")
+        
+        fig = px.line(aurora.curve, x='monthly_io_requests', y=['Aurora Standard', 'Aurora I/O-Optimized'],
+                      labels={'monthly_io_requests': 'Monthly I/O Requests', 'value': 'Monthly Cost ($)', 'variable': 'Configuration'},
+                      title='Aurora Cluster Cost vs I/O Volume')
+        fig.add_vline(x=aurora.monthly_io_requests, line_dash="dash", annotation_text="Estimated")
+        fig.update_layout(height=350)
+        st.plotly_chart(fig, use_container_width=True, key="cost_aurora_crossover")
+        
+        storage_choice = st.radio("Cluster storage for cost analysis", ["Recommended", "Standard", "I/O-Optimized"],
+                                  horizontal=True, key="cost_aurora_storage_choice")
+        aurora_config['aurora_storage_config'] = {
+            "Recommended": aurora.recommended, "Standard": 'standard', "I/O-Optimized": 'io_optimized'
+        }[storage_choice]
+    
+    run_simulation = st.checkbox("🎲 Include Monte Carlo uncertainty (100k trials)", True, key="cost_run_simulation")
+    simulation_config = {}
+    if run_simulation:
+        default_down, _, default_up = EnhancedAWSCostCalculator.SIZING_PROBABILITIES
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            size_down_pct = st.number_input("Odds of one size down (%)", min_value=0, max_value=100,
+                                            value=int(default_down * 100), key="cost_sim_size_down")
+        with col2:
+            size_up_pct = st.number_input("Odds of one size up (%)", min_value=0, max_value=100 - size_down_pct,
+                                          value=min(int(default_up * 100), 100 - size_down_pct), key="cost_sim_size_up")
+        with col3:
+            growth_sigma = st.number_input("Data growth spread (lognormal σ)", min_value=0.0, max_value=1.0,
+                                           value=EnhancedAWSCostCalculator.GROWTH_SIGMA, step=0.05, key="cost_sim_growth_sigma")
+        simulation_config = {
+            'sizing_probabilities': (size_down_pct / 100, 1 - (size_down_pct + size_up_pct) / 100, size_up_pct / 100),
+            'growth_sigma': growth_sigma
+        }
+        st.caption(f"The sized class holds {100 - size_down_pct - size_up_pct}% of the time; "
+                   f"σ {growth_sigma:.2f} puts P90 data growth at {np.exp(1.2816 * growth_sigma):.2f}x the median")
+    
+    if st.button("💰 Calculate Comprehensive Cost Analysis", type="primary", key="calculate_cost_analysis"):
+        with st.spinner("🔄 Analyzing costs with real-time AWS pricing..."):
+            
+            # Enhanced config for cost calculation
+            enhanced_config = {
+                **config,
+                'migration_duration_hours': migration_duration,
+                'dms_instance': dms_instance,
+                'data_size_gb': data_size_estimate,
+                'reserved_instance': reserved_instance,
+                'cpu_utilization': cpu_utilization,
+                'connection_count': connection_count,
+                'cross_region_backup': cross_region_backup,
+                **aurora_config
+            }
+            if apply_rightsizing and st.session_state.rightsizing_recommendation:
+                enhanced_config['instance_class'] = st.session_state.rightsizing_recommendation.instance_class
+                enhanced_config['storage_type'] = st.session_state.rightsizing_recommendation.storage_type
+                enhanced_config['required_iops'] = st.session_state.rightsizing_recommendation.requirements.get('iops', 0)
+                enhanced_config['required_throughput_mibps'] = st.session_state.rightsizing_recommendation.requirements.get('throughput_mibps', 0)
+            if use_storage_plan:
+                enhanced_config.update({'storage_type': storage_plan.storage_type, 'required_iops': required_iops,
+                                        'required_throughput_mibps': required_mibps})
+            
+            # Calculate comprehensive cost estimate
+            cost_estimate = cost_calculator.estimate_total_migration_cost(enhanced_config)
+            
+            # Store in session state
+            st.session_state.cost_estimates[config['target_engine']] = cost_estimate
+            
+            # Display results
             st.markdown("**💰 Comprehensive Cost Analysis Results:**")
             
             # Key metrics
@@ -3147,6 +6728,162 @@ def render_enhanced_cost_analysis_tab(config: Dict):
                     f"{three_year_roi:.0f}%",
                     delta="Return on Investment"
                 )
+            
+            # Cost uncertainty
+            if run_simulation:
+                simulation = cost_calculator.simulate_migration_cost({**enhanced_config, **simulation_config})
+                
+                st.markdown("**🎲 Cost Uncertainty (Monte Carlo):**")
+                st.caption(f"{simulation.trials:,} trials sampling data growth, transfer volume, migration duration "
+                           f"and right-sizing outcome in {simulation.elapsed_ms:.0f} ms · confidence {simulation.confidence_score:.0%}")
+                
+                percentile_table = pd.DataFrame(simulation.percentiles).T.rename(
+                    index={'monthly': 'Monthly', 'annual': 'Annual', 'one_time': 'One-time'},
+                    columns={'p50': 'P50', 'p90': 'P90', 'p99': 'P99'}
+                )
+                st.dataframe(percentile_table.style.format("${:,.2f}"), use_container_width=True)
+                
+                col1, col2 = st.columns(2)
+                for column, (name, title) in zip((col1, col2), (('monthly', 'Monthly Cost Distribution'),
+                                                                 ('one_time', 'One-time Cost Distribution'))):
+                    # Bin up front; plotting 100k raw points would dominate the render time
+                    counts, edges = np.histogram(simulation.samples[name], bins=60)
+                    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+                    for label, value in simulation.percentiles[name].items():
+                        fig.add_vline(x=value, line_dash="dash", annotation_text=label.upper())
+                    fig.update_layout(title=title, xaxis_title="USD", yaxis_title="Trials", height=350)
+                    with column:
+                        st.plotly_chart(fig, use_container_width=True, key=f"cost_simulation_{name}")
+
+    # Scenario sweep across the full configuration grid
+    st.markdown("---")
+    st.markdown("**🧮 Configuration Scenario Sweep:**")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        sweep_instances = st.multiselect("Instance Classes", list(RDS_INSTANCE_SPECS.keys()),
+                                         default=list(RDS_INSTANCE_SPECS.keys()), key="cost_sweep_instances")
+        sweep_storage_types = st.multiselect("Storage Types", ["gp2", "gp3", "io1", "io2"],
+                                             default=["gp2", "gp3", "io1", "io2"], key="cost_sweep_storage_types")
+
+    with col2:
+        sweep_regions = st.multiselect("Regions", AWS_PRICING_REGIONS, default=AWS_PRICING_REGIONS, key="cost_sweep_regions")
+        sweep_backups = st.multiselect("Backup Retention (days)", [1, 7, 14, 30, 35],
+                                       default=[1, 7, 14, 30, 35], key="cost_sweep_backups")
+
+    with col3:
+        sweep_multi_az = st.multiselect("Deployment", ["Single-AZ", "Multi-AZ"],
+                                        default=["Single-AZ", "Multi-AZ"], key="cost_sweep_multi_az")
+        capacity_label = st.selectbox("Capacity Metric", ["vCPU", "Memory (GiB)", "Network (Gbps)"], key="cost_sweep_capacity")
+
+    run_sweep = st.button("🧮 Run Scenario Sweep", key="cost_run_sweep",
+                          disabled=not (sweep_instances and sweep_storage_types and sweep_regions and sweep_backups and sweep_multi_az))
+    capacity_metric = {"vCPU": 'vcpu', "Memory (GiB)": 'memory_gib', "Network (Gbps)": 'network_gbps'}[capacity_label]
+    sweep_args = (sweep_instances, sweep_storage_types, [option == "Multi-AZ" for option in sweep_multi_az],
+                  sweep_backups, sweep_regions, capacity_metric)
+    
+    def run_sweep_job(report, *args):
+        start_time = time.perf_counter()
+        scenarios = cost_calculator.sweep_scenarios(config, *args[:5], capacity_metric=args[5])
+        return scenarios, (time.perf_counter() - start_time) * 1000
+    
+    sweep = follow_job(
+        'cost_sweep', cost_calculator.cache_key('sweep', config, *sweep_args),
+        run_sweep_job if run_sweep else None, *sweep_args, label="🧮 Sweeping configuration scenarios..."
+    )
+    
+    if sweep is not None:
+        scenarios, elapsed_ms = sweep
+        frontier = scenarios[scenarios['pareto_optimal']].sort_values(['multi_az', 'monthly_cost'])
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("🧮 Scenarios Evaluated", f"{len(scenarios):,}", delta=f"{elapsed_ms:.1f} ms")
+        with col2:
+            st.metric("⭐ Pareto-Optimal", f"{len(frontier):,}")
+        with col3:
+            st.metric("💰 Cheapest Monthly", f"${scenarios['monthly_cost'].min():.2f}")
+
+        plot_data = scenarios.assign(
+            deployment=np.where(scenarios['multi_az'], "Multi-AZ", "Single-AZ"),
+            frontier=np.where(scenarios['pareto_optimal'], "Pareto-optimal", "Dominated")
+        )
+        fig = px.scatter(plot_data, x='monthly_cost', y='capacity', color='frontier', symbol='deployment',
+                         hover_data=['instance_class', 'storage_type', 'backup_retention_days', 'region'],
+                         labels={'monthly_cost': 'Monthly Cost ($)', 'capacity': capacity_label},
+                         title='Monthly Cost vs Capacity')
+        for deployment, group in plot_data[plot_data['pareto_optimal']].groupby('deployment'):
+            group = group.sort_values('monthly_cost')
+            fig.add_trace(go.Scatter(x=group['monthly_cost'], y=group['capacity'], mode='lines',
+                                     line=dict(shape='hv', dash='dot'), name=f"{deployment} frontier"))
+        fig.update_layout(height=500)
+        st.plotly_chart(fig, use_container_width=True, key="cost_sweep_scatter")
+
+        st.dataframe(
+            frontier[['instance_class', 'storage_type', 'multi_az', 'backup_retention_days', 'region',
+                      'capacity', 'instance_cost', 'storage_cost', 'backup_cost', 'monthly_cost']].round(2),
+            use_container_width=True, hide_index=True
+        )
+
+    # Multi-year TCO and reserved instance break-even
+    st.markdown("---")
+    st.markdown("**📆 Multi-Year TCO & Reserved Instance Break-Even:**")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        tco_years = st.slider("Projection (years)", 1, 5, 3, key="cost_tco_years")
+    with col2:
+        storage_growth = st.slider("Annual Storage Growth (%)", 0, 100, 20, key="cost_tco_storage_growth")
+    with col3:
+        tco_candidates = st.multiselect("Compare Instance Classes",
+                                        [c for c in RDS_INSTANCE_SPECS if c != config['instance_class']],
+                                        key="cost_tco_candidates")
+    
+    tco = cost_calculator.project_tco(config, years=tco_years,
+                                      storage_growth_pct=storage_growth,
+                                      instance_classes=[config['instance_class']] + tco_candidates)
+    
+    fig = px.line(tco.cumulative, x='month', y=[c for c in tco.cumulative.columns if c != 'month'],
+                  labels={'month': 'Month', 'value': 'Cumulative Cost ($)', 'variable': 'Pricing Option'},
+                  title=f"Cumulative Cost for {config['instance_class']}")
+    fig.update_layout(height=450)
+    st.plotly_chart(fig, use_container_width=True, key="cost_tco_cumulative")
+    
+    tco_table = tco.summary.rename(columns={
+        'instance_class': 'Instance', 'pricing_option': 'Pricing Option', 'upfront': 'Upfront',
+        'instance_monthly': 'Instance Monthly', 'break_even_month': 'Break-Even Month',
+        'savings_vs_on_demand': f'{tco_years}yr Savings',
+        **{f'tco_{year}yr': f'{year}yr TCO' for year in range(1, tco_years + 1)}
+    })
+    st.dataframe(tco_table.round(2), use_container_width=True, hide_index=True)
+    
+    # Cross-region comparison
+    st.markdown("---")
+    st.markdown("**🌍 Cross-Region Cost Comparison:**")
+    
+    comparison_regions = st.multiselect("Regions", AWS_PRICING_REGIONS, default=AWS_PRICING_REGIONS, key="cost_compare_regions")
+    if comparison_regions:
+        region_costs = cost_calculator.compare_regions(config, comparison_regions)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            fig = px.bar(region_costs, x='region', y=['rds_instance', 'storage', 'backup', 'aurora_io'],
+                         labels={'region': 'Region', 'value': 'Monthly Cost ($)', 'variable': 'Component'},
+                         title='Monthly Cost by Region')
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, use_container_width=True, key="cost_region_monthly")
+        with col2:
+            fig = px.bar(region_costs, x='region', y=['dms', 'data_transfer'],
+                         labels={'region': 'Region', 'value': 'One-time Cost ($)', 'variable': 'Component'},
+                         title='One-time Migration Cost by Region')
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, use_container_width=True, key="cost_region_one_time")
+        
+        st.dataframe(region_costs.round(2), use_container_width=True, hide_index=True)
+    
+    cache_stats = cost_calculator.estimate_cache.stats()
+    st.caption(f"♻️ Cost cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
 
 def render_enhanced_security_tab(config: Dict, schema_ddl: str):
     """Render enhanced security analysis"""
@@ -3207,158 +6944,206 @@ def render_enhanced_security_tab(config: Dict, schema_ddl: str):
         else:
             st.warning("⚠️ No Compliance Requirements")
     
-    if st.button("🔍 Run Comprehensive Security Analysis", type="primary", key="run_security_analysis"):
-        with st.spinner("🔒 Analyzing security posture and compliance..."):
-            
-            # Create migration context for security analysis
-            migration_context = {
-                'source_engine': config['source_engine'],
-                'target_engine': config['target_engine'],
-                'schema_ddl': schema_ddl,
-                'encryption_at_rest': config.get('encryption_at_rest', False),
-                'encryption_in_transit': config.get('encryption_in_transit', False),
-                'iam_enabled': config.get('iam_auth', False),
-                'vpc_enabled': True,  # Assume VPC for AWS
-                'audit_logging': True,  # AWS default
-                'compliance_requirements': config.get('compliance_requirements', []),
-                'business_critical': config.get('business_critical', False)
-            }
-            
-            # Run security analysis
-            security_analyzer = SecurityAnalyzer()
-            security_assessment = security_analyzer.analyze_security(migration_context)
-            
-            # Store results
-            st.session_state.security_assessment = security_assessment
-            
-            # Display results
-            st.markdown("**🔒 Security Analysis Results:**")
-            
-            # Overall security score
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                score_color = "success" if security_assessment.overall_score >= 80 else "warning" if security_assessment.overall_score >= 60 else "error"
-                if score_color == "success":
-                    st.success(f"🔒 Security Score: {security_assessment.overall_score:.0f}/100")
-                elif score_color == "warning":
-                    st.warning(f"🔒 Security Score: {security_assessment.overall_score:.0f}/100")
-                else:
-                    st.error(f"🔒 Security Score: {security_assessment.overall_score:.0f}/100")
-            
-            with col2:
-                vuln_count = len(security_assessment.vulnerabilities)
-                high_vuln = sum(1 for v in security_assessment.vulnerabilities if v['severity'] == 'high')
-                if high_vuln > 0:
-                    st.error(f"🚨 {vuln_count} Vulnerabilities ({high_vuln} High)")
-                elif vuln_count > 0:
-                    st.warning(f"⚠️ {vuln_count} Vulnerabilities")
-                else:
-                    st.success("✅ No Critical Vulnerabilities")
-            
-            with col3:
-                compliance_passed = sum(1 for passed in security_assessment.compliance_status.values() if passed)
-                compliance_total = len(security_assessment.compliance_status)
-                if compliance_passed == compliance_total:
-                    st.success(f"✅ {compliance_passed}/{compliance_total} Compliance")
-                else:
-                    st.error(f"❌ {compliance_passed}/{compliance_total} Compliance")
-            
-            with col4:
-                pii_tables = sum(1 for classification in security_assessment.data_classification.values() if classification == 'pii')
-                if pii_tables > 0:
-                    st.warning(f"🔐 {pii_tables} PII Tables Detected")
-                else:
-                    st.success("✅ No PII Detected")
+    # Optional data samples for value-level PII detection
+    uploaded_samples = st.file_uploader(
+        "📂 Data Samples for PII Detection (CSV or Parquet, one file per table)",
+        type=['csv', 'parquet'],
+        accept_multiple_files=True,
+        help="File names are matched to table names, e.g. users.csv → users",
+        key="security_data_samples"
+    )
+    if any(f.name.lower().endswith('.parquet') for f in uploaded_samples or []) and not SecurityAnalyzer.parquet_engine():
+        st.warning("⚠️ Parquet samples need pyarrow (pip install pyarrow) and will be skipped; upload CSV instead")
+    
+    run_security = st.button("🔍 Run Comprehensive Security Analysis", type="primary", key="run_security_analysis")
+    
+    # Create migration context for security analysis
+    migration_context = {
+        'source_engine': config['source_engine'],
+        'target_engine': config['target_engine'],
+        'schema_ddl': schema_ddl,
+        'encryption_at_rest': config.get('encryption_at_rest', False),
+        'encryption_in_transit': config.get('encryption_in_transit', False),
+        'iam_enabled': config.get('iam_auth', False),
+        'vpc_enabled': True,  # Assume VPC for AWS
+        'audit_logging': True,  # AWS default
+        'compliance_requirements': config.get('compliance_requirements', []),
+        'business_critical': config.get('business_critical', False),
+        'data_samples': {Path(f.name).stem: f for f in uploaded_samples or []}
+    }
+    
+    # Run security analysis as a background job (memoized across reruns)
+    security_analyzer = get_security_analyzer()
+    db_manager = get_db_manager()
+    project_id = st.session_state.get('current_project')
+    job_key = security_analyzer.assessment_key(migration_context)
+    
+    def run_security_job(report, context: Dict) -> SecurityAssessment:
+        assessment = security_analyzer.analyze_security(context)
+        if project_id:
+            db_manager.save_analysis_result(project_id, 'security_analysis', assessment, {
+                'job_key': job_key,
+                'headline': f"score {assessment.overall_score:.0f}/100, {len(assessment.vulnerabilities)} vulnerabilities",
+                'overall_score': assessment.overall_score,
+                'vulnerabilities': len(assessment.vulnerabilities),
+                'compliant': sum(assessment.compliance_status.values())
+            }, confidence_score=assessment.overall_score / 100,
+                search_documents=[('recommendation', "Security", rec) for rec in assessment.recommendations])
+        return assessment
+    
+    security_assessment = follow_job(
+        'security_analysis', job_key,
+        run_security_job if run_security else None,
+        migration_context, label="🔒 Analyzing security posture and compliance..."
+    )
+    if security_assessment is None:
+        security_assessment = load_saved_result('security_analysis', job_key, "security analysis")
+    
+    if security_assessment is not None:
+        cache_stats = security_analyzer.assessment_cache.stats()
+        st.caption(f"♻️ Assessment cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+        
+        # Display results
+        st.markdown("**🔒 Security Analysis Results:**")
+        
+        # Overall security score
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            score_color = "success" if security_assessment.overall_score >= 80 else "warning" if security_assessment.overall_score >= 60 else "error"
+            if score_color == "success":
+                st.success(f"🔒 Security Score: {security_assessment.overall_score:.0f}/100")
+            elif score_color == "warning":
+                st.warning(f"🔒 Security Score: {security_assessment.overall_score:.0f}/100")
+            else:
+                st.error(f"🔒 Security Score: {security_assessment.overall_score:.0f}/100")
+        
+        with col2:
+            vuln_count = len(security_assessment.vulnerabilities)
+            high_vuln = sum(1 for v in security_assessment.vulnerabilities if v['severity'] == 'high')
+            if high_vuln > 0:
+                st.error(f"🚨 {vuln_count} Vulnerabilities ({high_vuln} High)")
+            elif vuln_count > 0:
+                st.warning(f"⚠️ {vuln_count} Vulnerabilities")
+            else:
+                st.success("✅ No Critical Vulnerabilities")
+        
+        with col3:
+            compliance_passed = sum(1 for passed in security_assessment.compliance_status.values() if passed)
+            compliance_total = len(security_assessment.compliance_status)
+            if compliance_passed == compliance_total:
+                st.success(f"✅ {compliance_passed}/{compliance_total} Compliance")
+            else:
+                st.error(f"❌ {compliance_passed}/{compliance_total} Compliance")
+        
+        with col4:
+            pii_tables = sum(1 for name, classification in security_assessment.data_classification.items()
+                             if classification == 'pii' and '.' not in name)
+            pii_columns = len(security_assessment.pii_findings)
+            if pii_tables > 0:
+                st.warning(f"🔐 {pii_tables} PII Tables Detected" + (f" ({pii_columns} columns)" if pii_columns else ""))
+            else:
+                st.success("✅ No PII Detected")
+        
+        # Vulnerability details
+        if security_assessment.vulnerabilities:
+            st.markdown("**🚨 Security Vulnerabilities:**")
             
-            # Vulnerability details
-            if security_assessment.vulnerabilities:
-                st.markdown("**🚨 Security Vulnerabilities:**")
+            for i, vuln in enumerate(security_assessment.vulnerabilities):
+                severity_color = {'high': 'error', 'medium': 'warning', 'low': 'info'}
                 
-                for i, vuln in enumerate(security_assessment.vulnerabilities):
-                    severity_color = {'high': 'error', 'medium': 'warning', 'low': 'info'}
+                with st.expander(f"{vuln['severity'].upper()}: {vuln['description']}", expanded=vuln['severity'] == 'high'):
+                    col1, col2 = st.columns(2)
                     
-                    with st.expander(f"{vuln['severity'].upper()}: {vuln['description']}", expanded=vuln['severity'] == 'high'):
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.markdown(f"**Type:** {vuln['type']}")
-                            st.markdown(f"**Severity:** {vuln['severity']}")
-                        
-                        with col2:
-                            st.markdown(f"**Recommendation:** {vuln['recommendation']}")
-            
-            # Compliance status
-            st.markdown("**📋 Compliance Status:**")
-            
-            compliance_data = []
-            for framework, status in security_assessment.compliance_status.items():
-                compliance_data.append({
-                    'Framework': framework,
-                    'Status': 'Compliant' if status else 'Non-Compliant',
-                    'Color': '#22c55e' if status else '#ef4444'
-                })
-            
-            if compliance_data:
-                df = pd.DataFrame(compliance_data)
-                fig = px.bar(df, x='Framework', y=['Status'], 
-                           color='Status', color_discrete_map={'Compliant': '#22c55e', 'Non-Compliant': '#ef4444'},
-                           title='Compliance Framework Status')
-                fig.update_layout(height=300)
-                st.plotly_chart(fig, use_container_width=True, key="compliance_framework_status")
-            
-            # Data classification results
-            st.markdown("**📊 Data Classification Results:**")
-            
-            classification_counts = {}
-            for table, classification in security_assessment.data_classification.items():
-                classification_counts[classification] = classification_counts.get(classification, 0) + 1
-            
-            if classification_counts:
-                class_df = pd.DataFrame({
-                    'Classification': list(classification_counts.keys()),
-                    'Count': list(classification_counts.values())
-                })
-                
-                fig = px.pie(class_df, values='Count', names='Classification',
-                           title='Data Classification Distribution',
-                           color_discrete_map={
-                               'public': '#22c55e',
-                               'pii': '#f59e0b', 
-                               'sensitive': '#ef4444'
-                           })
-                fig.update_layout(height=400)
-                st.plotly_chart(fig, use_container_width=True, key="data_classification_distribution")
-            
-            # Security recommendations
-            st.markdown("**💡 Security Recommendations:**")
-            
-            col1, col2 = st.columns(2)
+                    with col1:
+                        st.markdown(f"**Type:** {vuln['type']}")
+                        st.markdown(f"**Severity:** {vuln['severity']}")
+                    
+                    with col2:
+                        st.markdown(f"**Recommendation:** {vuln['recommendation']}")
+        
+        # Compliance status
+        st.markdown("**📋 Compliance Status:**")
+        
+        compliance_data = []
+        for framework, status in security_assessment.compliance_status.items():
+            compliance_data.append({
+                'Framework': framework,
+                'Status': 'Compliant' if status else 'Non-Compliant',
+                'Color': '#22c55e' if status else '#ef4444'
+            })
+        
+        if compliance_data:
+            df = pd.DataFrame(compliance_data)
+            fig = px.bar(df, x='Framework', y=['Status'], 
+                       color='Status', color_discrete_map={'Compliant': '#22c55e', 'Non-Compliant': '#ef4444'},
+                       title='Compliance Framework Status')
+            fig.update_layout(height=300)
+            st.plotly_chart(fig, use_container_width=True, key="compliance_framework_status")
+        
+        # Data classification results
+        st.markdown("**📊 Data Classification Results:**")
+        
+        classification_counts = {}
+        for table, classification in security_assessment.data_classification.items():
+            if '.' in table:
+                continue  # Column-level entries are listed separately below
+            classification_counts[classification] = classification_counts.get(classification, 0) + 1
+        
+        if classification_counts:
+            class_df = pd.DataFrame({
+                'Classification': list(classification_counts.keys()),
+                'Count': list(classification_counts.values())
+            })
             
-            with col1:
-                st.markdown(f"""
-                <div class="security-card">
-                    <h4>🎯 Immediate Actions</h4>
-                    {''.join([f'<p>• {rec}</p>' for rec in security_assessment.recommendations[:4]])}
-                </div>
-                """, unsafe_allow_html=True)
+            fig = px.pie(class_df, values='Count', names='Classification',
+                       title='Data Classification Distribution',
+                       color_discrete_map={
+                           'public': '#22c55e',
+                           'pii': '#f59e0b', 
+                           'sensitive': '#ef4444'
+                       })
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, use_container_width=True, key="data_classification_distribution")
+        
+        if security_assessment.pii_findings:
+            st.markdown("**🔎 PII Detected in Data Samples:**")
+            findings_df = pd.DataFrame([
+                {'Column': column, 'PII Type': pii_type, 'Matches': count}
+                for column, detected in security_assessment.pii_findings.items()
+                for pii_type, count in detected.items()
+            ])
+            st.dataframe(findings_df, use_container_width=True, hide_index=True)
+        
+        # Security recommendations
+        st.markdown("**💡 Security Recommendations:**")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="security-card">
+                <h4>🎯 Immediate Actions</h4>
+                {''.join([f'<p>• {rec}</p>' for rec in security_assessment.recommendations[:4]])}
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            # Generate AWS security best practices
+            aws_recommendations = [
+                "Enable AWS CloudTrail for audit logging",
+                "Configure VPC Flow Logs for network monitoring",
+                "Implement AWS Secrets Manager for credentials",
+                "Enable AWS GuardDuty for threat detection",
+                "Configure AWS Config for compliance monitoring"
+            ]
             
-            with col2:
-                # Generate AWS security best practices
-                aws_recommendations = [
-                    "Enable AWS CloudTrail for audit logging",
-                    "Configure VPC Flow Logs for network monitoring",
-                    "Implement AWS Secrets Manager for credentials",
-                    "Enable AWS GuardDuty for threat detection",
-                    "Configure AWS Config for compliance monitoring"
-                ]
-                
-                st.markdown(f"""
-                <div class="enterprise-card">
-                    <h4>☁️ AWS Security Best Practices</h4>
-                    {''.join([f'<p>• {rec}</p>' for rec in aws_recommendations[:4]])}
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(f"""
+            <div class="enterprise-card">
+                <h4>☁️ AWS Security Best Practices</h4>
+                {''.join([f'<p>• {rec}</p>' for rec in aws_recommendations[:4]])}
+            </div>
+            """, unsafe_allow_html=True)
 
 def render_aws_mapping_tab(config: Dict):
     """Enhanced AWS service mapping"""
@@ -3631,7 +7416,8 @@ def render_enhanced_ai_analysis_tab(config: Dict, migration_context: Dict):
     
     st.markdown('<span class="feature-badge badge-ai">🤖 AI-Powered Intelligence</span>', unsafe_allow_html=True)
     
-    ai_analyzer = EnterpriseAIAnalyzer()
+    context_budget = st.session_state.get("ai_context_budget", 4000)
+    ai_analyzer = EnterpriseAIAnalyzer(response_cache=get_llm_cache(), context_token_budget=context_budget)
     
     if not ai_analyzer.connected:
         st.markdown("""
@@ -3663,46 +7449,129 @@ def render_enhanced_ai_analysis_tab(config: Dict, migration_context: Dict):
     with col2:
         analysis_depth = st.selectbox("Analysis Depth", ["Standard", "Comprehensive", "Expert"], key="ai_analysis_depth")
         include_industry_context = st.checkbox("Include Industry Best Practices", True, key="ai_include_industry")
+        st.number_input("Schema Context Budget (tokens)", min_value=500, max_value=50000, value=4000, step=500,
+                        key="ai_context_budget",
+                        help="Schemas whose digest exceeds this budget are summarized chunk by chunk")
     
     with col3:
         team_experience = st.selectbox("Team Experience Level", ["Beginner", "Intermediate", "Expert"], key="ai_team_experience")
         budget_constraints = st.selectbox("Budget Flexibility", ["Tight", "Moderate", "Flexible"], key="ai_budget_constraints")
     
-    if st.button("🧠 Run Enhanced AI Analysis", type="primary", key="run_ai_analysis"):
-        with st.spinner("🤖 Running comprehensive AI analysis..."):
-            
-            try:
-                # Enhanced migration context
-                enhanced_context = {
-                    **migration_context,
-                    'analysis_depth': analysis_depth,
-                    'team_experience': team_experience,
-                    'budget_constraints': budget_constraints,
-                    'include_industry_context': include_industry_context,
-                    'business_critical': config.get('business_critical', False),
-                    'compliance_requirements': config.get('compliance_requirements', []),
-                    'downtime_tolerance': config.get('downtime_tolerance', 'Unknown')
-                }
-                
-                # Run comprehensive AI analysis
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                analysis_results = loop.run_until_complete(
-                    ai_analyzer.comprehensive_analysis(enhanced_context)
+    run_analysis = st.button("🧠 Run Enhanced AI Analysis", type="primary", key="run_ai_analysis")
+    
+    # Enhanced migration context
+    enhanced_context = {
+        **migration_context,
+        'analysis_depth': analysis_depth,
+        'team_experience': team_experience,
+        'budget_constraints': budget_constraints,
+        'include_industry_context': include_industry_context,
+        'business_critical': config.get('business_critical', False),
+        'compliance_requirements': config.get('compliance_requirements', []),
+        'downtime_tolerance': config.get('downtime_tolerance', 'Unknown')
+    }
+    
+    selected_types = [AnalysisType(name.lower().replace(' ', '_')) for name in analysis_types]
+    db_manager = get_db_manager()
+    project_id = st.session_state.get('current_project')
+    job_key = stable_hash(AI_MODEL, context_budget, enhanced_context, [t.value for t in selected_types])
+    
+    def run_analysis_job(report, context: Dict, types: List[AnalysisType]):
+        # Runs on a job worker; callbacks fire on the background loop and publish partial results
+        results, streamed = {}, defaultdict(str)
+        
+        def publish(message: str):
+            report(len(results) / max(len(types), 1), message, {'results': dict(results), 'streamed': dict(streamed)})
+        
+        def on_result(analysis_type: AnalysisType, result: AIAnalysisResult):
+            results[analysis_type] = result
+            publish(f"🤖 {len(results)}/{len(types)} analyses complete")
+        
+        def on_token(analysis_type: AnalysisType, text: str):
+            streamed[analysis_type] += text
+            publish(f"✍️ Writing {analysis_type.value.replace('_', ' ')} analysis...")
+        
+        analysis_results = get_background_loop().run(
+            ai_analyzer.comprehensive_analysis(context, types, on_result=on_result, on_token=on_token)
+        )
+        output = (analysis_results, ai_analyzer.last_schema_digest)
+        if project_id and analysis_results:
+            overall_confidence = sum(r.confidence_score for r in analysis_results.values()) / len(analysis_results)
+            db_manager.save_analysis_result(project_id, 'ai_analysis', output, {
+                'job_key': job_key,
+                'headline': f"{len(analysis_results)} analyses, {overall_confidence:.0%} confidence",
+                'analysis_types': [t.value for t in analysis_results],
+                'risks': sum(len(r.risks) for r in analysis_results.values()),
+                'recommendations': sum(len(r.recommendations) for r in analysis_results.values())
+            }, confidence_score=overall_confidence, search_documents=[
+                ('recommendation', analysis_type.value.replace('_', ' ').title(), recommendation)
+                for analysis_type, result in analysis_results.items()
+                for recommendation in result.recommendations
+            ], schema_text=f"{context.get('schema_ddl', '')}\n{context.get('queries_text', '')}")
+        return output
+    
+    # Slots are created on the first partial result so idle reruns show nothing. They are keyed by
+    # enum value because partial results of a job started in an earlier run carry that run's enum class
+    slots = {}
+    rendered = set()
+    streamed_shown = {}
+    
+    def ensure_slots(types: Optional[List[AnalysisType]] = None):
+        if slots:
+            return
+        # Reserve the summary above the per-analysis slots so results can render as they arrive
+        slots['summary'] = st.empty()
+        for analysis_type in types or selected_types or list(ai_analyzer.analysis_methods):
+            slots[analysis_type.value] = st.empty()
+            slots[analysis_type.value].info(f"⏳ {analysis_type.value.replace('_', ' ').title()} analysis running...")
+    
+    def render_results(results: Dict[AnalysisType, AIAnalysisResult]):
+        ensure_slots(list(results))
+        for analysis_type, result in results.items():
+            if analysis_type.value in slots and analysis_type.value not in rendered:
+                rendered.add(analysis_type.value)
+                with slots[analysis_type.value].container():
+                    render_ai_analysis_result(analysis_type, result, ai_analyzer.connected)
+    
+    def render_partial(partial: Dict):
+        ensure_slots()
+        render_results(partial['results'])
+        for analysis_type, text in partial['streamed'].items():
+            if (analysis_type.value in slots and analysis_type.value not in rendered
+                    and streamed_shown.get(analysis_type.value) != len(text)):
+                streamed_shown[analysis_type.value] = len(text)
+                slots[analysis_type.value].markdown(
+                    f"**✍️ {analysis_type.value.replace('_', ' ').title()} Analysis (streaming)**\n\n{text}▌"
                 )
-                loop.close()
-                
-                # Store results
-                st.session_state.analysis_results.update(analysis_results)
-                
-                # Display executive summary first
+    
+    try:
+        job_output = follow_job(
+            'ai_analysis', job_key,
+            run_analysis_job if run_analysis else None, enhanced_context, selected_types,
+            label="🤖 Running comprehensive AI analysis...", on_partial=render_partial
+        )
+        if job_output is None:
+            job_output = load_saved_result('ai_analysis', job_key, "AI analysis")
+        
+        if job_output is not None:
+            analysis_results, digest = job_output
+            render_results(analysis_results)
+            summary_slot = slots['summary']
+            
+            if digest is not None:
+                st.caption(
+                    f"🗜️ Schema context: ~{digest.original_token_estimate:,} → ~{digest.token_estimate:,} tokens"
+                    + (f", {len(digest.chunks)} chunks summarized in parallel" if digest.chunks else "")
+                )
+            
+            # Calculate overall metrics
+            overall_confidence = sum(r.confidence_score for r in analysis_results.values()) / len(analysis_results)
+            total_risks = sum(len(r.risks) for r in analysis_results.values())
+            total_recommendations = sum(len(r.recommendations) for r in analysis_results.values())
+            
+            with summary_slot.container():
                 st.markdown("**📋 AI Analysis Executive Summary:**")
                 
-                # Calculate overall metrics
-                overall_confidence = sum(r.confidence_score for r in analysis_results.values()) / len(analysis_results)
-                total_risks = sum(len(r.risks) for r in analysis_results.values())
-                total_recommendations = sum(len(r.recommendations) for r in analysis_results.values())
-                
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
@@ -3735,125 +7604,134 @@ def render_enhanced_ai_analysis_tab(config: Dict, migration_context: Dict):
                         st.warning(f"🚀 Status: {migration_readiness}")
                     else:
                         st.error(f"🚀 Status: {migration_readiness}")
-                
-                # Detailed analysis results
-                for analysis_type, result in analysis_results.items():
-                    type_name = analysis_type.value.replace('_', ' ').title()
-                    if type_name.replace(' ', '_').lower() in [a.replace(' ', '_').lower() for a in analysis_types]:
-                        
-                        with st.expander(f"📊 {type_name} Analysis", expanded=True):
-                            
-                            # Analysis metrics
-                            col1, col2, col3, col4 = st.columns(4)
-                            
-                            with col1:
-                                confidence_color = "success" if result.confidence_score > 0.8 else "warning"
-                                st.metric("🎯 Confidence", f"{result.confidence_score:.1%}")
-                            
-                            with col2:
-                                st.metric("⚠️ Risks", len(result.risks))
-                            
-                            with col3:
-                                st.metric("💡 Recommendations", len(result.recommendations))
-                            
-                            with col4:
-                                st.metric("🎯 Action Items", len(result.action_items))
-                            
-                            # Analysis content
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                if result.recommendations:
-                                    st.markdown("**💡 Key Recommendations:**")
-                                    for i, rec in enumerate(result.recommendations[:5]):
-                                        st.write(f"{i+1}. {rec}")
-                                
-                                if result.opportunities:
-                                    st.markdown("**🚀 Opportunities:**")
-                                    for opp in result.opportunities[:3]:
-                                        st.write(f"• {opp}")
-                            
-                            with col2:
-                                if result.risks:
-                                    st.markdown("**⚠️ Key Risks:**")
-                                    for risk in result.risks[:5]:
-                                        severity_icons = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}
-                                        st.write(f"{severity_icons.get(risk['severity'], '🔵')} {risk['description']}")
-                                
-                                if result.action_items:
-                                    st.markdown("**🎯 Priority Actions:**")
-                                    for item in result.action_items[:3]:
-                                        priority_icons = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}
-                                        st.write(f"{priority_icons.get(item['priority'], '🔵')} {item['action']}")
-                            
-                            # Timeline and cost impact
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                st.markdown(f"""
-                                <div class="metric-card">
-                                    <h5>⏱️ Timeline Estimate</h5>
-                                    <p>{result.timeline_estimate}</p>
-                                </div>
-                                """, unsafe_allow_html=True)
-                            
-                            with col2:
-                                st.markdown(f"""
-                                <div class="metric-card">
-                                    <h5>💰 Cost Impact</h5>
-                                    <p>{result.cost_impact}</p>
-                                </div>
-                                """, unsafe_allow_html=True)
-                            
-                            # Detailed analysis (collapsible)
-                            with st.expander("📄 Detailed AI Analysis", expanded=False):
-                                st.markdown(result.detailed_analysis)
-                
-                # Final recommendations summary
-                st.markdown("**🎯 Final AI Recommendations:**")
-                
-                # Collect high-priority actions from all analyses
-                high_priority_actions = []
-                for result in analysis_results.values():
-                    high_priority_actions.extend([
-                        item['action'] for item in result.action_items 
-                        if item['priority'] == 'high'
-                    ])
-                
-                if high_priority_actions:
-                    st.markdown(f"""
-                    <div class="ai-enhanced-card">
-                        <h4>🔴 Immediate Actions Required</h4>
-                        {''.join([f'<p>• {action}</p>' for action in high_priority_actions[:5]])}
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Overall recommendation
-                if overall_confidence > 0.8:
-                    st.markdown("""
-                    <div class="success-banner">
-                        <h4>✅ Migration Recommendation: PROCEED</h4>
-                        <p>AI analysis indicates this migration is well-positioned for success with proper execution of the recommended strategy.</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                elif overall_confidence > 0.6:
-                    st.markdown("""
-                    <div class="warning-banner">
-                        <h4>⚠️ Migration Recommendation: PROCEED WITH CAUTION</h4>
-                        <p>Migration is feasible but requires careful planning and risk mitigation. Address high-priority recommendations before proceeding.</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown("""
-                    <div class="error-banner">
-                        <h4>🔴 Migration Recommendation: ADDITIONAL PLANNING REQUIRED</h4>
-                        <p>Significant risks and complexities identified. Extensive planning and risk assessment required before migration.</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-            except Exception as e:
-                st.error(f"AI analysis failed: {e}")
-                st.info("Please check your configuration and try again.")
+            
+            # Final recommendations summary
+            st.markdown("**🎯 Final AI Recommendations:**")
+            
+            # Collect high-priority actions from all analyses
+            high_priority_actions = []
+            for result in analysis_results.values():
+                high_priority_actions.extend([
+                    item['action'] for item in result.action_items 
+                    if item['priority'] == 'high'
+                ])
+            
+            if high_priority_actions:
+                st.markdown(f"""
+                <div class="ai-enhanced-card">
+                    <h4>🔴 Immediate Actions Required</h4>
+                    {''.join([f'<p>• {action}</p>' for action in high_priority_actions[:5]])}
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Overall recommendation
+            if overall_confidence > 0.8:
+                st.markdown("""
+                <div class="success-banner">
+                    <h4>✅ Migration Recommendation: PROCEED</h4>
+                    <p>AI analysis indicates this migration is well-positioned for success with proper execution of the recommended strategy.</p>
+                </div>
+                """, unsafe_allow_html=True)
+            elif overall_confidence > 0.6:
+                st.markdown("""
+                <div class="warning-banner">
+                    <h4>⚠️ Migration Recommendation: PROCEED WITH CAUTION</h4>
+                    <p>Migration is feasible but requires careful planning and risk mitigation. Address high-priority recommendations before proceeding.</p>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown("""
+                <div class="error-banner">
+                    <h4>🔴 Migration Recommendation: ADDITIONAL PLANNING REQUIRED</h4>
+                    <p>Significant risks and complexities identified. Extensive planning and risk assessment required before migration.</p>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    except Exception as e:
+        st.error(f"AI analysis failed: {e}")
+        st.info("Please check your configuration and try again.")
+
+    if ai_analyzer.response_cache is not None:
+        cache_stats = ai_analyzer.response_cache.stats()
+        st.caption(f"⚡ LLM response cache: {cache_stats['size']} entries, "
+                   f"{cache_stats['hits']} hits / {cache_stats['misses']} misses")
+
+def render_ai_analysis_result(analysis_type: AnalysisType, result: AIAnalysisResult, connected: bool):
+    """Render one completed AI analysis"""
+    type_name = analysis_type.value.replace('_', ' ').title()
+    
+    with st.expander(f"📊 {type_name} Analysis", expanded=True):
+        
+        if result.is_fallback and connected:
+            st.warning("⚠️ This analysis timed out or failed; showing fallback guidance")
+        elif result.from_cache:
+            st.caption("⚡ Served from the LLM response cache")
+        
+        # Analysis metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            confidence_color = "success" if result.confidence_score > 0.8 else "warning"
+            st.metric("🎯 Confidence", f"{result.confidence_score:.1%}")
+        
+        with col2:
+            st.metric("⚠️ Risks", len(result.risks))
+        
+        with col3:
+            st.metric("💡 Recommendations", len(result.recommendations))
+        
+        with col4:
+            st.metric("🎯 Action Items", len(result.action_items))
+        
+        # Analysis content
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if result.recommendations:
+                st.markdown("**💡 Key Recommendations:**")
+                for i, rec in enumerate(result.recommendations[:5]):
+                    st.write(f"{i+1}. {rec}")
+            
+            if result.opportunities:
+                st.markdown("**🚀 Opportunities:**")
+                for opp in result.opportunities[:3]:
+                    st.write(f"• {opp}")
+        
+        with col2:
+            if result.risks:
+                st.markdown("**⚠️ Key Risks:**")
+                for risk in result.risks[:5]:
+                    severity_icons = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}
+                    st.write(f"{severity_icons.get(risk['severity'], '🔵')} {risk['description']}")
+            
+            if result.action_items:
+                st.markdown("**🎯 Priority Actions:**")
+                for item in result.action_items[:3]:
+                    priority_icons = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}
+                    st.write(f"{priority_icons.get(item['priority'], '🔵')} {item['action']}")
+        
+        # Timeline and cost impact
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h5>⏱️ Timeline Estimate</h5>
+                <p>{result.timeline_estimate}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h5>💰 Cost Impact</h5>
+                <p>{result.cost_impact}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Detailed analysis
+        st.markdown("**📄 Detailed AI Analysis:**")
+        st.markdown(result.detailed_analysis)
 
 def render_enhanced_autofix_tab(config: Dict, schema_ddl: str, queries_text: str):
     """Render the enhanced auto-fix analysis tab"""
@@ -3899,155 +7777,181 @@ def render_enhanced_autofix_tab(config: Dict, schema_ddl: str, queries_text: str
         group_by_severity = st.checkbox("Group by severity", True, key="autofix_group_severity")
         show_ai_explanations = st.checkbox("Show AI explanations", True, key="autofix_show_ai")
     
-    if st.button("🚀 Run Auto-Fix Analysis", type="primary", key="run_autofix_analysis"):
-        with st.spinner("🔍 Analyzing code and generating fixes..."):
-            
-            # Initialize auto-fix engine
-            autofix_engine = EnterpriseAutoFixEngine()
-            
-            # Run comprehensive auto-fix analysis
-            fix_result = autofix_engine.analyze_and_fix(
-                source_engine=config['source_engine'],
-                target_engine=config['target_engine'],
-                schema_ddl=schema_ddl,
-                queries=queries_text,
-                fix_categories=fix_categories,
-                auto_apply_safe=auto_apply_safe
+    run_autofix = st.button("🚀 Run Auto-Fix Analysis", type="primary", key="run_autofix_analysis")
+    
+    # Initialize auto-fix engine
+    autofix_engine = EnterpriseAutoFixEngine(response_cache=get_llm_cache())
+    
+    db_manager = get_db_manager()
+    project_id = st.session_state.get('current_project')
+    # The saved fixes are tied to these inputs; they are only offered (and applied) when they match
+    job_key = stable_hash(config['source_engine'], config['target_engine'], schema_ddl, queries_text,
+                          [category.value for category in fix_categories], auto_apply_safe)
+    
+    def run_autofix_job(report) -> AutoFixResult:
+        result = autofix_engine.analyze_and_fix(
+            source_engine=config['source_engine'],
+            target_engine=config['target_engine'],
+            schema_ddl=schema_ddl,
+            queries=queries_text,
+            fix_categories=fix_categories,
+            auto_apply_safe=auto_apply_safe
+        )
+        if project_id:
+            db_manager.save_analysis_result(project_id, 'auto_fix', result, {
+                'job_key': job_key,
+                'headline': f"{result.fixes_available} fixes for {result.total_issues} issues, {result.critical_issues} critical",
+                'total_issues': result.total_issues,
+                'fixes_available': result.fixes_available,
+                'critical_issues': result.critical_issues,
+                'compatibility_score_after': result.compatibility_score_after
+            }, search_documents=[
+                ('fix', fix.title, f"{fix.id}\n{fix.description}\n{fix.original_code}") for fix in result.fixes
+            ], schema_text=f"{schema_ddl}\n{queries_text}")
+        return result
+    
+    # Run comprehensive auto-fix analysis as a background job
+    fix_result = follow_job(
+        'auto_fix', job_key,
+        run_autofix_job if run_autofix else None,
+        label="🔍 Analyzing code and generating fixes..."
+    )
+    if fix_result is None:
+        fix_result = load_saved_result('auto_fix', job_key, "auto-fix analysis")
+    
+    if fix_result is not None:
+        # Display results summary
+        st.markdown("**📊 Auto-Fix Analysis Results:**")
+        if fix_result.ai_fixes_from_cache:
+            st.caption("⚡ AI-suggested fixes served from the LLM response cache")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            if fix_result.critical_issues > 0:
+                st.error(f"🚨 {fix_result.critical_issues} Critical Issues")
+            else:
+                st.success("✅ No Critical Issues")
+        
+        with col2:
+            st.info(f"🔧 {fix_result.fixes_available} Fixes Available")
+        
+        with col3:
+            if fix_result.fixes_applied > 0:
+                st.success(f"✅ {fix_result.fixes_applied} Auto-Applied")
+            else:
+                st.warning("⏳ No Fixes Applied")
+        
+        with col4:
+            score_improvement = fix_result.compatibility_score_after - fix_result.compatibility_score_before
+            st.metric(
+                "🎯 Compatibility Score",
+                f"{fix_result.compatibility_score_after:.0f}%",
+                delta=f"+{score_improvement:.0f}%" if score_improvement > 0 else None
             )
+        
+        # Display fixes by category
+        if fix_result.fixes:
+            
+            if group_by_severity:
+                # Group fixes by severity
+                severity_groups = {}
+                for fix in fix_result.fixes:
+                    if fix.severity not in severity_groups:
+                        severity_groups[fix.severity] = []
+                    severity_groups[fix.severity].append(fix)
+                
+                # Display in severity order
+                severity_order = [FixSeverity.CRITICAL, FixSeverity.HIGH, FixSeverity.MEDIUM, FixSeverity.LOW]
+                if show_cosmetic_fixes:
+                    severity_order.append(FixSeverity.COSMETIC)
+                
+                for severity in severity_order:
+                    if severity in severity_groups:
+                        fixes_in_group = severity_groups[severity]
+                        
+                        # Severity header with styling
+                        severity_colors = {
+                            FixSeverity.CRITICAL: "🔴",
+                            FixSeverity.HIGH: "🟠", 
+                            FixSeverity.MEDIUM: "🟡",
+                            FixSeverity.LOW: "🟢",
+                            FixSeverity.COSMETIC: "🔵"
+                        }
+                        
+                        st.markdown(f"**{severity_colors[severity]} {severity.value.title()} Priority Fixes ({len(fixes_in_group)}):**")
+                        
+                        for i, fix in enumerate(fixes_in_group):
+                            render_fix_item(fix, i, show_diff_view, show_ai_explanations, autofix_engine, schema_ddl, queries_text)
             
-            # Store results in session state
-            st.session_state.autofix_results = fix_result
-            
-            # Display results summary
-            st.markdown("**📊 Auto-Fix Analysis Results:**")
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                if fix_result.critical_issues > 0:
-                    st.error(f"🚨 {fix_result.critical_issues} Critical Issues")
-                else:
-                    st.success("✅ No Critical Issues")
-            
-            with col2:
-                st.info(f"🔧 {fix_result.fixes_available} Fixes Available")
-            
-            with col3:
-                if fix_result.fixes_applied > 0:
-                    st.success(f"✅ {fix_result.fixes_applied} Auto-Applied")
-                else:
-                    st.warning("⏳ No Fixes Applied")
+            else:
+                # Display all fixes together
+                st.markdown(f"**🔧 All Available Fixes ({len(fix_result.fixes)}):**")
+                for i, fix in enumerate(fix_result.fixes):
+                    render_fix_item(fix, i, show_diff_view, show_ai_explanations, autofix_engine, schema_ddl, queries_text)
+        
+        # Summary and next steps
+        st.markdown("**📋 Summary & Next Steps:**")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="analysis-card">
+                <h4>📊 Analysis Summary</h4>
+                <pre>{fix_result.summary_report}</pre>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            if fix_result.fixes_available > 0:
+                unapplied_fixes = [f for f in fix_result.fixes if f.status == FixStatus.PENDING]
+                if unapplied_fixes:
+                    st.markdown(f"""
+                    <div class="enterprise-card">
+                        <h4>🎯 Recommended Actions</h4>
+                        <p>• Review {len(unapplied_fixes)} pending fixes</p>
+                        <p>• Apply critical and high-priority fixes first</p>
+                        <p>• Test fixes in staging environment</p>
+                        <p>• Update application code if needed</p>
+                    </div>
+                    """, unsafe_allow_html=True)
             
-            with col4:
-                score_improvement = fix_result.compatibility_score_after - fix_result.compatibility_score_before
-                st.metric(
-                    "🎯 Compatibility Score",
-                    f"{fix_result.compatibility_score_after:.0f}%",
-                    delta=f"+{score_improvement:.0f}%" if score_improvement > 0 else None
-                )
+            # Performance and security insights
+            if fix_result.performance_gains != "No performance issues detected":
+                st.info(f"⚡ {fix_result.performance_gains}")
             
-            # Display fixes by category
-            if fix_result.fixes:
-                
-                if group_by_severity:
-                    # Group fixes by severity
-                    severity_groups = {}
-                    for fix in fix_result.fixes:
-                        if fix.severity not in severity_groups:
-                            severity_groups[fix.severity] = []
-                        severity_groups[fix.severity].append(fix)
-                    
-                    # Display in severity order
-                    severity_order = [FixSeverity.CRITICAL, FixSeverity.HIGH, FixSeverity.MEDIUM, FixSeverity.LOW]
-                    if show_cosmetic_fixes:
-                        severity_order.append(FixSeverity.COSMETIC)
-                    
-                    for severity in severity_order:
-                        if severity in severity_groups:
-                            fixes_in_group = severity_groups[severity]
-                            
-                            # Severity header with styling
-                            severity_colors = {
-                                FixSeverity.CRITICAL: "🔴",
-                                FixSeverity.HIGH: "🟠", 
-                                FixSeverity.MEDIUM: "🟡",
-                                FixSeverity.LOW: "🟢",
-                                FixSeverity.COSMETIC: "🔵"
-                            }
-                            
-                            st.markdown(f"**{severity_colors[severity]} {severity.value.title()} Priority Fixes ({len(fixes_in_group)}):**")
-                            
-                            for i, fix in enumerate(fixes_in_group):
-                                render_fix_item(fix, i, show_diff_view, show_ai_explanations, autofix_engine, schema_ddl, queries_text)
-                
-                else:
-                    # Display all fixes together
-                    st.markdown(f"**🔧 All Available Fixes ({len(fix_result.fixes)}):**")
-                    for i, fix in enumerate(fix_result.fixes):
-                        render_fix_item(fix, i, show_diff_view, show_ai_explanations, autofix_engine, schema_ddl, queries_text)
+            if fix_result.security_improvements:
+                st.warning(f"🔒 {len(fix_result.security_improvements)} security improvements available")
+        
+        # Download fixed code
+        if fix_result.fixes_applied > 0:
+            applied_fixes = [f for f in fix_result.fixes if f.status == FixStatus.APPLIED]
+            fixed_result = autofix_engine.apply_fixes(applied_fixes, schema_ddl, queries_text)
             
-            # Summary and next steps
-            st.markdown("**📋 Summary & Next Steps:**")
+            st.markdown("**📥 Download Fixed Code:**")
             
             col1, col2 = st.columns(2)
             
             with col1:
-                st.markdown(f"""
-                <div class="analysis-card">
-                    <h4>📊 Analysis Summary</h4>
-                    <pre>{fix_result.summary_report}</pre>
-                </div>
-                """, unsafe_allow_html=True)
+                if fixed_result['fixed_schema']:
+                    st.download_button(
+                        "📥 Download Fixed Schema",
+                        fixed_result['fixed_schema'],
+                        f"fixed_schema_{config['source_engine']}_to_{config['target_engine']}.sql",
+                        "text/sql",
+                        key="download_fixed_schema"
+                    )
             
             with col2:
-                if fix_result.fixes_available > 0:
-                    unapplied_fixes = [f for f in fix_result.fixes if f.status == FixStatus.PENDING]
-                    if unapplied_fixes:
-                        st.markdown(f"""
-                        <div class="enterprise-card">
-                            <h4>🎯 Recommended Actions</h4>
-                            <p>• Review {len(unapplied_fixes)} pending fixes</p>
-                            <p>• Apply critical and high-priority fixes first</p>
-                            <p>• Test fixes in staging environment</p>
-                            <p>• Update application code if needed</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                
-                # Performance and security insights
-                if fix_result.performance_gains != "No performance issues detected":
-                    st.info(f"⚡ {fix_result.performance_gains}")
-                
-                if fix_result.security_improvements:
-                    st.warning(f"🔒 {len(fix_result.security_improvements)} security improvements available")
-            
-            # Download fixed code
-            if fix_result.fixes_applied > 0:
-                applied_fixes = [f for f in fix_result.fixes if f.status == FixStatus.APPLIED]
-                fixed_result = autofix_engine.apply_fixes(applied_fixes, schema_ddl, queries_text)
-                
-                st.markdown("**📥 Download Fixed Code:**")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if fixed_result['fixed_schema']:
-                        st.download_button(
-                            "📥 Download Fixed Schema",
-                            fixed_result['fixed_schema'],
-                            f"fixed_schema_{config['source_engine']}_to_{config['target_engine']}.sql",
-                            "text/sql",
-                            key="download_fixed_schema"
-                        )
-                
-                with col2:
-                    if fixed_result['fixed_queries']:
-                        st.download_button(
-                            "📥 Download Fixed Queries", 
-                            fixed_result['fixed_queries'],
-                            f"fixed_queries_{config['source_engine']}_to_{config['target_engine']}.sql",
-                            "text/sql",
-                            key="download_fixed_queries"
-                        )
+                if fixed_result['fixed_queries']:
+                    st.download_button(
+                        "📥 Download Fixed Queries", 
+                        fixed_result['fixed_queries'],
+                        f"fixed_queries_{config['source_engine']}_to_{config['target_engine']}.sql",
+                        "text/sql",
+                        key="download_fixed_queries"
+                    )
 
 def render_fix_item(fix: AutoFix, index: int, show_diff_view: bool, show_ai_explanations: bool, 
                    autofix_engine, schema_ddl: str, queries_text: str):
@@ -4152,6 +8056,7 @@ def main():
     """Enhanced main application function"""
     # Initialize session state
     initialize_session_state()
+    st.session_state.jobs_rerun_pending = False
     
     # Render enterprise header
     render_enterprise_header()
@@ -4167,7 +8072,7 @@ def main():
             project_description = st.text_area("Description", key="project_description_input")
             
             if st.form_submit_button("Create Project"):
-                db_manager = EnterpriseDBManager()
+                db_manager = get_db_manager()
                 project_id = db_manager.create_project(
                     project_name, 
                     config['source_engine'], 
@@ -4175,6 +8080,7 @@ def main():
                     st.session_state.user_id
                 )
                 st.session_state.current_project = project_id
+                st.session_state.project_page_cursors = [None]
                 st.session_state.show_project_creator = False
                 st.success(f"Project '{project_name}' created successfully!")
                 st.rerun()
@@ -4281,6 +8187,9 @@ def main():
         </p>
     </div>
     """, unsafe_allow_html=True)
+    
+    # Keep polling background jobs shown on this run
+    rerun_for_active_jobs()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,388 @@
+import asyncio
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from streamlit_app import (AnalysisType, AsyncLLMClient, AutoFix, AutoFixResult, DMSWindowEstimator,
+                           EnhancedAWSCostCalculator, EnterpriseDBManager, FixCategory, FixSeverity,
+                           PricingSnapshotStore, RDSPriceIndex, RightSizingEngine, SecurityAnalyzer,
+                           StreamingHistogram)
+
+
+def make_histogram(values):
+    hist = StreamingHistogram(RightSizingEngine._bin_edges('freeable_memory_bytes'))
+    hist.add(np.asarray(values, dtype=float))
+    return hist
+
+
+def test_percentile_extremes_are_exact():
+    values = [3.2e9, 4.5e9, 6.0e9, 7.75e9]
+    hist = make_histogram(values)
+    assert hist.percentile(0) == min(values)
+    assert hist.percentile(100) == max(values)
+
+
+def test_percentile_extremes_across_chunks():
+    hist = make_histogram([5e9, 6e9])
+    hist.add(np.array([2e9, np.nan, 9e9]))
+    assert hist.percentile(0) == 2e9
+    assert hist.percentile(100) == 9e9
+
+
+@pytest.mark.parametrize('q', [0, 1, 50, 99, 100])
+def test_percentile_stays_within_observed_range(q):
+    values = np.random.default_rng(0).uniform(1e9, 2e9, 1000)
+    hist = make_histogram(values)
+    assert values.min() <= hist.percentile(q) <= values.max()
+
+
+def test_empty_histogram():
+    hist = StreamingHistogram(RightSizingEngine._bin_edges('cpu_pct'))
+    assert hist.percentile(0) == 0.0
+    assert hist.percentile(100) == 0.0
+
+
+def test_card_detection_ignores_non_ascii_digits():
+    values = pd.Series(['4111 1111 1111 1111', '\u0664\u0661\u0661\u0661' * 4, '4111-1111-1111-1112'], dtype='string')
+    assert SecurityAnalyzer()._detect_pii_values(values).get('credit_card') == 1
+
+
+def test_parquet_samples_without_engine_raise_clear_error(tmp_path, monkeypatch):
+    sample = tmp_path / "users.parquet"
+    sample.write_bytes(b"PAR1")
+    monkeypatch.setattr(SecurityAnalyzer, 'parquet_engine', staticmethod(lambda: None))
+    with pytest.raises(ImportError, match="pyarrow or fastparquet"):
+        next(SecurityAnalyzer()._read_sample_chunks(sample))
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    return EnterpriseDBManager(tmp_path / "enterprise.db")
+
+
+def test_analysis_payload_round_trip(db_manager):
+    project_id = db_manager.create_project("round trip", "oracle", "postgresql", "user-1")
+    fix = AutoFix('fix-1', FixCategory.SYNTAX, FixSeverity.HIGH, "Replace NVL", "Oracle function",
+                  "NVL(a, b)", "COALESCE(a, b)", "Portable", 0.9, "low")
+    result = AutoFixResult(1, 1, 0, 0, "none", ["none"], 70.0, 80.0, [fix], "report")
+    result_id = db_manager.save_analysis_result(project_id, 'auto_fix', result, {'job_key': 'k'})
+    
+    loaded = db_manager.load_analysis_payload(result_id)
+    assert loaded == result
+    assert loaded.fixes[0].severity is FixSeverity.HIGH
+
+
+def test_analysis_payload_is_json(db_manager):
+    project_id = db_manager.create_project("json", "oracle", "postgresql", "user-1")
+    result_id = db_manager.save_analysis_result(project_id, 'ai_analysis', {AnalysisType.RISK_ASSESSMENT: 0.5}, {})
+    with db_manager.pool.connection() as conn:
+        payload = conn.execute("SELECT payload FROM analysis_payloads WHERE result_id = ?", (result_id,)).fetchone()[0]
+    assert json.loads(zlib.decompress(payload))
+    assert db_manager.load_analysis_payload(result_id) == {AnalysisType.RISK_ASSESSMENT: 0.5}
+
+
+class OfflineClients:
+    """AWS client registry that fails fast, so the pricing refresh never reaches the network"""
+    
+    def get(self, service_name, region_name='us-east-1'):
+        raise RuntimeError("offline")
+
+
+@pytest.fixture
+def offline_pricing(tmp_path):
+    return PricingSnapshotStore(tmp_path / "snapshot.json", client_registry=OfflineClients())
+
+
+def write_offer_file(path, products, prices):
+    terms = {
+        sku: {'offer': {'priceDimensions': {'dim': {'unit': unit, 'pricePerUnit': {'USD': str(usd)}}}}}
+        for sku, (unit, usd) in prices.items()
+    }
+    path.write_text(json.dumps({'formatVersion': 'v1.0', 'version': 'test', 'products': products,
+                                'terms': {'OnDemand': terms}}))
+    return path
+
+
+def test_aurora_multi_az_uses_single_az_sku_per_replica(tmp_path, offline_pricing):
+    attrs = {'databaseEngine': 'Aurora PostgreSQL', 'instanceType': 'db.r5.large', 'deploymentOption': 'Single-AZ',
+             'licenseModel': 'No license required', 'usagetype': 'InstanceUsage:db.r5.large'}
+    products = {
+        f'sku-{region}': {'productFamily': 'Database Instance', 'attributes': {**attrs, 'regionCode': region}}
+        for region in ('us-east-1', 'eu-west-1')
+    }
+    offer = write_offer_file(tmp_path / "offer.json", products,
+                             {'sku-us-east-1': ('Hrs', 0.29), 'sku-eu-west-1': ('Hrs', 0.32)})
+    index = RDSPriceIndex(tmp_path / "index.db")
+    index.import_offer_file(offer)
+    
+    assert index.lookup_instance_hourly('us-east-1', 'Aurora PostgreSQL', 'db.r5.large', 'Single-AZ',
+                                        'No license required') == 0.29
+    assert index.lookup_instance_hourly('us-east-1', 'Aurora PostgreSQL', 'db.r5.large', 'Multi-AZ',
+                                        'No license required') is None
+    
+    calculator = EnhancedAWSCostCalculator(pricing_store=offline_pricing, price_index=index)
+    config = {'target_engine': 'aurora_postgresql', 'instance_class': 'db.r5.large', 'multi_az': True,
+              'primary_region': 'us-east-1'}
+    assert calculator._calculate_rds_cost(config) == pytest.approx(0.29 * 730 * 2)
+    assert calculator._calculate_rds_cost({**config, 'multi_az': False}) == pytest.approx(0.29 * 730)
+    regional = calculator._regional_rds_costs(config, ['us-east-1', 'eu-west-1'])
+    assert regional == pytest.approx([0.29 * 730 * 2, 0.32 * 730 * 2])
+
+
+@pytest.fixture
+def cost_calculator(tmp_path, offline_pricing):
+    return EnhancedAWSCostCalculator(pricing_store=offline_pricing, price_index=RDSPriceIndex(tmp_path / "index.db"))
+
+
+def test_simulation_odds_and_growth_come_from_config(cost_calculator):
+    config = {'target_engine': 'postgresql', 'instance_class': 'db.r5.large', 'storage_gb': 500,
+              'primary_region': 'us-east-1'}
+    fixed = (cost_calculator._calculate_storage_cost(config) + cost_calculator._calculate_backup_cost(config)
+             + cost_calculator._calculate_io_cost(config))
+    
+    certain = cost_calculator.simulate_migration_cost(
+        {**config, 'sizing_probabilities': (0, 1, 0), 'growth_sigma': 0.0}, trials=1000, seed=1)
+    expected = cost_calculator._calculate_rds_cost(config) + fixed
+    assert list(certain.percentiles['monthly'].values()) == pytest.approx([expected] * 3)
+    
+    larger = cost_calculator._sizing_neighbours('db.r5.large')[2]
+    upsized = cost_calculator.simulate_migration_cost(
+        {**config, 'sizing_probabilities': (0, 0, 1), 'growth_sigma': 0.0}, trials=1000, seed=1)
+    assert upsized.percentiles['monthly']['p50'] == pytest.approx(
+        cost_calculator._calculate_rds_cost({**config, 'instance_class': larger}) + fixed)
+    
+    default = cost_calculator.simulate_migration_cost(config, trials=20_000, seed=1)
+    assert default.percentiles['monthly']['p90'] < 1.5 * default.percentiles['monthly']['p50']
+    
+    with pytest.raises(ValueError):
+        cost_calculator.simulate_migration_cost({**config, 'sizing_probabilities': (0.5, 0.5)}, trials=10)
+
+
+def test_price_index_version_follows_imports(tmp_path, offline_pricing):
+    index = RDSPriceIndex(tmp_path / "index.db")
+    calculator = EnhancedAWSCostCalculator(pricing_store=offline_pricing, price_index=index)
+    assert index.version is None
+    before = calculator.pricing_version()
+    
+    index.import_offer_file(write_offer_file(tmp_path / "offer.json", {}, {}))
+    assert index.version == index.get_metadata()['imported_at']
+    assert calculator.pricing_version() != before
+    assert RDSPriceIndex(tmp_path / "index.db").version == index.version
+
+
+def test_project_pages_split_equal_timestamps(db_manager):
+    project_ids = {db_manager.create_project(f"project {i}", "oracle", "postgresql", "owner") for i in range(5)}
+    with db_manager.pool.connection() as conn:
+        conn.execute("UPDATE migration_projects SET created_at = '2024-01-01 00:00:00'")
+    db_manager.read_cache.invalidate('migration_projects')
+    
+    seen, cursor = [], None
+    while True:
+        page, cursor = db_manager.get_user_projects_page("owner", after=cursor, limit=2)
+        seen.extend(project['id'] for project in page)
+        if cursor is None:
+            break
+    assert seen == sorted(project_ids, reverse=True)
+
+
+def test_summary_listing_uses_covering_index(db_manager):
+    with db_manager.pool.connection() as conn:
+        plan = " ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id, analysis_type, result_data, confidence_score, created_at "
+            "FROM analysis_results WHERE project_id = ? ORDER BY created_at DESC, id DESC", ("p",)
+        ))
+    assert "COVERING INDEX" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+class RateLimitedMessages(BaseHTTPRequestHandler):
+    """Messages API stub: 429 on the first request, then a streamed reply"""
+    protocol_version = 'HTTP/1.1'
+    requests = 0
+    
+    def log_message(self, *args):
+        pass
+    
+    def do_POST(self):
+        self.rfile.read(int(self.headers['content-length']))
+        type(self).requests += 1
+        if type(self).requests == 1:
+            self._reply(429, 'application/json', {'type': 'error', 'error': {'type': 'rate_limit_error', 'message': 'slow down'}})
+            return
+        
+        message = {'id': 'msg_1', 'type': 'message', 'role': 'assistant', 'model': 'test', 'content': [],
+                   'stop_reason': None, 'stop_sequence': None, 'usage': {'input_tokens': 1, 'output_tokens': 0}}
+        events = [
+            ('message_start', {'type': 'message_start', 'message': message}),
+            ('content_block_start', {'type': 'content_block_start', 'index': 0, 'content_block': {'type': 'text', 'text': ''}}),
+            *(('content_block_delta', {'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': text}})
+              for text in ('Hel', 'lo')),
+            ('content_block_stop', {'type': 'content_block_stop', 'index': 0}),
+            ('message_delta', {'type': 'message_delta', 'delta': {'stop_reason': 'end_turn', 'stop_sequence': None},
+                               'usage': {'output_tokens': 2}}),
+            ('message_stop', {'type': 'message_stop'})
+        ]
+        self._reply(200, 'text/event-stream', ''.join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events))
+    
+    def _reply(self, status, content_type, body):
+        body = (body if isinstance(body, str) else json.dumps(body)).encode()
+        self.send_response(status)
+        self.send_header('content-type', content_type)
+        if status == 429:
+            self.send_header('retry-after', '0')
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_llm_client_retries_rate_limit_then_streams():
+    pytest.importorskip('anthropic')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RateLimitedMessages)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = AsyncLLMClient('test', base_url=f'http://127.0.0.1:{server.server_port}', base_delay=0.01)
+    
+    async def stream_text():
+        async with client.stream(model='test', max_tokens=5, messages=[{'role': 'user', 'content': 'hi'}]) as stream:
+            return ''.join([text async for text in stream.text_stream])
+    
+    try:
+        assert asyncio.run(stream_text()) == "Hello"
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert client.retries == 1
+    assert RateLimitedMessages.requests == 2
+
+
+def test_pareto_mask_keeps_only_undominated_scenarios():
+    cost = np.array([1.0, 2.0, 2.0, 3.0, 4.0])
+    capacity = np.array([1.0, 3.0, 2.0, 3.0, 5.0])
+    assert EnhancedAWSCostCalculator._pareto_mask(cost, capacity).tolist() == [True, True, False, False, True]
+    
+    rng = np.random.default_rng(7)
+    cost, capacity = rng.random(300), rng.random(300)
+    dominated = [((cost <= c) & (capacity >= k) & ((cost < c) | (capacity > k))).any() for c, k in zip(cost, capacity)]
+    assert EnhancedAWSCostCalculator._pareto_mask(cost, capacity).tolist() == [not d for d in dominated]
+
+
+def test_tco_break_even_months(cost_calculator):
+    config = {'target_engine': 'postgresql', 'instance_class': 'db.r5.large', 'storage_gb': 100,
+              'primary_region': 'us-east-1'}
+    summary = cost_calculator.project_tco(config, years=3).summary.set_index('pricing_option')
+    # All Upfront pays 12 * (1 - 0.36) and 36 * (1 - 0.56) months of on-demand on day one
+    assert summary.loc[['1yr No Upfront', '1yr All Upfront', '3yr Partial Upfront', '3yr All Upfront'],
+                       'break_even_month'].tolist() == [1, 8, 12, 16]
+    assert np.isnan(summary.loc['On-Demand', 'break_even_month'])
+    assert (summary.drop('On-Demand')['savings_vs_on_demand'] > 0).all()
+    
+    # Break-even outside the projected horizon is reported as missing
+    one_year = cost_calculator.project_tco(config, years=1).summary.set_index('pricing_option')
+    assert np.isnan(one_year.loc['3yr All Upfront', 'break_even_month'])
+    assert one_year.loc['1yr All Upfront', 'break_even_month'] == 8
+
+
+def test_dms_window_schedules_tables_and_cdc_backlog(cost_calculator):
+    tables = pd.DataFrame({'table': ['orders', 'users', 'events', 'audit'], 'rows': [0, 0, 0, 0],
+                           'size_gb': [40, 10, 10, 10], 'lob_mode': ['none', 'none', 'none', 'limited']})
+    estimator = DMSWindowEstimator(cost_calculator)
+    config = {'dms_instance': 'dms.t3.medium', 'primary_region': 'us-east-1'}
+    
+    # Two threads would move 24 MB/s, but dms.t3.medium tops out at 20 MB/s: 10 MB/s per thread
+    estimate = estimator.estimate(tables, config, parallel_threads=2, change_rate_gb_per_hour=10)
+    hours_per_gb = 1024 / 10 / 3600
+    assert (estimate.bottleneck, estimate.effective_mbps) == ('instance', 20)
+    # Limited LOB mode makes audit cost 16 GB of load time; largest first, everything else shares the other thread
+    schedule = estimate.schedule.set_index('table')
+    assert (schedule['thread'] == schedule.loc['orders', 'thread']).sum() == 1
+    assert schedule['end_hours'].max() == schedule.loc['orders', 'end_hours'] == pytest.approx(40 * hours_per_gb)
+    assert schedule.drop('orders')['end_hours'].max() == pytest.approx(36 * hours_per_gb)
+    assert estimate.full_load_hours == pytest.approx(40 * hours_per_gb)
+    
+    # The backlog cached during the load drains at the apply rate less the ongoing change rate
+    apply_gb_per_hour = 20 * DMSWindowEstimator.CDC_APPLY_SHARE * 3600 / 1024
+    assert estimate.cdc_catchup_hours == pytest.approx(10 * estimate.full_load_hours / (apply_gb_per_hour - 10))
+    assert estimate.downtime_hours == DMSWindowEstimator.CUTOVER_HOURS
+    assert not DMSWindowEstimator.exceeds_tolerance(estimate, '< 1 hour')
+    
+    overrun = estimator.estimate(tables, config, parallel_threads=2, change_rate_gb_per_hour=50)
+    assert not overrun.cdc_keeps_up and overrun.cdc_catchup_hours == float('inf')
+    assert not DMSWindowEstimator.exceeds_tolerance(overrun, 'Flexible')
+    assert DMSWindowEstimator.exceeds_tolerance(overrun, '< 24 hours')
+    
+    offline = estimator.estimate(tables, config, parallel_threads=2, use_cdc=False)
+    assert offline.downtime_hours == offline.total_hours == pytest.approx(offline.full_load_hours + DMSWindowEstimator.CUTOVER_HOURS)
+
+
+def test_storage_plan_picks_cheapest_volume_meeting_requirement(cost_calculator):
+    config = {'target_engine': 'postgresql', 'storage_gb': 100, 'primary_region': 'us-east-1'}
+    
+    baseline = cost_calculator.plan_storage(config)
+    assert (baseline.storage_type, baseline.allocated_gb, baseline.provisioned_iops) == ('gp3', 100, 3000)
+    assert baseline.cost_split == pytest.approx({'capacity': 8.0, 'iops': 0.0, 'throughput': 0.0})
+    
+    # Beyond the small-volume baseline gp3 grows to 400 GB, whose baseline covers the load for free;
+    # gp2 tops out at 250 MiB/s and io1 bills every IOPS
+    fast = cost_calculator.plan_storage({**config, 'required_iops': 10000, 'required_throughput_mibps': 300})
+    assert (fast.storage_type, fast.allocated_gb, fast.provisioned_iops, fast.provisioned_mibps) == ('gp3', 400, 12000, 500)
+    options = fast.options.set_index('storage_type')
+    assert not options.loc['gp2', 'meets_requirement']
+    assert options.loc['io1', 'monthly_cost'] == pytest.approx(200 * 0.125 + 10000 * 0.10)
+    
+    provisioned = cost_calculator.plan_storage({**config, 'storage_gb': 500, 'required_iops': 20000})
+    assert provisioned.storage_type == 'gp3'
+    assert provisioned.cost_split == pytest.approx({'capacity': 40.0, 'iops': 8000 * 0.02, 'throughput': 0.0})
+    
+    # Nothing delivers the requirement: fall back to the cheapest volume and flag every option
+    impossible = cost_calculator.plan_storage({**config, 'required_iops': 300000})
+    assert not impossible.options['meets_requirement'].any()
+    assert impossible.storage_type == impossible.options.sort_values('monthly_cost').iloc[0]['storage_type']
+
+
+def test_aurora_storage_crossover(cost_calculator):
+    config = {'target_engine': 'aurora_postgresql', 'instance_class': 'db.r5.large', 'storage_gb': 500,
+              'primary_region': 'us-east-1'}
+    idle = cost_calculator.compare_aurora_storage({**config, 'monthly_io_requests': 0})
+    assert idle.recommended == 'standard' and idle.io_share == 0.0
+    
+    # I/O-Optimized adds 30% to the instance and 0.125/GB to storage; Standard pays 0.20 per million requests
+    instance = cost_calculator._calculate_rds_cost({**config, 'aurora_storage_config': 'standard'})
+    assert idle.crossover_io_requests == pytest.approx((instance * 0.3 + 500 * 0.125) / 0.20 * 1e6)
+    
+    at = cost_calculator.compare_aurora_storage({**config, 'monthly_io_requests': idle.crossover_io_requests})
+    assert at.standard_monthly == pytest.approx(at.io_optimized_monthly)
+    below = cost_calculator.compare_aurora_storage({**config, 'monthly_io_requests': idle.crossover_io_requests * 0.9})
+    above = cost_calculator.compare_aurora_storage({**config, 'monthly_io_requests': idle.crossover_io_requests * 1.1})
+    assert (below.recommended, above.recommended) == ('standard', 'io_optimized')
+    
+    # Non-Aurora targets are compared as Aurora PostgreSQL
+    rds = cost_calculator.compare_aurora_storage({**config, 'target_engine': 'postgresql', 'monthly_io_requests': 0})
+    assert rds.crossover_io_requests == pytest.approx(idle.crossover_io_requests)
+
+
+@pytest.mark.parametrize('fts_enabled', [True, False])
+def test_search_is_scoped_to_owner_and_takes_literal_text(db_manager, caplog, fts_enabled):
+    db_manager.fts_enabled = fts_enabled and db_manager.fts_enabled
+    schema = 'SELECT * FROM emp CONNECT BY PRIOR mgr = id; -- 100% of "quoted" rows, see done_flag'
+    projects = {}
+    for owner in ('alice', 'bob'):
+        projects[owner] = db_manager.create_project(f"{owner} migration", "oracle", "postgresql", owner)
+        db_manager.save_analysis_result(projects[owner], 'security_analysis', {}, {}, schema_text=schema,
+                                        search_documents=[('recommendation', "Security", f"Rotate {owner}'s keys")])
+    
+    hits = db_manager.search_analyses('alice', 'CONNECT BY')
+    assert [(hit['project_id'], hit['kind']) for hit in hits] == [(projects['alice'], 'schema')]
+    assert '«' in hits[0]['snippet']
+    assert [hit['project_id'] for hit in db_manager.search_analyses('bob', 'CONNECT BY')] == [projects['bob']]
+    assert db_manager.search_analyses('alice', "bob's keys") == []
+    assert db_manager.search_analyses('carol', 'CONNECT BY') == []
+    
+    for text in ('100%', '"quoted"', 'mgr = id', 'done_flag'):
+        assert [hit['project_id'] for hit in db_manager.search_analyses('alice', text)] == [projects['alice']], text
+    for text in ('x%y', 'AND OR', 'emp NEAR('):
+        assert db_manager.search_analyses('alice', text) == [], text
+    assert "Analysis search failed" not in caplog.text